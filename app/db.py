@@ -1,6 +1,8 @@
+import logging
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo.errors import OperationFailure
 
 # Import all Beanie models here
 from app.models.user import User
@@ -11,12 +13,15 @@ from app.models.watch_history import WatchHistory
 from app.models.favourite import Favorite
 from app.models.continue_watching import ContinueWatching
 from app.models.search_history import SearchHistory
-from app.models.category import Category
+from app.models.category import Category, CategorySummary
 
 # Newly added models
 from app.models.movies import Movie
-from app.models.series import Series
+from app.models.series import Series, Episode
 from app.models.live_channels import LiveChannel
+from app.models.sync_job import SyncJob
+from app.models.provider import Provider
+from app.models.epg import EpgProgramme
 from app.config import MONGO_URL
 
 # Load MongoDB connection details from env (fallback to local)
@@ -30,24 +35,60 @@ database = client[MONGO_DB]
 movies_collection = database["movies"]
 series_collection = database["series"]
 channels_collection = database["live_channels"]
+episodes_collection = database["episodes"]
+epg_collection = database["epg_programmes"]
 category_collection = database["categories"]
+category_summary_collection = database["category_summaries"]
+catalog_state_collection = database["catalog_state"]
+sync_jobs_collection = database["sync_jobs"]
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_MODELS = [
+    User,
+    Package,
+    Subscription,
+    ContentSimilarity,
+    WatchHistory,
+    Favorite,
+    ContinueWatching,
+    SearchHistory,
+    Category,
+    CategorySummary,
+    Movie,
+    Series,
+    Episode,
+    LiveChannel,
+    SyncJob,
+    Provider,
+    EpgProgramme,
+]
+
+
+async def ensure_indexes(models=DOCUMENT_MODELS) -> list:
+    """
+    Create every index declared in the models' Settings.indexes (a no-op
+    for the ones that already exist). An index that cannot be built, e.g.
+    a unique index over existing duplicates, is logged and skipped so
+    startup goes on; run `python -m app.utils.build_indexes` to see why.
+    Returns [(collection, index name, error)].
+    """
+    failures = []
+    for model in models:
+        collection = database[model.Settings.name]
+        for index in getattr(model.Settings, "indexes", []):
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                name = index.document["name"]
+                logger.error(f"Index {collection.name}.{name} not built: {e}")
+                failures.append((collection.name, name, str(e)))
+    return failures
+
 
 # Init Beanie ODM
-async def init_db():
-    await init_beanie(
-        database=database,
-        document_models=[
-            User,
-            Package,
-            Subscription,
-            ContentSimilarity,
-            WatchHistory,
-            Favorite,
-            ContinueWatching,
-            SearchHistory,
-            Category,
-            Movie,          
-            Series,         
-            LiveChannel     
-        ]
-    )
+async def init_db(indexes: bool = True):
+    # Indexes are created by ensure_indexes(), which tolerates failures; Beanie would abort startup
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS, skip_indexes=True)
+    if indexes:
+        await ensure_indexes()
@@ -3,9 +3,11 @@ from beanie import Document
 from datetime import datetime, timezone
 from pydantic import Field
 from typing import Optional
+from pymongo import ASCENDING, IndexModel
 
 
 class Category(Document):
+    provider_id: Optional[str] = None  # Provider document id; None for the env-configured account
     category_id: str           
     category_name: str          
     parent_id: int = 0          
@@ -14,3 +16,24 @@ class Category(Document):
 
     class Settings:
         name = "categories"
+        indexes = [
+            # Sync upsert key
+            IndexModel([("provider_id", ASCENDING), ("category_id", ASCENDING)], unique=True),
+        ]
+
+
+class CategorySummary(Document):
+    """One category of one content type as /categories/fetch_all lists it, kept current by the sync."""
+    content_type: str           # movie | series | live
+    provider_id: Optional[str] = None  # Provider document id; None for the env-configured account
+    category_id: str
+    category_name: Optional[str] = None
+    parent_id: int = 0
+    item_count: int = 0         # live items carrying a category name
+    last_changed: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "category_summaries"
+        indexes = [
+            IndexModel([("content_type", ASCENDING), ("provider_id", ASCENDING), ("category_id", ASCENDING)], unique=True),
+        ]
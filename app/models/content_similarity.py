@@ -1,6 +1,7 @@
 from beanie import Document
 from pydantic import Field
 from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class ContentSimilarity(Document):
@@ -10,3 +11,6 @@ class ContentSimilarity(Document):
 
     class Settings:
         name = "content_similarity"
+        indexes = [
+            IndexModel([("content_id", ASCENDING), ("similarity_score", DESCENDING)]),
+        ]
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from beanie import Document
 from pydantic import Field
 from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class ContinueWatching(Document):
     user_id: str
@@ -14,3 +15,7 @@ class ContinueWatching(Document):
     class Settings:
         name = "continue_watching"
         collection = "continue_watching"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("content_id", ASCENDING)], unique=True),
+            IndexModel([("user_id", ASCENDING), ("last_watched", DESCENDING)]),
+        ]
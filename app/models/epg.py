@@ -0,0 +1,29 @@
+# backend/app/models/epg.py
+import os
+from beanie import Document
+from typing import Optional
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel
+
+# Programmes are dropped by Mongo this long after they end
+EPG_RETENTION_SECONDS = int(os.getenv("EPG_RETENTION_SECONDS", "3600"))
+
+
+class EpgProgramme(Document):
+    provider_id: Optional[str] = None
+    channel_id: str                     # LiveChannel.epg_channel_id
+    start: datetime
+    end: datetime
+    title: Optional[str] = None
+    description: Optional[str] = None
+    lang: Optional[str] = None
+
+    class Settings:
+        name = "epg_programmes"
+        indexes = [
+            IndexModel(
+                [("provider_id", ASCENDING), ("channel_id", ASCENDING), ("start", ASCENDING)],
+                unique=True,
+            ),
+            IndexModel([("end", ASCENDING)], expireAfterSeconds=EPG_RETENTION_SECONDS),
+        ]
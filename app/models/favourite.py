@@ -2,6 +2,7 @@ from beanie import Document
 from datetime import datetime, timezone
 from pydantic import Field
 from typing import Literal
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Favorite(Document):
     user_id: str
@@ -12,6 +13,10 @@ class Favorite(Document):
     class Settings:
         name = "favourites"
         use_state_management = True
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("content_id", ASCENDING)], unique=True),
+            IndexModel([("user_id", ASCENDING), ("added_at", DESCENDING)]),
+        ]
 
     class Config:
         json_schema_extra = {
@@ -3,9 +3,14 @@ from beanie import Document
 from typing import Optional
 from datetime import datetime, timezone
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+# Partial filter of the listing indexes: only playable items are indexed
+PLAYABLE = {"playable": True}
 
 
 class Movie(Document):
+    provider_id: Optional[str] = None  # Provider document id; None for the env-configured account
     tmdb_id: Optional[str] = None
     name: str
     stream_id: int
@@ -19,7 +24,28 @@ class Movie(Document):
     container_extension: Optional[str] = None
     is_adult: bool = False
     added: Optional[datetime] = None 
+    content_hash: Optional[str] = None  # sha1 of the normalised upstream payload
+    sync_generation: Optional[int] = None  # last sync run that saw this item upstream
+    deleted_at: Optional[datetime] = None  # set by the sweep when the provider dropped it
+    playable: bool = False  # listable: passes the catalog filters (app/utils/playable.py)
+    image: Optional[str] = None  # normalised artwork url
     last_updated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Settings:
         name = "movies"
+        indexes = [
+            # Sync upsert key
+            IndexModel([("provider_id", ASCENDING), ("stream_id", ASCENDING)], unique=True),
+            # Sweep: live items of one provider not stamped with the current generation
+            IndexModel([("provider_id", ASCENDING), ("deleted_at", ASCENDING), ("sync_generation", ASCENDING)]),
+            # Listing: {playable: True, deleted_at: None} queries (counts and $sample)
+            IndexModel([("deleted_at", ASCENDING)], name="deleted_at_1_playable", partialFilterExpression=PLAYABLE),
+            # Keyset pagination sorts (app/utils/pagination.py); also walked in reverse
+            IndexModel([("name", ASCENDING), ("_id", ASCENDING)], name="name_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("added", ASCENDING), ("_id", ASCENDING)], name="added_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("rating", ASCENDING), ("_id", ASCENDING)], name="rating_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            # Category browse: same sorts within one category
+            IndexModel([("category_id", ASCENDING), ("name", ASCENDING), ("_id", ASCENDING)], name="category_id_1_name_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("category_id", ASCENDING), ("added", ASCENDING), ("_id", ASCENDING)], name="category_id_1_added_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("category_id", ASCENDING), ("rating", ASCENDING), ("_id", ASCENDING)], name="category_id_1_rating_1__id_1_playable", partialFilterExpression=PLAYABLE),
+        ]
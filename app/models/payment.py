@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import List, Optional
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
 
 # ---------- Pydantic Sub-Schema (Embedded) ----------
 class PaymentHistory(BaseModel):
@@ -36,3 +37,6 @@ class Subscription(Document):
 
     class Settings:
         name = "subscriptions"  
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        ]
@@ -0,0 +1,17 @@
+# backend/app/models/provider.py
+from beanie import Document
+from datetime import datetime, timezone
+from pydantic import Field
+
+
+class Provider(Document):
+    """An Xtream Codes account to sync from (the env-configured XC_* account needs no document)."""
+    name: str
+    url: str                            # e.g. http://host:80, without /player_api.php
+    username: str
+    password: str
+    enabled: bool = True
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "providers"
@@ -0,0 +1,132 @@
+# backend/app/models/responses.py
+"""
+Output shapes of the hot read endpoints: catalog lists, search, watch
+history, continue watching and favourites.
+
+Handlers build exactly these fields (from projections, never whole
+documents) and send them with app/utils/fast_json.fast_response or the
+response cache. The models are attached as response_model to document
+the API. FastAPI does not re-validate a returned Response, so each
+handler also passes its model to fast_response/cached. With
+FAST_JSON_VALIDATE=1 (debug), every response is checked against its
+model. Unknown fields are rejected, so the schema cannot drift from
+what is actually sent.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class _Shaped(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+
+# ---- catalog lists ----
+class MovieListItem(_Shaped):
+    id: str = Field(alias="_id")
+    name: Optional[str] = None
+    stream_icon: Optional[str] = None
+    type: str = "movie"
+
+
+class SeriesListItem(_Shaped):
+    id: str = Field(alias="_id")
+    name: Optional[str] = None
+    cover: Optional[str] = None
+    type: str = "series"
+
+
+class Programme(_Shaped):
+    title: Optional[str] = None
+    start: str
+    end: str
+
+
+class NowNext(_Shaped):
+    now: Optional[Programme] = None
+    next: Optional[Programme] = None
+
+
+class ChannelListItem(_Shaped):
+    id: str = Field(alias="_id")
+    name: Optional[str] = None
+    stream_icon: Optional[str] = None
+    stream_type: str = "live_channel"
+    epg: Optional[NowNext] = None  # only with with_epg=true
+
+
+class CategoryRail(_Shaped):
+    category_id: str
+    category_name: Optional[str] = None
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+# ---- search ----
+class SearchItem(_Shaped):
+    id: str = Field(alias="_id")
+    name: Optional[str] = None
+    stream_icon: Optional[str] = None
+    type: str  # movie | series | live_channel
+    is_favourite: bool = False
+
+
+class SearchResponse(_Shaped):
+    total: int
+    limit: int
+    items: List[SearchItem]
+    partial: List[str] = []  # content types that timed out
+
+
+# ---- watch history ----
+class HistoryContent(_Shaped):
+    id: str = Field(alias="_id")
+    name: Optional[str] = None
+    stream_icon: Optional[str] = None
+
+
+class WatchHistoryItem(_Shaped):
+    history_id: str
+    watched_at: datetime
+    progress: Optional[float] = None
+    content_type: str
+    content: HistoryContent
+
+
+class WatchHistoryResponse(_Shaped):
+    history: List[WatchHistoryItem]
+
+
+# ---- continue watching ----
+class ContinueWatchingItem(_Shaped):
+    content_id: str
+    content_type: str
+    content: Dict[str, Any]  # the catalog document, less sync bookkeeping
+    progress: Optional[float] = None
+    duration: Optional[float] = None
+    last_watched: datetime
+
+
+class ContinueWatchingResponse(_Shaped):
+    continue_watching: List[ContinueWatchingItem]
+
+
+# ---- favourites ----
+class FavouriteItem(_Shaped):
+    name: Optional[str] = None
+    stream_icon: Optional[str] = None  # movies and live channels
+    cover: Optional[str] = None  # series
+    stream_type: str
+    favorite_id: str
+    content_id: str
+    added_at: str
+    is_favorite: bool = True
+
+
+class FavouritesResponse(_Shaped):
+    user_id: str
+    content_type: str
+    count: int
+    content: List[FavouriteItem]
+    partial: List[str] = []  # content types that timed out
@@ -2,6 +2,7 @@
 from beanie import Document
 from datetime import datetime
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class SearchHistory(Document):
     user_id: str
@@ -10,3 +11,6 @@ class SearchHistory(Document):
 
     class Settings:
         name = "search_history"  # MongoDB collection name
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
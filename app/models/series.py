@@ -3,22 +3,39 @@ from beanie import Document
 from typing import List, Optional
 from datetime import datetime, timezone
 from pydantic import Field, BaseModel
+from pymongo import ASCENDING, IndexModel
 
+# Partial filter of the listing indexes: only playable items are indexed
+PLAYABLE = {"playable": True}
 
-class Episode(BaseModel):
+
+class Episode(Document):
+    provider_id: Optional[str] = None  # Provider document id; None for the env-configured account
+    series_id: int
+    season_number: int
     episode_num: int
-    title: str
+    title: Optional[str] = None
     stream_id: int
     stream_url: str
     added: Optional[datetime] = None
 
+    class Settings:
+        name = "episodes"
+        indexes = [
+            # Season listing and the sync's per-series delete, both scoped to one provider
+            IndexModel([("provider_id", ASCENDING), ("series_id", ASCENDING), ("season_number", ASCENDING), ("episode_num", ASCENDING)]),
+            IndexModel([("provider_id", ASCENDING), ("stream_id", ASCENDING)], unique=True),
+        ]
+
 
 class Season(BaseModel):
+    # Summary only: the episodes themselves live in the episodes collection
     season_number: int
-    episodes: List[Episode] = Field(default_factory=list)
+    episode_count: int = 0
 
 
 class Series(Document):
+    provider_id: Optional[str] = None  # Provider document id; None for the env-configured account
     series_id: int
     tmdb_id: Optional[str] = None  # Add this line
     name: str
@@ -36,7 +53,28 @@ class Series(Document):
     category_name: Optional[str] = None
     stream_url: Optional[str] = None
     seasons: List[Season] = Field(default_factory=list)
+    content_hash: Optional[str] = None  # sha1 of the normalised upstream payload
+    sync_generation: Optional[int] = None  # last sync run that saw this item upstream
+    deleted_at: Optional[datetime] = None  # set by the sweep when the provider dropped it
+    playable: bool = False  # listable: passes the catalog filters (app/utils/playable.py)
+    image: Optional[str] = None  # normalised artwork url
     last_updated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Settings:
         name = "series"
+        indexes = [
+            # Sync upsert key
+            IndexModel([("provider_id", ASCENDING), ("series_id", ASCENDING)], unique=True),
+            # Sweep: live items of one provider not stamped with the current generation
+            IndexModel([("provider_id", ASCENDING), ("deleted_at", ASCENDING), ("sync_generation", ASCENDING)]),
+            # Listing: {playable: True, deleted_at: None} queries (counts and $sample)
+            IndexModel([("deleted_at", ASCENDING)], name="deleted_at_1_playable", partialFilterExpression=PLAYABLE),
+            # Keyset pagination sorts (app/utils/pagination.py); also walked in reverse
+            IndexModel([("name", ASCENDING), ("_id", ASCENDING)], name="name_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("last_modified", ASCENDING), ("_id", ASCENDING)], name="last_modified_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("rating", ASCENDING), ("_id", ASCENDING)], name="rating_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            # Category browse: same sorts within one category
+            IndexModel([("category_id", ASCENDING), ("name", ASCENDING), ("_id", ASCENDING)], name="category_id_1_name_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("category_id", ASCENDING), ("last_modified", ASCENDING), ("_id", ASCENDING)], name="category_id_1_last_modified_1__id_1_playable", partialFilterExpression=PLAYABLE),
+            IndexModel([("category_id", ASCENDING), ("rating", ASCENDING), ("_id", ASCENDING)], name="category_id_1_rating_1__id_1_playable", partialFilterExpression=PLAYABLE),
+        ]
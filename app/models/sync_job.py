@@ -0,0 +1,47 @@
+# backend/app/models/sync_job.py
+from beanie import Document
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+class SyncJob(Document):
+    status: str = "pending"             # pending | running | completed | failed | cancelled
+    trigger: str = "manual"             # manual | schedule
+    content_types: List[str] = Field(default_factory=lambda: ["movie", "series", "live"])
+    incremental: bool = False
+    strategy: str = "stream"
+    stage: Optional[str] = None         # categories | movie | series | live
+    completed_stages: List[str] = Field(default_factory=list)   # stages and "<type>:<account>" keys
+    # Checkpoint: categories whose items are durably written, per "<type>:<account>"
+    completed_categories: Dict[str, List[str]] = Field(default_factory=dict)
+    categories_total: Dict[str, int] = Field(default_factory=dict)
+    counts: Dict[str, int] = Field(default_factory=dict)
+    durations: Dict[str, float] = Field(default_factory=dict)   # seconds per stage
+    # Stamped on every item seen this run; items without it are swept
+    generation: Optional[int] = None
+    sweeps: Dict[str, Any] = Field(default_factory=dict)   # sweep result per "<type>:<account>"
+    # Per-run telemetry: stage timers, items/sec, upstream latency per action
+    summary: Dict[str, Any] = Field(default_factory=dict)
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    resumes: int = 0
+    # Lease: the process running the job renews heartbeat_at; saves only apply while it owns the job
+    owner: Optional[str] = None
+    # "sync" while pending/running, None once finished: unique, so only one job can be active
+    lock: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+
+    class Settings:
+        name = "sync_jobs"
+        indexes = [
+            # active_job() / resume_stale()
+            IndexModel([("status", ASCENDING), ("heartbeat_at", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING)]),
+            # trigger(): a second active job fails to insert
+            IndexModel([("lock", ASCENDING)], name="lock_1_active", unique=True, partialFilterExpression={"lock": {"$type": "string"}}),
+        ]
@@ -2,6 +2,7 @@ from beanie import Document
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime, timezone
+from pymongo import ASCENDING, IndexModel
 
 
 class User(Document):
@@ -18,6 +19,9 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+        ]
 
 class UserCreate(BaseModel):
     name: str
@@ -2,6 +2,7 @@ from beanie import Document
 from datetime import datetime, timezone
 from pydantic import Field
 from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class WatchHistory(Document):
     user_id: str
@@ -13,3 +14,7 @@ class WatchHistory(Document):
     class Settings:
         name = "watch_history"
         collection = "watch_history"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("content_id", ASCENDING)], unique=True),
+            IndexModel([("user_id", ASCENDING), ("watched_at", DESCENDING)]),
+        ]
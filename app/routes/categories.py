@@ -1,86 +1,65 @@
-from fastapi import APIRouter, HTTPException
-from app.db import category_collection, movies_collection, series_collection, channels_collection
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from app.db import category_collection
+from app.utils.category_summary import grouped_categories
+from app.utils.response_cache import cached
+from app.models.responses import CategoryRail
+from app.utils.catalog import category_rails, MAX_RAILS
+from app.utils.pagination import SORTS, MAX_PAGE_SIZE
 from bson import ObjectId
 
 router = APIRouter()
 
 @router.get("/fetch_all")
+@cached("categories:fetch_all")
 async def get_all_categories():
+    """Served from the category summaries the sync maintains (app/utils/category_summary.py)."""
     try:
-        # Movies categories
-        movie_categories = await movies_collection.aggregate([
-            {
-                "$match": {
-                    "category_id": {"$exists": True, "$ne": "", "$ne": None},
-                    "category_name": {"$exists": True, "$ne": "", "$ne": None},
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$category_id",
-                    "category_name": {"$first": "$category_name"}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "category_id": "$_id",
-                    "category_name": 1
-                }
-            }
-        ]).to_list(length=None)
+        return await grouped_categories()
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-        # Series categories
-        series_categories = await series_collection.aggregate([
-            {
-                "$match": {
-                    "category_id": {"$exists": True, "$ne": "", "$ne": None},
-                    "category_name": {"$exists": True, "$ne": "", "$ne": None},
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$category_id",
-                    "category_name": {"$first": "$category_name"}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "category_id": "$_id",
-                    "category_name": 1
-                }
-            }
-        ]).to_list(length=None)
 
-        # Live channels categories
-        live_categories = await channels_collection.aggregate([
-            {
-                "$match": {
-                    "category_id": {"$exists": True, "$ne": "", "$ne": None},
-                    "category_name": {"$exists": True, "$ne": "", "$ne": None},
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$category_id",
-                    "category_name": {"$first": "$category_name"}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "category_id": "$_id",
-                    "category_name": 1
-                }
-            }
-        ]).to_list(length=None)
+@router.get("/rails", response_model=List[CategoryRail])
+@cached("categories:rails", model=List[CategoryRail])
+async def get_category_rails(
+    category_ids: List[str] = Query(...),
+    type: Literal["movie", "series", "live"] = "movie",
+    sort: Literal["name", "added", "rating"] = "name",
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    provider_id: Optional[str] = Query(None, description="Only this provider's items and category names"),
+):
+    """
+    First `limit` items of several categories in one request (repeat
+    ?category_ids= or comma-separate). Each rail's next_cursor continues
+    on /{movies|series|channels}/category/{category_id}. Empty rails are left out.
+    Category ids are per provider: without provider_id a rail mixes every
+    provider's items and takes the env account's category name if it has one.
+    """
+    try:
+        ids = list(dict.fromkeys(i for value in category_ids for i in value.split(",") if i))
+        if len(ids) > MAX_RAILS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_RAILS} categories per request")
+        if sort not in SORTS[type]:
+            raise HTTPException(status_code=400, detail=f"Sort '{sort}' is not available for {type}")
 
-        return {
-            "movies": movie_categories,
-            "series": series_categories,
-            "live_channels": live_categories
-        }
+        scope = {"provider_id": provider_id} if provider_id else None
+        rails = await category_rails(type, ids, sort, limit, scope)
+        categories = await category_collection.find(
+            {"category_id": {"$in": ids}, **(scope or {})},
+            {"_id": 0, "provider_id": 1, "category_id": 1, "category_name": 1},
+        ).to_list(length=None)
+        # Deterministic when several providers share an id: env account first, then by provider id
+        names = {}
+        for c in sorted(categories, key=lambda c: (c.get("provider_id") is not None, c.get("provider_id") or "")):
+            names.setdefault(c["category_id"], c.get("category_name"))
+        for rail in rails:
+            rail["category_name"] = names.get(rail["category_id"])
+        return [rail for rail in rails if rail["items"]]
 
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,6 +1,5 @@
 # app/routes/continue_watching.py
 from fastapi import APIRouter, HTTPException
-from fastapi.encoders import jsonable_encoder
 from datetime import datetime, timezone
 from app.models.continue_watching import ContinueWatching
 
@@ -8,6 +7,9 @@ from app.models.continue_watching import ContinueWatching
 from app.models.movies import Movie
 from app.models.series import Series
 from app.models.live_channels import LiveChannel
+from app.utils.catalog_query import hydrate_documents, ref_key
+from app.utils.fast_json import fast_response
+from app.models.responses import ContinueWatchingResponse
 
 router = APIRouter()
 
@@ -68,24 +70,28 @@ async def save_progress(
 
 
 # 🟢 Get all continue watching items for a user
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_model=ContinueWatchingResponse)
 async def get_continue_watching(user_id: str):
     docs = await ContinueWatching.find({"user_id": user_id}).sort("-last_watched").to_list()
 
+    # One concurrent lookup per content type instead of one per entry; raw
+    # documents go out as stored instead of through model validation and jsonable_encoder
+    contents, _ = await hydrate_documents((d.content_type, d.content_id) for d in docs)
+
     results = []
     for d in docs:
-        content = await fetch_content(d.content_id, d.content_type)
+        content = contents.get(ref_key(d.content_type, d.content_id))
         if content:
             results.append({
                 "content_id": d.content_id,
                 "content_type": d.content_type,
-                "content": jsonable_encoder(content),
+                "content": content,
                 "progress": d.progress,
                 "duration": d.duration,
                 "last_watched": d.last_watched,
             })
 
-    return {"continue_watching": results}
+    return fast_response({"continue_watching": results}, model=ContinueWatchingResponse)
 
 
 # 🟢 Remove a single item (when user clicks "X")
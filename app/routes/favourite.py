@@ -1,70 +1,34 @@
 from fastapi import APIRouter, HTTPException, Body, Query
 from typing import Literal, Optional, List
-from bson import ObjectId
-from pydantic import BaseModel
 from app.models.favourite import Favorite
-from app.models.movies import Movie
-from app.models.series import Series
-from app.models.live_channels import LiveChannel
+from app.utils.catalog_query import hydrate_summaries, ref_key
+from app.utils.playable import IMAGE_FIELDS
+from app.utils.fast_json import fast_response
+from app.models.responses import FavouritesResponse
 
 router = APIRouter()
 
-# --- 🚀 OPTIMIZATION: LIGHTWEIGHT PROJECTION MODELS ---
-# ... (unchanged) ...
-class MovieProjection(BaseModel):
-    name: str
-    stream_icon: Optional[str] = None
-    stream_type: str = "movie"
-
-class SeriesProjection(BaseModel):
-    name: str
-    cover: Optional[str] = None # Assuming 'cover' is the poster for series
-    stream_type: str = "series"
-
-class LiveChannelProjection(BaseModel):
-    name: str
-    stream_icon: Optional[str] = None
-    stream_type: str = "live"
-# --------------------------------------------------------
+def _favourite_view(summary: dict) -> dict:
+    """Catalog summary → the minimal fields (name, poster, type) the favourite list shows."""
+    content_type = summary["type"]
+    return {
+        "name": summary["name"],
+        IMAGE_FIELDS[content_type]: summary["image"],
+        "stream_type": content_type,
+    }
 
 
 async def _get_content_details(content_id: str, content_type: str) -> Optional[dict]:
     """
-    Get content details from the appropriate collection using Beanie projections.
-    Fetches only minimal fields (name, poster, type) for the favorite list.
-    NOTE: content_id is now expected to be the MongoDB ObjectId string.
+    Get content details from the appropriate collection.
+    NOTE: content_id is expected to be the MongoDB ObjectId string.
     """
-    try:
-        # 1. Validate that the ID is a valid MongoDB ObjectId
-        mongo_id = ObjectId(content_id)
-    except Exception:
-        print(f"DEBUG: Content ID '{content_id}' is NOT a valid ObjectId.")
-        return None
-
-    # 2. Use the ObjectId for finding the document (Movie.id is the Beanie representation of _id)
-    # The crucial part is matching content_type to the correct collection lookup
-    
-    content = None
-    print(f"DEBUG: Attempting lookup for ID: {content_id} in Collection: {content_type}")
-    
-    if content_type == "movie":
-        # .id is the Beanie field corresponding to MongoDB's _id
-        content = await Movie.find_one(Movie.id == mongo_id).project(MovieProjection)
-    elif content_type == "series":
-        content = await Series.find_one(Series.id == mongo_id).project(SeriesProjection)
-    elif content_type == "live":
-        content = await LiveChannel.find_one(LiveChannel.id == mongo_id).project(LiveChannelProjection)
-    else:
-        print(f"DEBUG: Invalid content_type received: {content_type}")
-        return None
-
-    if content:
-        print("DEBUG: Content found successfully.")
-        return content.model_dump()
-    else:
-        # This is where the 404 is being triggered if the content_type is wrong.
-        print(f"DEBUG: Content NOT FOUND in the '{content_type}' collection.")
+    found, _ = await hydrate_summaries([(content_type, content_id)])
+    summary = found.get(ref_key(content_type, content_id))
+    if summary is None:
+        print(f"DEBUG: Content '{content_id}' NOT FOUND in the '{content_type}' collection.")
         return None
+    return _favourite_view(summary)
 
 
 @router.put("/toggle", summary="Toggle Favorite Status")
@@ -132,7 +96,7 @@ async def toggle_favorite(
     }
 
 
-@router.get("/{user_id}/content", summary="Get Favorite Content Details (Optimized)")
+@router.get("/{user_id}/content", summary="Get Favorite Content Details (Optimized)", response_model=FavouritesResponse)
 async def get_favorite_content(
     user_id: str,
     content_type: Optional[Literal["movie", "series", "live"]] = Query(None),
@@ -149,14 +113,14 @@ async def get_favorite_content(
     # Get user's favorites
     favorites = await Favorite.find(query).sort(-Favorite.added_at).to_list()
     
+    # One concurrent lookup per content type instead of one per favourite
+    found, missing = await hydrate_summaries((fav.content_type, fav.content_id) for fav in favorites)
+
     content_details = []
-    
     for fav in favorites:
-        # Get complete content details (now uses the efficient Projection)
-        # This will now use the MongoDB _id stored in fav.content_id
-        content_data = await _get_content_details(fav.content_id, fav.content_type)
-        
-        if content_data:
+        summary = found.get(ref_key(fav.content_type, fav.content_id))
+        if summary:
+            content_data = _favourite_view(summary)
             # We add back the favorite metadata here
             content_data.update({
                 "favorite_id": str(fav.id),
@@ -165,10 +129,12 @@ async def get_favorite_content(
                 "is_favorite": True
             })
             content_details.append(content_data)
-    
-    return {
+
+    return fast_response({
         "user_id": user_id,
         "content_type": content_type or "all",
         "count": len(content_details),
-        "content": content_details
-    }
\ No newline at end of file
+        "content": content_details,
+        # Content types that timed out; their favourites are missing from content
+        "partial": missing,
+    }, model=FavouritesResponse)
\ No newline at end of file
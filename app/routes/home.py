@@ -0,0 +1,190 @@
+# backend/app/routes/home.py
+"""
+/home: everything the home screen shows, in one request.
+
+The rails are built concurrently, each under HOME_RAIL_TIMEOUT:
+- Shared catalog parts come from the response cache as rendered JSON for
+  the current catalog generation. These are the categories and the first
+  page of each list.
+- The banner and random rails are drawn from the in-memory sample pool.
+- Continue watching and favourites are hydrated together, with one query
+  per content type.
+
+A rail that fails or times out is sent as null and named in "partial".
+With debug=true the response also carries per-rail timings.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from app.models.continue_watching import ContinueWatching
+from app.models.favourite import Favorite
+from app.utils.catalog import list_page, SERIALIZERS
+from app.utils.catalog_query import hydrate_summaries, ref_key
+from app.utils.catalog_state import catalog_generation
+from app.utils.category_summary import grouped_categories
+from app.utils.fast_json import dumps
+from app.utils.pagination import MAX_PAGE_SIZE
+from app.utils.response_cache import response_cache, RESPONSE_CACHE_ENABLED
+from app.utils.sample_pool import sample_pool, RANDOM_MIX
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Tunables (env overridable)
+HOME_RAIL_TIMEOUT = float(os.getenv("HOME_RAIL_TIMEOUT", "3"))
+HOME_USER_ITEMS = int(os.getenv("HOME_USER_ITEMS", "20"))
+
+# Same size as /movies/featured_banner
+BANNER_SIZE = 4
+
+
+# ---- shared catalog rails (cached per generation) ----
+async def _shared(section: str, build, *args) -> bytes:
+    """Rendered JSON of a catalog rail, reused until the catalog generation changes."""
+    generation = await catalog_generation.current()
+    key = ("home", section, args)
+    hit = response_cache.get(key, generation) if RESPONSE_CACHE_ENABLED else None
+    if hit is not None:
+        return hit[0]
+    body = dumps(await build(*args))
+    if RESPONSE_CACHE_ENABLED:
+        response_cache.put(key, generation, body, {})
+    return body
+
+
+async def _list_rail(content_type: str, sort: str, limit: int) -> dict:
+    docs, next_cursor = await list_page(content_type, sort, limit=limit)
+    serialize = SERIALIZERS[content_type]
+    return {"items": [serialize(doc) for doc in docs], "next_cursor": next_cursor}
+
+
+# ---- per-user rails ----
+async def _rendered(coro) -> bytes:
+    return dumps(await coro)
+
+
+async def _banner(user_id: Optional[str]) -> list:
+    await sample_pool.ensure_fresh()
+    return [
+        {"_id": m["_id"], "stream_icon": m["image"], "type": "movie"}
+        for m in sample_pool.draw("movie", BANNER_SIZE, user_id)
+    ]
+
+
+async def _recommendations(user_id: Optional[str]) -> list:
+    await sample_pool.ensure_fresh()
+    return sample_pool.draw_mix(RANDOM_MIX, user_id)
+
+
+async def _library(user_id: str) -> dict:
+    """Continue watching and favourites, hydrated in one batch of per-type queries."""
+    watching, favourites = await asyncio.gather(
+        ContinueWatching.find({"user_id": user_id}).sort("-last_watched").limit(HOME_USER_ITEMS).to_list(),
+        Favorite.find({"user_id": user_id}).sort(-Favorite.added_at).limit(HOME_USER_ITEMS).to_list(),
+    )
+    refs = [(d.content_type, d.content_id) for d in watching] + [(f.content_type, f.content_id) for f in favourites]
+    found, _ = await hydrate_summaries(refs)
+
+    continue_watching = []
+    for d in watching:
+        content = found.get(ref_key(d.content_type, d.content_id))
+        if content:
+            continue_watching.append({
+                "content_id": d.content_id,
+                "content_type": d.content_type,
+                "content": content,
+                "progress": d.progress,
+                "duration": d.duration,
+                "last_watched": d.last_watched,
+            })
+
+    favorites = []
+    for f in favourites:
+        content = found.get(ref_key(f.content_type, f.content_id))
+        if content:
+            favorites.append({
+                "favorite_id": str(f.id),
+                "content_id": f.content_id,
+                "content_type": f.content_type,
+                "content": content,
+                "added_at": f.added_at,
+            })
+
+    return {"continue_watching": dumps(continue_watching), "favorites": dumps(favorites)}
+
+
+async def _timed(name: str, coro):
+    """(name, result or None, milliseconds); failures and timeouts are logged, not raised."""
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(coro, HOME_RAIL_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Home rail '{name}' exceeded {HOME_RAIL_TIMEOUT}s")
+        result = None
+    except Exception as e:
+        logger.error(f"Home rail '{name}' failed: {e}")
+        result = None
+    return name, result, round((time.perf_counter() - started) * 1000, 1)
+
+
+@router.get("", summary="Home screen rails in one request")
+async def get_home(
+    user_id: Optional[str] = None,
+    sort: Literal["name", "added"] = "name",
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Items per catalog rail"),
+    debug: bool = False,
+):
+    """
+    banner, recommendations, continue_watching, favorites, categories and
+    the first page of movies, series and live (each with the next_cursor
+    for its list endpoint). User rails are empty without user_id.
+    """
+    try:
+        started = time.perf_counter()
+        tasks = [
+            _timed("banner", _rendered(_banner(user_id))),
+            _timed("recommendations", _rendered(_recommendations(user_id))),
+            _timed("categories", _shared("categories", grouped_categories)),
+            _timed("movies", _shared("movies", _list_rail, "movie", sort, limit)),
+            _timed("series", _shared("series", _list_rail, "series", sort, limit)),
+            _timed("live", _shared("live", _list_rail, "live", sort, limit)),
+        ]
+        if user_id:
+            tasks.append(_timed("library", _library(user_id)))
+
+        # Without a user the user rails are empty rather than missing
+        rails = {"continue_watching": b"[]", "favorites": b"[]"}
+        timings, partial = {}, []
+        for name, result, elapsed in await asyncio.gather(*tasks):
+            timings[name] = elapsed
+            if name == "library":
+                # One result for two rails: they share the hydration
+                result = result or dict.fromkeys(("continue_watching", "favorites"))
+                for rail, body in result.items():
+                    rails[rail] = body
+                    if body is None:
+                        partial.append(rail)
+                continue
+            rails[name] = result
+            if result is None:
+                partial.append(name)
+
+        rails["partial"] = dumps(partial)
+        if debug:
+            timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+            rails["timings_ms"] = dumps(timings)
+
+        # Rails are already rendered (shared ones straight from the cache): splice them
+        body = b"{" + b",".join(dumps(name) + b":" + (value or b"null") for name, value in rails.items()) + b"}"
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,40 +1,112 @@
-from fastapi import APIRouter, HTTPException
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
 from bson import ObjectId
 from app.db import channels_collection
+from app.utils.epg_service import epg_index
+from app.utils.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.catalog import list_page, serialize_channel, LIST_PROJECTIONS, INTERNAL_FIELDS, LISTABLE
+from app.utils.response_cache import cached
+from app.utils.fast_json import fast_response
+from app.models.responses import ChannelListItem
 
 router = APIRouter()
 
+NOW_NEXT_MAX_CHANNELS = 100
 
-@router.get("/fetch")
-async def get_channels_list():
-    try:
-        filter_query = {
-            "name": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_icon": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_url": {"$ne": None, "$ne": "", "$exists": True}
-        }
 
-        projection = {
-            "name": 1,
-            "stream_icon": 1,
-            "stream_type": 1,
-            "_id": 1
-        }
+def _with_epg(params: dict) -> bool:
+    # now/next moves with the clock, not with the catalog generation
+    return params["with_epg"]
+
 
-        cursor = channels_collection.find(filter_query, projection).limit(40)
-        channels_list = await cursor.to_list(length=40)
+async def _channel_page(response: Response, sort: str, cursor: Optional[str], limit: int, with_epg: bool, category_id: str = None):
+    try:
+        projection = LIST_PROJECTIONS["live"]
+        if with_epg:
+            projection = {**projection, "epg_channel_id": 1, "provider_id": 1}
+
+        channels_list, next_cursor = await list_page("live", sort, cursor, limit, category_id, projection)
 
         if not channels_list:
             raise HTTPException(status_code=404, detail="No channels found")
 
-        for channel in channels_list:
-            channel["_id"] = str(channel["_id"])
-            # No need to add 'type' if 'stream_type' already exists
-            if "stream_type" not in channel:
-                channel["stream_type"] = "live_channel"
+        if with_epg:
+            # Served from the in-memory index: no per-channel queries
+            await epg_index.ensure_fresh()
 
+        for channel in channels_list:
+            serialize_channel(channel)
+            if with_epg:
+                channel["epg"] = epg_index.now_next(channel.pop("provider_id", None), channel.pop("epg_channel_id", None))
+
+        if with_epg:
+            # Uncached; already shaped: skip FastAPI's re-encoding
+            return fast_response(
+                channels_list,
+                headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+                model=List[ChannelListItem],
+            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return channels_list
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/fetch", response_model=List[ChannelListItem])
+@cached("channels:fetch", model=List[ChannelListItem], bypass=_with_epg)
+async def get_channels_list(
+    response: Response,
+    with_epg: bool = False,
+    sort: Literal["name", "added"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Channel page; the next page's cursor is in X-Next-Cursor."""
+    return await _channel_page(response, sort, cursor, limit, with_epg)
+
+
+@router.get("/category/{category_id}", response_model=List[ChannelListItem])
+@cached("channels:category", model=List[ChannelListItem], bypass=_with_epg)
+async def get_channels_by_category(
+    category_id: str,
+    response: Response,
+    with_epg: bool = False,
+    sort: Literal["name", "added"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Channels of one category, paginated like /fetch."""
+    return await _channel_page(response, sort, cursor, limit, with_epg, category_id)
+
+
+@router.get("/now_next")
+async def get_now_next(channel_ids: List[str] = Query(...)):
+    """Now & next programme for each channel id (repeat ?channel_ids= or comma-separate)."""
+    try:
+        ids = [i for value in channel_ids for i in value.split(",") if i]
+        if len(ids) > NOW_NEXT_MAX_CHANNELS:
+            raise HTTPException(status_code=400, detail=f"At most {NOW_NEXT_MAX_CHANNELS} channels per request")
+        if not all(ObjectId.is_valid(i) for i in ids):
+            raise HTTPException(status_code=400, detail="Invalid channel ID format")
+
+        channels = await channels_collection.find(
+            {"_id": {"$in": [ObjectId(i) for i in ids]}, "deleted_at": None},
+            {"epg_channel_id": 1, "provider_id": 1},
+        ).to_list(length=len(ids))
+
+        await epg_index.ensure_fresh()
+        return {
+            str(channel["_id"]): epg_index.now_next(channel.get("provider_id"), channel.get("epg_channel_id"))
+            for channel in channels
+        }
+
     except HTTPException:
         raise
     except Exception as e:
@@ -42,19 +114,15 @@ async def get_channels_list():
 
 
 @router.get("/fetch/{channel_id}")
+@cached("channels:one")
 async def get_channel_by_id(channel_id: str):
     try:
         if not ObjectId.is_valid(channel_id):
             raise HTTPException(status_code=400, detail="Invalid channel ID format")
 
-        filter_query = {
-            "_id": ObjectId(channel_id),
-            "name": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_icon": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_url": {"$ne": None, "$ne": "", "$exists": True}
-        }
+        filter_query = {"_id": ObjectId(channel_id), **LISTABLE}
 
-        channel = await channels_collection.find_one(filter_query)
+        channel = await channels_collection.find_one(filter_query, INTERNAL_FIELDS)
 
         if not channel:
             raise HTTPException(status_code=404, detail="Channel not found")
@@ -0,0 +1,36 @@
+# backend/app/routes/metrics.py
+from fastapi import APIRouter
+from app.models.sync_job import SyncJob
+from app.utils.sync_metrics import metrics
+from app.utils.upstream_client import get_upstream_client
+from app.utils.response_cache import response_cache
+from app.utils.sample_pool import sample_pool
+
+router = APIRouter()
+
+
+@router.get("/sync", summary="Sync pipeline throughput, stage timers and upstream latency")
+async def get_sync_metrics():
+    last = await SyncJob.find({"finished_at": {"$ne": None}}).sort("-finished_at").first_or_none()
+    return {
+        "current": metrics.snapshot(),
+        "upstream_client": get_upstream_client().stats(),
+        "last_run": {
+            "_id": str(last.id),
+            "status": last.status,
+            "finished_at": last.finished_at,
+            "counts": last.counts,
+            "durations": last.durations,
+            "summary": last.summary,
+        } if last else None,
+    }
+
+
+@router.get("/cache", summary="Catalog response cache hits, misses and evictions")
+async def get_cache_metrics():
+    return response_cache.stats()
+
+
+@router.get("/sample_pool", summary="Sizes and age of the random recommendation pools")
+async def get_sample_pool_metrics():
+    return sample_pool.stats()
@@ -1,69 +1,74 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
 import os
 from bson import ObjectId
 from app.db import movies_collection
+from app.utils.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.catalog import list_page, serialize_movie, INTERNAL_FIELDS, LISTABLE
+from app.utils.response_cache import cached
+from app.models.responses import MovieListItem
+from app.utils.sample_pool import sample_pool
 
 router = APIRouter()
 
 
-def serialize_movie(movie_dict: Dict) -> Dict:
-    """Convert ObjectId to string and rename stream_type -> type"""
-    if '_id' in movie_dict:
-        movie_dict['_id'] = str(movie_dict['_id'])
-    if "stream_type" in movie_dict:
-        movie_dict["type"] = movie_dict.pop("stream_type")  # rename
-    else:
-        movie_dict["type"] = "movie"
-    return movie_dict
-
-
-@router.get("/fetch")
-async def get_movies():
-    """Fetch movies with ID, name, stream_icon, and type"""
+async def _movie_page(response: Response, sort: str, cursor: Optional[str], limit: int, category_id: str = None):
     try:
-        filter_query = {
-            "stream_icon": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_url": {"$ne": None, "$ne": "", "$exists": True},
-            "container_extension": "mkv"
-        }
-
-        projection = {
-            "name": 1,
-            "stream_icon": 1,
-            "stream_type": 1,  # we’ll rename this in serialize_movie()
-            "_id": 1
-        }
-
-        cursor = movies_collection.find(filter_query, projection).limit(40)
-        movies = await cursor.to_list(length=40)
+        movies, next_cursor = await list_page("movie", sort, cursor, limit, category_id)
 
         if not movies:
             raise HTTPException(status_code=404, detail="No movies found matching the criteria")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         # Rename stream_type -> type and convert _id
         serialized_movies = [serialize_movie(movie) for movie in movies]
         return serialized_movies
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/fetch", response_model=List[MovieListItem])
+@cached("movies:fetch", model=List[MovieListItem])
+async def get_movies(
+    response: Response,
+    sort: Literal["name", "added", "rating"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Fetch movies with ID, name, stream_icon, and type. The next page's cursor is in X-Next-Cursor."""
+    return await _movie_page(response, sort, cursor, limit)
+
+
+@router.get("/category/{category_id}", response_model=List[MovieListItem])
+@cached("movies:category", model=List[MovieListItem])
+async def get_movies_by_category(
+    category_id: str,
+    response: Response,
+    sort: Literal["name", "added", "rating"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Movies of one category, paginated like /fetch."""
+    return await _movie_page(response, sort, cursor, limit, category_id)
+
+
 @router.get("/fetch/{movie_id}")
+@cached("movies:one")
 async def get_movie_by_id(movie_id: str):
     try:
         if not ObjectId.is_valid(movie_id):
             raise HTTPException(status_code=400, detail="Invalid movie ID format")
 
-        filter_query = {
-            "_id": ObjectId(movie_id),
-            "stream_icon": {"$ne": None, "$ne": "", "$exists": True},
-            "stream_url": {"$ne": None, "$ne": "", "$exists": True},
-            "container_extension": "mkv"
-        }
+        filter_query = {"_id": ObjectId(movie_id), **LISTABLE}
 
-        movie = await movies_collection.find_one(filter_query)
+        movie = await movies_collection.find_one(filter_query, INTERNAL_FIELDS)
         if not movie:
             raise HTTPException(status_code=404, detail="Movie not found or does not meet criteria")
 
@@ -81,33 +86,21 @@ async def get_movie_by_id(movie_id: str):
 
 
 @router.get("/featured_banner")
-async def get_featured_banner():
+async def get_featured_banner(user_id: Optional[str] = None):
+    """Four random movies from the in-memory sample pool; with user_id, recently shown ones are avoided."""
     try:
-        pipeline = [
-            {
-                "$match": {
-                    "stream_icon": {"$ne": None, "$ne": "", "$exists": True},
-                    "stream_url": {"$ne": None, "$ne": "", "$exists": True},
-                    "container_extension": "mkv"
-                }
-            },
-            {"$sample": {"size": 4}},
-            {"$project": {"_id": 1, "stream_icon": 1, "stream_type": 1}}
+        await sample_pool.ensure_fresh()
+        movies = [
+            {"_id": m["_id"], "stream_icon": m["image"], "type": "movie"}
+            for m in sample_pool.draw("movie", 4, user_id)
         ]
 
-        movies = await movies_collection.aggregate(pipeline).to_list(length=4)
-
         if not movies:
             raise HTTPException(status_code=404, detail="No featured movies found")
 
-        for movie in movies:
-            movie["_id"] = str(movie["_id"])
-            if "stream_type" in movie:
-                movie["type"] = movie.pop("stream_type")
-            else:
-                movie["type"] = "movie"
-
         return movies
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
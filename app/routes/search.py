@@ -1,16 +1,21 @@
 # backend/app/routes/search.py
+import asyncio
+
 from fastapi import APIRouter, Query, HTTPException
 from fastapi.encoders import jsonable_encoder
 from typing import List
 from app.models.search_history import SearchHistory
-from app.models.movies import Movie
-from app.models.series import Series
-from app.models.live_channels import LiveChannel
+from app.utils.catalog_query import search_summaries
+from app.utils.fast_json import fast_response
+from app.models.responses import SearchResponse
 
 router = APIRouter()
 
+# Type labels search has always returned
+SEARCH_TYPES = {"movie": "movie", "series": "series", "live": "live_channel"}
+
 # ========== SEARCH CONTENT (Movies + Series + Live Channels) ==========
-@router.get("", summary="Search across movies, series, and live channels")
+@router.get("", summary="Search across movies, series, and live channels", response_model=SearchResponse)
 async def search_content(
     q: str = Query(..., description="Search query string"),
     user_id: str = Query(..., description="User performing search"),
@@ -19,54 +24,28 @@ async def search_content(
     if not q.strip():
         raise HTTPException(status_code=400, detail="Query string cannot be empty")
 
-    # ✅ Save in search history
+    # ✅ Save in search history while all three collections are searched concurrently
     history = SearchHistory(user_id=user_id, query=q)
-    await history.insert()
-
-    regex_query = {"$regex": q, "$options": "i"}
-
-    # ✅ Perform searches
-    movie_results = await Movie.find({"name": regex_query}).limit(limit).to_list()
-    series_results = await Series.find({"name": regex_query}).limit(limit).to_list()
-    live_results = await LiveChannel.find({"name": regex_query}).limit(limit).to_list()
-
-    all_results = []
-
-    for m in movie_results:
-        all_results.append({
-            "_id": str(m.id),
-            "name": m.name,
-            "stream_icon": m.stream_icon,
-            "type": "movie",
-            "is_favourite": False,
-        })
-
-    for s in series_results:
-        all_results.append({
-            "_id": str(s.id),
-            "name": s.name,
-            "stream_icon": s.cover,
-            "type": "series",
+    _, (summaries, missing) = await asyncio.gather(history.insert(), search_summaries(q, limit))
+
+    all_results = [
+        {
+            "_id": item["_id"],
+            "name": item["name"],
+            "stream_icon": item["image"],
+            "type": SEARCH_TYPES[item["type"]],
             "is_favourite": False,
-        })
-
-    for l in live_results:
-        all_results.append({
-            "_id": str(l.id),
-            "name": l.name,
-            "stream_icon": l.stream_icon,
-            "type": "live_channel",
-            "is_favourite": False,
-        })
-
-    all_results.sort(key=lambda x: x["name"].lower())
-    all_results = all_results[:limit]
+        }
+        for item in summaries[:limit]
+    ]
 
-    return {
+    return fast_response({
         "total": len(all_results),
         "limit": limit,
         "items": all_results,
-    }
+        # Content types that timed out and are missing from items
+        "partial": missing,
+    }, model=SearchResponse)
 
 
 # ========== SEARCH HISTORY ==========
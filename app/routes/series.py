@@ -1,57 +1,70 @@
-from fastapi import APIRouter, HTTPException
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
-from app.db import series_collection
+from app.db import series_collection, episodes_collection
+from app.utils.pagination import InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.catalog import list_page, serialize_series, INTERNAL_FIELDS, LISTABLE
+from app.utils.response_cache import cached
+from app.models.responses import SeriesListItem
 
 router = APIRouter()
 
-@router.get("/fetch")
-async def get_series():
+async def _series_page(response: Response, sort: str, cursor: Optional[str], limit: int, category_id: str = None):
     try:
-        filter_query = {
-            "name": {"$ne": None, "$ne": "", "$exists": True},
-            "cover": {"$ne": None, "$ne": "", "$exists": True},
-            "seasons": {"$ne": [], "$exists": True}
-        }
-
-        projection = {
-            "name": 1,
-            "cover": 1,
-            "_id": 1
-        }
-
-        cursor = series_collection.find(filter_query, projection).limit(40)
-        series_list = await cursor.to_list(length=40)
+        series_list, next_cursor = await list_page("series", sort, cursor, limit, category_id)
 
         if not series_list:
             raise HTTPException(status_code=404, detail="No series found")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
-        for series in series_list:
-            series["_id"] = str(series["_id"])
-            series["type"] = "series"  # Explicitly add type
-
-        return series_list
+        return [serialize_series(series) for series in series_list]
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/fetch", response_model=List[SeriesListItem])
+@cached("series:fetch", model=List[SeriesListItem])
+async def get_series(
+    response: Response,
+    sort: Literal["name", "added", "rating"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Series page; the next page's cursor is in X-Next-Cursor."""
+    return await _series_page(response, sort, cursor, limit)
+
+
+@router.get("/category/{category_id}", response_model=List[SeriesListItem])
+@cached("series:category", model=List[SeriesListItem])
+async def get_series_by_category(
+    category_id: str,
+    response: Response,
+    sort: Literal["name", "added", "rating"] = "name",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Series of one category, paginated like /fetch."""
+    return await _series_page(response, sort, cursor, limit, category_id)
+
+
 @router.get("/fetch/{series_id}")
+@cached("series:one")
 async def get_series_by_id(series_id: str):
     try:
         if not ObjectId.is_valid(series_id):
             raise HTTPException(status_code=400, detail="Invalid series ID format")
 
-        filter_query = {
-            "_id": ObjectId(series_id),
-            "name": {"$ne": None, "$ne": "", "$exists": True},
-            "cover": {"$ne": None, "$ne": "", "$exists": True},
-            "seasons": {"$ne": [], "$exists": True}
-        }
+        filter_query = {"_id": ObjectId(series_id), **LISTABLE}
 
-        series = await series_collection.find_one(filter_query)
+        series = await series_collection.find_one(filter_query, INTERNAL_FIELDS)
 
         if not series:
             raise HTTPException(status_code=404, detail="Series not found")
@@ -64,3 +77,55 @@ async def get_series_by_id(series_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/{series_id}/seasons/{season_number}/episodes")
+@cached("series:episodes")
+async def get_season_episodes(series_id: str, season_number: int):
+    """Episodes of one season, in order. The series document only carries season summaries."""
+    try:
+        if not ObjectId.is_valid(series_id):
+            raise HTTPException(status_code=400, detail="Invalid series ID format")
+
+        series = await series_collection.find_one(
+            {"_id": ObjectId(series_id), "deleted_at": None},
+            {"series_id": 1, "provider_id": 1},
+        )
+        if not series:
+            raise HTTPException(status_code=404, detail="Series not found")
+
+        projection = {
+            "_id": 1,
+            "episode_num": 1,
+            "title": 1,
+            "stream_id": 1,
+            "stream_url": 1,
+            "added": 1,
+        }
+        cursor = episodes_collection.find(
+            {
+                "provider_id": series.get("provider_id"),
+                "series_id": series["series_id"],
+                "season_number": season_number,
+            },
+            projection,
+        ).sort("episode_num", 1)
+        episodes = await cursor.to_list(length=None)
+
+        if not episodes:
+            raise HTTPException(status_code=404, detail="Season not found")
+
+        for episode in episodes:
+            episode["_id"] = str(episode["_id"])
+            episode["type"] = "episode"
+
+        return {
+            "series_id": series_id,
+            "season_number": season_number,
+            "episodes": episodes,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -0,0 +1,67 @@
+# backend/app/routes/sync.py
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Literal, Optional
+from beanie import PydanticObjectId
+from app.models.sync_job import SyncJob
+from app.utils.sync_engine import SYNC_STRATEGY
+from app.utils.sync_scheduler import scheduler, active_job, SyncAlreadyRunning
+
+router = APIRouter()
+
+
+def serialize_job(job: SyncJob) -> dict:
+    data = job.model_dump(mode="json", exclude={"id", "revision_id"})
+    data["_id"] = str(job.id)
+    # Summed over accounts (keys are "<type>:<account>")
+    data["progress"] = {
+        ct: {
+            "done": sum(len(ids) for key, ids in job.completed_categories.items() if key.split(":")[0] == ct),
+            "total": sum(n for key, n in job.categories_total.items() if key.split(":")[0] == ct),
+        }
+        for ct in job.content_types
+    }
+    # The checkpoint lists can be long; status only needs the counts above
+    data.pop("completed_categories", None)
+    return data
+
+
+@router.post("/trigger", summary="Start a background catalog sync")
+async def trigger_sync(
+    content_type: Optional[List[Literal["movie", "series", "live"]]] = Query(None),
+    incremental: bool = Query(False),
+    strategy: Literal["stream", "full", "per_category"] = Query(SYNC_STRATEGY),
+):
+    try:
+        job = await scheduler.trigger(content_type, incremental=incremental, strategy=strategy)
+    except SyncAlreadyRunning as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return serialize_job(job)
+
+
+@router.get("/status", summary="Status of a sync job (latest when no id is given)")
+async def get_sync_status(job_id: Optional[str] = Query(None)):
+    if job_id:
+        if not PydanticObjectId.is_valid(job_id):
+            raise HTTPException(status_code=400, detail="Invalid job ID format")
+        job = await SyncJob.get(job_id)
+    else:
+        job = await active_job() or await SyncJob.find().sort("-created_at").first_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return serialize_job(job)
+
+
+@router.get("/jobs", summary="Recent sync jobs")
+async def list_sync_jobs(limit: int = Query(20, ge=1, le=100)):
+    jobs = await SyncJob.find().sort("-created_at").limit(limit).to_list()
+    return {"jobs": [serialize_job(j) for j in jobs]}
+
+
+@router.post("/cancel", summary="Cancel the running sync job")
+async def cancel_sync(job_id: Optional[str] = Query(None)):
+    if job_id and not PydanticObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    job = await scheduler.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No running sync job")
+    return {"status": "cancelling", "id": str(job.id)}
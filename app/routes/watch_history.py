@@ -8,6 +8,9 @@ from app.models.watch_history import WatchHistory
 from app.models.movies import Movie
 from app.models.series import Series
 from app.models.live_channels import LiveChannel
+from app.utils.catalog_query import hydrate_summaries, ref_key
+from app.utils.fast_json import fast_response
+from app.models.responses import WatchHistoryResponse
 
 router = APIRouter()
 
@@ -69,7 +72,7 @@ async def add_watch_history(
 # =========================
 # GET WATCH HISTORY
 # =========================
-@router.get("/{user_id}", summary="Get watch history for a user")
+@router.get("/{user_id}", summary="Get watch history for a user", response_model=WatchHistoryResponse)
 async def get_watch_history(user_id: str, limit: int = Query(20, ge=1)):
     histories = (
         await WatchHistory.find({"user_id": user_id})
@@ -85,17 +88,12 @@ async def get_watch_history(user_id: str, limit: int = Query(20, ge=1)):
 
     limited_histories = list(latest_by_content.values())[:limit]
 
-    # ✅ Attach content details based on content_type
+    # ✅ Attach content details: one concurrent lookup per content type
+    found, _ = await hydrate_summaries((h.content_type, h.content_id) for h in limited_histories)
+
     result = []
     for h in limited_histories:
-        content = None
-        if h.content_type == "movie":
-            content = await Movie.get(h.content_id)
-        elif h.content_type == "series":
-            content = await Series.get(h.content_id)
-        elif h.content_type == "live_channel":
-            content = await LiveChannel.get(h.content_id)
-
+        content = found.get(ref_key(h.content_type, h.content_id))
         if content:
             result.append(
                 {
@@ -104,15 +102,14 @@ async def get_watch_history(user_id: str, limit: int = Query(20, ge=1)):
                     "progress": h.progress,
                     "content_type": h.content_type,
                     "content": {
-                        "_id": str(content.id),
-                        "name": getattr(content, "name", None),
-                        "stream_icon": getattr(content, "stream_icon", None)
-                        or getattr(content, "cover", None),
+                        "_id": content["_id"],
+                        "name": content["name"],
+                        "stream_icon": content["image"],
                     },
                 }
             )
 
-    return {"history": result}
+    return fast_response({"history": result}, model=WatchHistoryResponse)
 
 
 # =========================
@@ -0,0 +1,53 @@
+# backend/app/utils/backfill_playable.py
+"""
+One-off migration: compute `playable` and `image` on documents stored
+before ingest set them, then swap the full listing indexes for their
+partial (playable-only) versions.
+
+    python -m app.utils.backfill_playable
+
+Safe to re-run: the fields are recomputed server-side from the stored
+values with the same rules as app/utils/playable.py.
+"""
+import asyncio
+
+from app.db import init_db, ensure_indexes
+from app.utils.catalog import COLLECTIONS
+from app.utils.playable import playable_expr, image_expr
+
+# Non-partial listing indexes the partial ones replace (same key patterns)
+SUPERSEDED = {
+    "movie": ["name_1__id_1", "added_1__id_1", "rating_1__id_1",
+              "category_id_1_name_1__id_1", "category_id_1_added_1__id_1", "category_id_1_rating_1__id_1"],
+    "series": ["name_1__id_1", "last_modified_1__id_1", "rating_1__id_1",
+               "category_id_1_name_1__id_1", "category_id_1_last_modified_1__id_1", "category_id_1_rating_1__id_1"],
+    "live": ["name_1__id_1", "added_1__id_1", "category_id_1_name_1__id_1", "category_id_1_added_1__id_1"],
+}
+
+
+async def backfill():
+    await init_db(indexes=False)
+
+    for content_type, collection in COLLECTIONS.items():
+        res = await collection.update_many(
+            {},
+            [{"$set": {"playable": playable_expr(content_type), "image": image_expr(content_type)}}],
+        )
+        playable = await collection.count_documents({"playable": True})
+        print(f"➡️ {collection.name}: {res.modified_count} updated, {playable} playable")
+
+        existing = await collection.index_information()
+        for name in SUPERSEDED[content_type]:
+            if name in existing:
+                await collection.drop_index(name)
+                print(f"🗑️ Dropped {collection.name}.{name}")
+
+    failures = await ensure_indexes()
+    if failures:
+        print(f"❌ {len(failures)} indexes not built; see python -m app.utils.build_indexes")
+    else:
+        print("✅ Playable flags backfilled and partial indexes built")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,95 @@
+# backend/app/utils/build_indexes.py
+"""
+Build the indexes declared in the models' Settings.indexes on existing
+data and report their sizes.
+
+    python -m app.utils.build_indexes            # build missing indexes, then report
+    python -m app.utils.build_indexes --report   # report only
+
+MongoDB (4.2+) builds indexes without holding an exclusive lock for the
+duration, so this can run next to the live API. A unique index that
+fails because of existing duplicates is reported with a few of the
+duplicate keys; remove those and re-run.
+"""
+import argparse
+import asyncio
+import time
+
+from pymongo.errors import OperationFailure
+
+from app.db import init_db, database, DOCUMENT_MODELS
+
+DUPLICATE_KEY = 11000
+DUPLICATE_SAMPLE = 5
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+async def _duplicates(collection, keys: list) -> list:
+    pipeline = [
+        {"$group": {"_id": {k: f"${k}" for k in keys}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": DUPLICATE_SAMPLE},
+    ]
+    return await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=DUPLICATE_SAMPLE)
+
+
+async def build(models=DOCUMENT_MODELS) -> int:
+    """Create the declared indexes that do not exist yet. Returns how many failed."""
+    failed = 0
+    for model in models:
+        collection = database[model.Settings.name]
+        existing = await collection.index_information()
+        for index in getattr(model.Settings, "indexes", []):
+            spec = index.document
+            if spec["name"] in existing:
+                continue
+            docs = await collection.estimated_document_count()
+            print(f"🔨 {collection.name}.{spec['name']} ({docs} documents)...")
+            started = time.monotonic()
+            try:
+                await collection.create_indexes([index])
+                print(f"✅ {collection.name}.{spec['name']} built in {time.monotonic() - started:.1f}s")
+            except OperationFailure as e:
+                failed += 1
+                print(f"❌ {collection.name}.{spec['name']}: {e}")
+                if e.code == DUPLICATE_KEY:
+                    for dup in await _duplicates(collection, list(spec["key"].keys())):
+                        print(f"   duplicate {dup['_id']} x{dup['count']}")
+    return failed
+
+
+async def report(models=DOCUMENT_MODELS):
+    """Print each collection's indexes with their size, flagging undeclared ones."""
+    total = 0
+    for model in models:
+        collection = database[model.Settings.name]
+        declared = {index.document["name"] for index in getattr(model.Settings, "indexes", [])}
+        stats = await collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=1)
+        sizes = stats[0]["storageStats"].get("indexSizes", {}) if stats else {}
+        print(f"📦 {collection.name}")
+        for name, size in sorted(sizes.items()):
+            note = "" if name == "_id_" or name in declared else "  (not declared)"
+            print(f"   {name:<60} {_mb(size):>12}{note}")
+            total += size
+        for name in sorted(declared - sizes.keys()):
+            print(f"   {name:<60} {'missing':>12}")
+    print(f"📊 Total index size: {_mb(total)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report", action="store_true", help="only report index sizes")
+    args = parser.parse_args()
+
+    await init_db(indexes=False)
+    failed = 0 if args.report else await build()
+    await report()
+    if failed:
+        raise SystemExit(f"{failed} indexes could not be built")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+# backend/app/utils/bulk_writer.py
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.utils.sync_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = int(os.getenv("SYNC_BULK_BATCH_SIZE", "500"))
+
+# Beanie bookkeeping fields that must never be written through $set
+_EXCLUDED_FIELDS = {"id", "revision_id"}
+
+
+@dataclass
+class BatchResult:
+    size: int = 0
+    inserted: int = 0
+    modified: int = 0
+    matched: int = 0
+    failed: int = 0
+
+    def add(self, other: "BatchResult"):
+        self.size += other.size
+        self.inserted += other.inserted
+        self.modified += other.modified
+        self.matched += other.matched
+        self.failed += other.failed
+
+
+class PreparedUpsert(NamedTuple):
+    """An upsert already reduced to plain dicts (e.g. by a build worker process)."""
+    model: type
+    filter: dict
+    update: dict
+
+
+def upsert_spec(doc, key: str):
+    """
+    (filter, update) equivalent of
+    `Model.find_one(key == ...).upsert({"$set": doc.model_dump(exclude_unset=True)}, on_insert=doc)`.
+    Explicitly set fields are always written; defaults only land on insert.
+    Documents carrying a provider_id are matched within their provider.
+    """
+    set_fields = doc.model_dump(exclude_unset=True, exclude=_EXCLUDED_FIELDS)
+    on_insert = {
+        k: v
+        for k, v in doc.model_dump(exclude=_EXCLUDED_FIELDS).items()
+        if k not in set_fields
+    }
+    update = {"$set": set_fields}
+    if on_insert:
+        update["$setOnInsert"] = on_insert
+    match = {key: getattr(doc, key)}
+    if "provider_id" in type(doc).model_fields:
+        match["provider_id"] = doc.provider_id
+    return match, update
+
+
+def upsert_operation(match: dict, update: dict, stamp: dict = None) -> UpdateOne:
+    """UpdateOne for an upsert spec; `stamp` fields (e.g. the sync generation) are added to its $set."""
+    if stamp:
+        update = {**update, "$set": {**update["$set"], **stamp}}
+        on_insert = {k: v for k, v in update.get("$setOnInsert", {}).items() if k not in stamp}
+        update.pop("$setOnInsert", None)
+        if on_insert:
+            update["$setOnInsert"] = on_insert
+    return UpdateOne(match, update, upsert=True)
+
+
+class BulkUpsertWriter:
+    """
+    Collects upserts keyed on `key` and flushes them with an unordered
+    bulk_write every `batch_size` operations. Call flush() once at the end
+    to write the tail. Per-batch and running totals are kept on the writer.
+    """
+
+    def __init__(self, collection, key: str, batch_size: int = BULK_BATCH_SIZE, label: str = None, stamp: dict = None):
+        self.collection = collection
+        self.key = key
+        self.stamp = stamp
+        self.batch_size = max(1, batch_size)
+        self.label = label or collection.name
+        self.totals = BatchResult()
+        self.batches = 0
+        self._pending = []
+        self._lock = asyncio.Lock()
+
+    async def add(self, doc):
+        await self.add_spec(*upsert_spec(doc, self.key))
+
+    async def add_prepared(self, prepared: PreparedUpsert):
+        await self.add_spec(prepared.filter, prepared.update)
+
+    async def add_spec(self, match: dict, update: dict):
+        self._pending.append(upsert_operation(match, update, self.stamp))
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    def record_failure(self, count: int = 1):
+        """Count items that failed before reaching the writer (e.g. bad payloads)."""
+        self.totals.failed += count
+
+    async def flush(self) -> BatchResult:
+        # Swap the buffer first so producers can keep adding while we write.
+        ops, self._pending = self._pending, []
+        if not ops:
+            return BatchResult()
+
+        result = BatchResult(size=len(ops))
+        try:
+            with metrics.timer("write", items=len(ops)):
+                res = await self.collection.bulk_write(ops, ordered=False)
+            result.inserted = res.upserted_count
+            result.modified = res.modified_count
+            result.matched = res.matched_count
+        except BulkWriteError as e:
+            details = e.details or {}
+            result.inserted = details.get("nUpserted", 0)
+            result.modified = details.get("nModified", 0)
+            result.matched = details.get("nMatched", 0)
+            result.failed = len(details.get("writeErrors", []))
+            for err in details.get("writeErrors", [])[:3]:
+                logger.warning(f"[{self.label}] write error at op {err.get('index')}: {err.get('errmsg')}")
+        except Exception as e:
+            result.failed = len(ops)
+            logger.error(f"[{self.label}] bulk write of {len(ops)} ops failed: {e}")
+
+        async with self._lock:
+            self.batches += 1
+            self.totals.add(result)
+            batch_no = self.batches
+
+        logger.info(
+            f"[{self.label}] batch {batch_no}: {result.size} ops → "
+            f"inserted={result.inserted} modified={result.modified} failed={result.failed}"
+        )
+        return result
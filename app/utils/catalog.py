@@ -0,0 +1,114 @@
+# backend/app/utils/catalog.py
+"""
+What a catalog list shows, per content type: the collection, the filter
+an item must pass to be listed, the projection and the serializer. Shared
+by the /fetch lists, the category browse endpoints and the rails.
+"""
+import asyncio
+
+from app.db import movies_collection, series_collection, channels_collection
+from app.utils.pagination import paginate, SORTS, DEFAULT_PAGE_SIZE
+
+COLLECTIONS = {
+    "movie": movies_collection,
+    "series": series_collection,
+    "live": channels_collection,
+}
+
+# playable is computed at ingest (app/utils/playable.py) and cleared by the
+# sweep; deleted_at is implied but kept as a cheap guard
+LISTABLE = {"playable": True, "deleted_at": None}
+
+# Sync bookkeeping that never leaves the server: exclusion projection for
+# whole-document reads (by-id routes, continue watching)
+INTERNAL_FIELDS = {"content_hash": 0, "sync_generation": 0, "playable": 0}
+
+LIST_FILTERS = {
+    "movie": LISTABLE,
+    "series": LISTABLE,
+    "live": LISTABLE,
+}
+
+LIST_PROJECTIONS = {
+    "movie": {"name": 1, "stream_icon": 1, "stream_type": 1, "_id": 1},
+    "series": {"name": 1, "cover": 1, "_id": 1},
+    "live": {"name": 1, "stream_icon": 1, "stream_type": 1, "_id": 1},
+}
+
+# Max categories per rails request
+MAX_RAILS = 20
+
+
+def serialize_movie(movie: dict) -> dict:
+    """Convert ObjectId to string and rename stream_type -> type"""
+    if "_id" in movie:
+        movie["_id"] = str(movie["_id"])
+    if "stream_type" in movie:
+        movie["type"] = movie.pop("stream_type")  # rename
+    else:
+        movie["type"] = "movie"
+    return movie
+
+
+def serialize_series(series: dict) -> dict:
+    series["_id"] = str(series["_id"])
+    series["type"] = "series"
+    return series
+
+
+def serialize_channel(channel: dict) -> dict:
+    channel["_id"] = str(channel["_id"])
+    # No need to add 'type' if 'stream_type' already exists
+    if "stream_type" not in channel:
+        channel["stream_type"] = "live_channel"
+    return channel
+
+
+SERIALIZERS = {
+    "movie": serialize_movie,
+    "series": serialize_series,
+    "live": serialize_channel,
+}
+
+
+async def list_page(
+    content_type: str,
+    sort: str = "name",
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    category_id: str = None,
+    projection: dict = None,
+    filters: dict = None,
+):
+    """
+    One keyset page of listable items → (raw documents, next cursor).
+    With category_id the page is served by the (category_id, sort field, _id) index.
+    `filters` narrows the page further (e.g. to one provider_id).
+    """
+    filter_query = dict(LIST_FILTERS[content_type])
+    if category_id is not None:
+        filter_query["category_id"] = category_id
+    if filters:
+        filter_query.update(filters)
+    field, direction = SORTS[content_type][sort]
+    return await paginate(
+        COLLECTIONS[content_type],
+        filter_query,
+        projection or LIST_PROJECTIONS[content_type],
+        field,
+        direction,
+        cursor,
+        limit,
+    )
+
+
+async def category_rails(content_type: str, category_ids: list, sort: str = "name", limit: int = 10, filters: dict = None) -> list:
+    """First page of each category, queried concurrently, in the order asked."""
+    pages = await asyncio.gather(
+        *(list_page(content_type, sort, limit=limit, category_id=cid, filters=filters) for cid in category_ids)
+    )
+    serialize = SERIALIZERS[content_type]
+    return [
+        {"category_id": cid, "items": [serialize(doc) for doc in docs], "next_cursor": next_cursor}
+        for cid, (docs, next_cursor) in zip(category_ids, pages)
+    ]
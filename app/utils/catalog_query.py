@@ -0,0 +1,155 @@
+# backend/app/utils/catalog_query.py
+"""
+Queries that span movies, series and live channels. Each content type is
+queried concurrently rather than one after another, under its own
+deadline (CATALOG_QUERY_TIMEOUT): a type that times out or fails is left
+out and reported back as missing, so callers can answer with what the
+other types returned.
+
+Everything comes back as the same summary record whichever collection
+it lives in:
+
+    {"_id": "<hex>", "name": ..., "image": ..., "type": "movie" | "series" | "live"}
+"""
+import asyncio
+import logging
+import os
+
+from bson import ObjectId
+
+from app.utils.catalog import COLLECTIONS, INTERNAL_FIELDS
+from app.utils.playable import IMAGE_FIELDS, normalise_image
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+CATALOG_QUERY_TIMEOUT = float(os.getenv("CATALOG_QUERY_TIMEOUT", "3"))
+
+# History and continue-watching records say "live_channel"; favourites say "live"
+TYPE_ALIASES = {"live_channel": "live"}
+
+# image is set at ingest; the raw artwork field covers documents not yet backfilled
+SUMMARY_PROJECTIONS = {
+    content_type: {"_id": 1, "name": 1, "image": 1, field: 1}
+    for content_type, field in IMAGE_FIELDS.items()
+}
+
+
+def content_key(content_type: str):
+    """Canonical content type ("movie" | "series" | "live"), or None if unknown."""
+    content_type = TYPE_ALIASES.get(content_type, content_type)
+    return content_type if content_type in COLLECTIONS else None
+
+
+def ref_key(content_type: str, content_id: str):
+    """Key a hydrated item is found under for a stored (content_type, content_id) reference."""
+    content_id = str(ObjectId(content_id)) if ObjectId.is_valid(content_id) else content_id
+    return content_key(content_type), content_id
+
+
+def summarize(content_type: str, doc: dict) -> dict:
+    image = doc.get("image") or normalise_image(doc.get(IMAGE_FIELDS[content_type]))
+    return {"_id": str(doc["_id"]), "name": doc.get("name"), "image": image, "type": content_type}
+
+
+async def gather_by_type(calls: dict, timeout: float = CATALOG_QUERY_TIMEOUT):
+    """
+    Await {content_type: coroutine} concurrently, each bounded by `timeout`
+    → ({content_type: result}, [content types that timed out or failed]).
+    """
+    async def bounded(content_type, call):
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Catalog query on {content_type} exceeded {timeout}s; answering without it")
+        except Exception as e:
+            logger.error(f"Catalog query on {content_type} failed: {e}")
+        return None
+
+    content_types = list(calls)
+    outcomes = await asyncio.gather(*(bounded(ct, calls[ct]) for ct in content_types))
+    results, missing = {}, []
+    for content_type, outcome in zip(content_types, outcomes):
+        if outcome is None:
+            missing.append(content_type)
+        else:
+            results[content_type] = outcome
+    return results, missing
+
+
+async def _find(content_type: str, filter_query: dict, projection: dict, limit: int = 0, timeout: float = CATALOG_QUERY_TIMEOUT) -> list:
+    cursor = COLLECTIONS[content_type].find(filter_query, projection)
+    # Let the server give up at the same deadline instead of finishing unread work
+    cursor = cursor.max_time_ms(int(timeout * 1000))
+    if limit:
+        cursor = cursor.limit(limit)
+    return await cursor.to_list(length=None)
+
+
+async def _find_summaries(content_type: str, filter_query: dict, limit: int = 0, timeout: float = CATALOG_QUERY_TIMEOUT) -> list:
+    docs = await _find(content_type, filter_query, SUMMARY_PROJECTIONS[content_type], limit, timeout)
+    return [summarize(content_type, doc) for doc in docs]
+
+
+async def search_summaries(pattern: str, limit: int, timeout: float = CATALOG_QUERY_TIMEOUT):
+    """
+    Items whose name matches `pattern` (case-insensitive regex), up to
+    `limit` per type → (summaries sorted by name, missing content types).
+    """
+    filter_query = {"name": {"$regex": pattern, "$options": "i"}, "deleted_at": None}
+    results, missing = await gather_by_type(
+        {ct: _find_summaries(ct, filter_query, limit, timeout) for ct in COLLECTIONS},
+        timeout,
+    )
+    items = [item for content_type in COLLECTIONS for item in results.get(content_type, [])]
+    items.sort(key=lambda item: (item["name"] or "").lower())
+    return items, missing
+
+
+def _ids_by_type(refs) -> dict:
+    """(content_type, content_id) pairs → {content_type: [ObjectId]}; unknown types and bad ids are dropped."""
+    grouped = {}
+    for content_type, content_id in refs:
+        content_type = content_key(content_type)
+        if content_type is None or not ObjectId.is_valid(content_id):
+            continue
+        grouped.setdefault(content_type, {})[ObjectId(content_id)] = None
+    return {content_type: list(ids) for content_type, ids in grouped.items()}
+
+
+async def hydrate_summaries(refs, timeout: float = CATALOG_QUERY_TIMEOUT):
+    """
+    Summaries for (content_type, content_id) pairs, one $in query per type
+    → ({(content_type, content_id): summary}, missing content types).
+    Look items up with ref_key(content_type, content_id).
+    """
+    grouped = _ids_by_type(refs)
+    results, missing = await gather_by_type(
+        {ct: _find_summaries(ct, {"_id": {"$in": ids}}, timeout=timeout) for ct, ids in grouped.items()},
+        timeout,
+    )
+    found = {
+        (content_type, item["_id"]): item
+        for content_type, items in results.items()
+        for item in items
+    }
+    return found, missing
+
+
+async def hydrate_documents(refs, timeout: float = CATALOG_QUERY_TIMEOUT):
+    """
+    Whole catalog documents (raw, _id as str, without sync bookkeeping) for
+    (content_type, content_id) pairs → ({(content_type, content_id): document},
+    missing content types). Raw dicts skip model validation and re-encoding.
+    """
+    grouped = _ids_by_type(refs)
+    results, missing = await gather_by_type(
+        {ct: _find(ct, {"_id": {"$in": ids}}, INTERNAL_FIELDS, timeout=timeout) for ct, ids in grouped.items()},
+        timeout,
+    )
+    found = {}
+    for content_type, docs in results.items():
+        for doc in docs:
+            doc["_id"] = str(doc["_id"])
+            found[(content_type, doc["_id"])] = doc
+    return found, missing
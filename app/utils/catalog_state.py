@@ -0,0 +1,48 @@
+# backend/app/utils/catalog_state.py
+"""
+The catalog generation: a number the sync bumps whenever it has finished
+writing a stage, stored in `catalog_state` so every API process sees it.
+Anything derived from catalog data (response cache, ETags) is valid for
+exactly one generation.
+"""
+import os
+import time
+from datetime import datetime, timezone
+
+from app.db import catalog_state_collection
+
+# How often an API process re-reads the generation (seconds)
+CATALOG_GENERATION_POLL = float(os.getenv("CATALOG_GENERATION_POLL", "5"))
+
+_STATE_ID = "catalog"
+
+
+class CatalogGeneration:
+    def __init__(self, poll: float = CATALOG_GENERATION_POLL):
+        self.poll = poll
+        self.value = 0
+        self.updated_at = None  # when the current generation was published
+        self._checked = None
+
+    async def current(self) -> int:
+        """The latest published generation, re-read at most every `poll` seconds."""
+        if self._checked is None or time.monotonic() - self._checked >= self.poll:
+            doc = await catalog_state_collection.find_one({"_id": _STATE_ID})
+            self._checked = time.monotonic()
+            if doc:
+                self.value = doc["generation"]
+                self.updated_at = doc.get("updated_at")
+        return self.value
+
+    async def publish(self) -> int:
+        """Start a new generation (called by the sync after each stage's writes)."""
+        generation = time.time_ns() // 1_000_000
+        now = datetime.now(timezone.utc)
+        await catalog_state_collection.update_one(
+            {"_id": _STATE_ID}, {"$set": {"generation": generation, "updated_at": now}}, upsert=True
+        )
+        self.value, self.updated_at, self._checked = generation, now, time.monotonic()
+        return generation
+
+
+catalog_generation = CatalogGeneration()
@@ -0,0 +1,136 @@
+# backend/app/utils/category_summary.py
+"""
+Materialised category summaries (`category_summaries`): per content type
+and category, its name, parent and live item count. The sync refreshes
+only the categories whose items changed or were swept, so
+/categories/fetch_all reads one small collection instead of grouping the
+whole catalog on every request.
+"""
+import logging
+from datetime import datetime, timezone
+
+from pymongo import DeleteOne, UpdateOne
+
+from app.db import (
+    movies_collection,
+    series_collection,
+    channels_collection,
+    category_collection,
+    category_summary_collection,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLLECTIONS = {
+    "movie": movies_collection,
+    "series": series_collection,
+    "live": channels_collection,
+}
+
+# The items /categories/fetch_all has always counted
+SUMMARY_MATCH = {
+    "category_id": {"$exists": True, "$nin": [None, ""]},
+    "category_name": {"$exists": True, "$nin": [None, ""]},
+    "deleted_at": None,
+}
+
+
+def _key(doc: dict) -> tuple:
+    # Two providers can use the same category_id for different categories
+    return doc.get("provider_id"), doc["category_id"]
+
+
+async def refresh_summaries(content_type: str, category_ids=None, provider_ids=None) -> int:
+    """
+    Recompute the summaries of `category_ids` (all categories when None) of
+    `provider_ids` (all providers when None; None in the list is the env
+    account) from the catalog. Only summaries whose name, parent or count
+    changed are written; categories left without items are removed.
+    Returns writes made.
+    """
+    match = dict(SUMMARY_MATCH)
+    scope = {"content_type": content_type}
+    categories = {}
+    if provider_ids is not None:
+        match["provider_id"] = scope["provider_id"] = categories["provider_id"] = {"$in": list(provider_ids)}
+    if category_ids is not None:
+        ids = sorted(c for c in category_ids if c)
+        if not ids:
+            return 0
+        match["category_id"] = {"$in": ids}
+        scope["category_id"] = {"$in": ids}
+
+    groups = {
+        (g["_id"].get("provider_id"), g["_id"]["category_id"]): g
+        for g in await SUMMARY_COLLECTIONS[content_type].aggregate([
+            {"$match": match},
+            {"$group": {
+                "_id": {"provider_id": {"$ifNull": ["$provider_id", None]}, "category_id": "$category_id"},
+                "category_name": {"$first": "$category_name"},
+                "item_count": {"$sum": 1},
+            }},
+        ]).to_list(length=None)
+    }
+    existing = {
+        _key(s): s
+        for s in await category_summary_collection.find(scope, {"_id": 0}).to_list(length=None)
+    }
+    categories["category_id"] = {"$in": sorted({category_id for _, category_id in groups})}
+    parents = {
+        _key(c): c.get("parent_id", 0)
+        for c in await category_collection.find(
+            categories, {"_id": 0, "provider_id": 1, "category_id": 1, "parent_id": 1}
+        ).to_list(length=None)
+    }
+
+    now = datetime.now(timezone.utc)
+    ops = []
+    for key, group in groups.items():
+        fields = {
+            "category_name": group["category_name"],
+            "parent_id": parents.get(key, 0),
+            "item_count": group["item_count"],
+        }
+        previous = existing.get(key)
+        if previous and all(previous.get(k) == v for k, v in fields.items()):
+            continue
+        provider_id, category_id = key
+        ops.append(UpdateOne(
+            {"content_type": content_type, "provider_id": provider_id, "category_id": category_id},
+            {"$set": {**fields, "last_changed": now}},
+            upsert=True,
+        ))
+    for provider_id, category_id in existing.keys() - groups.keys():
+        ops.append(DeleteOne({"content_type": content_type, "provider_id": provider_id, "category_id": category_id}))
+
+    if ops:
+        await category_summary_collection.bulk_write(ops, ordered=False)
+    logger.info(f"Category summaries ({content_type}): {len(groups)} checked, {len(ops)} written")
+    return len(ops)
+
+
+async def rebuild_summaries() -> int:
+    """Recompute every summary (first run, or after a resumed sync lost track of what changed)."""
+    return sum([await refresh_summaries(content_type) for content_type in SUMMARY_COLLECTIONS])
+
+
+async def grouped_categories() -> dict:
+    """The /categories/fetch_all payload: categories per content type, sorted by name."""
+    projection = {"_id": 0, "content_type": 1, "category_id": 1, "category_name": 1}
+    summaries = await category_summary_collection.find({}, projection).sort("category_name", 1).to_list(length=None)
+    if not summaries:
+        # First request after the summaries were introduced
+        await rebuild_summaries()
+        summaries = await category_summary_collection.find({}, projection).sort("category_name", 1).to_list(length=None)
+
+    grouped = {"movie": [], "series": [], "live": []}
+    for summary in summaries:
+        content_type = summary.pop("content_type")
+        if content_type in grouped:
+            grouped[content_type].append(summary)
+
+    return {
+        "movies": grouped["movie"],
+        "series": grouped["series"],
+        "live_channels": grouped["live"]
+    }
@@ -0,0 +1,38 @@
+# backend/app/utils/content_hash.py
+import hashlib
+import json
+
+# Bump when build_movie/build_series/build_live_channel change what they
+# derive from the payload, so every stored document is rewritten once.
+HASH_VERSION = 1
+
+# Fields that change without the item changing (list position)
+VOLATILE_FIELDS = {"num"}
+
+
+def normalise(value):
+    """
+    Canonical form of an upstream value: providers flip between "1"/1 and
+    null/"" from one response to the next, so scalars compare as strings
+    and empty values are dropped.
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): normalise(v)
+            for k, v in value.items()
+            if k not in VOLATILE_FIELDS and v not in (None, "")
+        }
+    if isinstance(value, list):
+        return [normalise(v) for v in value]
+    return str(value)
+
+
+def content_hash(item: dict, **context) -> str:
+    """
+    Stable sha1 of a normalised upstream payload. `context` carries anything
+    else that ends up in the stored document (category name, stream URL
+    prefix), so a change there also counts as a change.
+    """
+    payload = {"v": HASH_VERSION, "item": normalise(item), "ctx": normalise(context)}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
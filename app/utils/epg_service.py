@@ -0,0 +1,272 @@
+# backend/app/utils/epg_service.py
+import asyncio
+import base64
+import binascii
+import logging
+import os
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from xml.etree.ElementTree import XMLPullParser
+
+from app.db import epg_collection, channels_collection
+from app.utils.bulk_writer import BulkUpsertWriter
+from app.utils.providers import DEFAULT_ACCOUNT
+from app.utils.sync_engine import SyncEngine
+from app.utils.upstream_client import get_upstream_client, UpstreamStatusError
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+EPG_SYNC = os.getenv("EPG_SYNC", "1") == "1"  # ingest the guide after live channels sync
+# "xmltv": one xmltv.php download per account (bulk); "table": one
+# get_simple_data_table call per channel, for providers without xmltv.php
+EPG_SOURCE = os.getenv("EPG_SOURCE", "xmltv")
+# XMLTV URL or file path used instead of the env account's xmltv.php
+EPG_XMLTV_URL = os.getenv("EPG_XMLTV_URL")
+EPG_DAYS = float(os.getenv("EPG_DAYS", "2"))                    # ingest this far ahead
+EPG_TIMEOUT = float(os.getenv("EPG_TIMEOUT", "300"))
+EPG_INDEX_HOURS = float(os.getenv("EPG_INDEX_HOURS", "24"))     # programmes held in memory
+EPG_INDEX_REFRESH_MINUTES = float(os.getenv("EPG_INDEX_REFRESH_MINUTES", "60"))
+
+XML_READ_SIZE = 64 * 1024
+
+
+# --------------------
+# Parsing
+# --------------------
+def parse_xmltv_time(value: str):
+    """XMLTV timestamps look like "20240101100000 +0000" (offset optional, UTC assumed)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if " " in value:
+            return datetime.strptime(value, "%Y%m%d%H%M%S %z").astimezone(timezone.utc)
+        return datetime.strptime(value[:14], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _decode_b64(text):
+    """get_simple_data_table base64-encodes titles and descriptions."""
+    if not text:
+        return text
+    try:
+        return base64.b64decode(text, validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return text
+
+
+def _epoch(value):
+    try:
+        return datetime.fromtimestamp(int(value), tz=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+def programme_spec(account, channel_id: str, start, end, title=None, description=None, lang=None):
+    """(filter, update) upserting one programme, keyed on provider/channel/start."""
+    match = {"provider_id": account.id, "channel_id": channel_id, "start": start}
+    update = {"$set": {**match, "end": end, "title": title, "description": description, "lang": lang}}
+    return match, update
+
+
+# --------------------
+# Ingestion
+# --------------------
+async def _xmltv_chunks(source: str):
+    if source.startswith(("http://", "https://")):
+        async with get_upstream_client().stream(source, timeout=EPG_TIMEOUT) as res:
+            async for chunk in res.aiter_bytes():
+                yield chunk
+        return
+    with open(source, "rb") as f:
+        while chunk := f.read(XML_READ_SIZE):
+            yield chunk
+            await asyncio.sleep(0)
+
+
+async def ingest_xmltv(account, channels: set, writer: BulkUpsertWriter, source: str = None):
+    """
+    Stream-parse an XMLTV guide and upsert the programmes of `channels`
+    (epg_channel_ids) that fall inside the ingest window. Elements are
+    cleared as soon as they are read, so memory stays flat.
+    """
+    if source is None:
+        source = (
+            EPG_XMLTV_URL
+            if EPG_XMLTV_URL and account.id is None
+            else f"{account.url}/xmltv.php?username={account.username}&password={account.password}"
+        )
+    now = datetime.now(timezone.utc)
+    until = now + timedelta(days=EPG_DAYS)
+
+    parser = XMLPullParser(events=("end",))
+    async for chunk in _xmltv_chunks(source):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag != "programme":
+                if elem.tag == "channel":
+                    elem.clear()
+                continue
+            channel_id = elem.get("channel")
+            start = parse_xmltv_time(elem.get("start"))
+            end = parse_xmltv_time(elem.get("stop"))
+            if channel_id in channels and start and end and end > now and start < until:
+                title = elem.find("title")
+                desc = elem.find("desc")
+                await writer.add_spec(*programme_spec(
+                    account,
+                    channel_id,
+                    start,
+                    end,
+                    title.text if title is not None else None,
+                    desc.text if desc is not None else None,
+                    title.get("lang") if title is not None else None,
+                ))
+            elem.clear()
+    parser.close()
+
+
+async def ingest_tables(account, channels: list, writer: BulkUpsertWriter):
+    """One get_simple_data_table call per channel, bounded by a SyncEngine's limits."""
+    now = datetime.now(timezone.utc)
+    until = now + timedelta(days=EPG_DAYS)
+
+    async with SyncEngine(account=account) as engine:
+        async def one(channel):
+            url = f"{account.base_api}&action=get_simple_data_table&stream_id={channel['stream_id']}"
+            data = await engine.fetch(url) or {}
+            listings = data.get("epg_listings", []) if isinstance(data, dict) else []
+            for listing in listings:
+                start = _epoch(listing.get("start_timestamp"))
+                end = _epoch(listing.get("stop_timestamp"))
+                if start and end and end > now and start < until:
+                    await writer.add_spec(*programme_spec(
+                        account,
+                        channel["epg_channel_id"],
+                        start,
+                        end,
+                        _decode_b64(listing.get("title")),
+                        _decode_b64(listing.get("description")),
+                        listing.get("lang"),
+                    ))
+
+        await asyncio.gather(*(one(channel) for channel in channels))
+
+
+async def sync_epg(account=DEFAULT_ACCOUNT, source: str = EPG_SOURCE) -> int:
+    """Ingest the guide for one account's live channels. Returns programmes written."""
+    channels = await channels_collection.find(
+        {"provider_id": account.id, "deleted_at": None, "epg_channel_id": {"$nin": [None, ""]}},
+        {"_id": 0, "stream_id": 1, "epg_channel_id": 1},
+    ).to_list(length=None)
+    if not channels:
+        print(f"📺 No channels with an EPG id for {account.label}, skipping EPG")
+        return 0
+
+    writer = BulkUpsertWriter(epg_collection, "start", label="epg_programmes")
+    started = time.monotonic()
+    if source == "table":
+        await ingest_tables(account, channels, writer)
+    else:
+        try:
+            await ingest_xmltv(account, {c["epg_channel_id"] for c in channels}, writer)
+        except UpstreamStatusError as e:
+            if e.status_code != 404:
+                raise
+            # Not every provider serves xmltv.php: no guide rather than a failed stage
+            print(f"📺 {account.label} serves no xmltv.php, skipping EPG (EPG_SOURCE=table polls per channel)")
+            return 0
+    await writer.flush()
+
+    t = writer.totals
+    print(
+        f"✅ EPG ({account.label}, {source}): {t.size} programmes for {len(channels)} channels "
+        f"in {time.monotonic() - started:.1f}s (inserted={t.inserted} modified={t.modified} failed={t.failed})"
+    )
+    return t.size
+
+
+# --------------------
+# In-memory now/next index
+# --------------------
+def _aware(value: datetime) -> datetime:
+    # Motor returns naive datetimes that are UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _serialize(programme):
+    if programme is None:
+        return None
+    start, end, title = programme
+    return {"title": title, "start": start.isoformat(), "end": end.isoformat()}
+
+
+class EpgIndex:
+    """
+    Interval index over the next EPG_INDEX_HOURS of programmes: per channel a
+    sorted list of start times (bisected) and the programmes in the same
+    order. Lookups never touch Mongo; the index is rebuilt after every
+    ingest and at most every EPG_INDEX_REFRESH_MINUTES on access.
+    """
+
+    def __init__(self):
+        self._channels = {}  # (provider_id, channel_id) -> ([start_ts], [(start, end, title)])
+        self._lock = asyncio.Lock()
+        self.built_at = None
+        self.programmes = 0
+
+    async def rebuild(self, hours: float = EPG_INDEX_HOURS):
+        now = datetime.now(timezone.utc)
+        cursor = epg_collection.find(
+            {"end": {"$gt": now}, "start": {"$lt": now + timedelta(hours=hours)}},
+            {"_id": 0, "provider_id": 1, "channel_id": 1, "start": 1, "end": 1, "title": 1},
+        )
+        grouped = {}
+        async for p in cursor:
+            grouped.setdefault((p.get("provider_id"), p["channel_id"]), []).append(
+                (_aware(p["start"]), _aware(p["end"]), p.get("title"))
+            )
+
+        channels = {}
+        for key, programmes in grouped.items():
+            programmes.sort(key=lambda p: p[0])
+            channels[key] = ([p[0].timestamp() for p in programmes], programmes)
+
+        self._channels = channels
+        self.programmes = sum(len(p) for _, p in channels.values())
+        self.built_at = time.monotonic()
+        logger.info(f"EPG index rebuilt: {self.programmes} programmes across {len(channels)} channels")
+
+    async def ensure_fresh(self):
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if not self._is_fresh():
+                await self.rebuild()
+
+    def _is_fresh(self) -> bool:
+        return self.built_at is not None and time.monotonic() - self.built_at < EPG_INDEX_REFRESH_MINUTES * 60
+
+    def now_next(self, provider_id, channel_id, at: datetime = None) -> dict:
+        entry = self._channels.get((provider_id, channel_id))
+        if not entry:
+            return {"now": None, "next": None}
+        starts, programmes = entry
+        at = at or datetime.now(timezone.utc)
+        i = bisect_right(starts, at.timestamp()) - 1
+        current = programmes[i] if i >= 0 and programmes[i][1] > at else None
+        upcoming = programmes[i + 1] if i + 1 < len(programmes) else None
+        return {"now": _serialize(current), "next": _serialize(upcoming)}
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "programmes": self.programmes,
+            "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at else None,
+        }
+
+
+epg_index = EpgIndex()
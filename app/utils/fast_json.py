@@ -0,0 +1,97 @@
+# backend/app/utils/fast_json.py
+"""
+Opt-in orjson rendering for the hot JSON endpoints (FAST_JSON=1).
+
+By default FastAPI passes every return value through jsonable_encoder
+before json.dumps. That walk costs most of the CPU when the value is a
+big model or a long list. Handlers that build their output already
+shaped can return fast_response(...) and skip the walk. Shaped output is
+plain dicts of str, numbers, datetimes and ObjectIds; see
+app/models/responses.py for the shapes. With FAST_JSON=1 the bytes then
+come straight from orjson.
+
+With FAST_JSON off, or orjson not installed, the same content goes
+through the standard encoder. The body is the same either way.
+"""
+import json
+import logging
+import os
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional: without it FAST_JSON has no effect
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+
+# Debug: check every shaped response against its declared model (app/models/responses.py)
+FAST_JSON_VALIDATE = os.getenv("FAST_JSON_VALIDATE", "0") == "1"
+
+if FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON=1 but orjson is not installed; using the standard encoder")
+
+# Types the standard encoder does not know about
+ENCODERS = {ObjectId: str}
+
+_adapters = {}  # response model -> TypeAdapter
+
+
+def enabled() -> bool:
+    return FAST_JSON and orjson is not None
+
+
+def _default(value):
+    """orjson fallback for the few non-native types shaped output may still carry."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    """Compact UTF-8 JSON, the same bytes FastAPI's default JSONResponse would send."""
+    if enabled():
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content, custom_encoder=ENCODERS),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def validate(model, content):
+    """With FAST_JSON_VALIDATE=1, raise pydantic's ValidationError if `content` does not match `model`."""
+    if not FAST_JSON_VALIDATE or model is None:
+        return
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(model)
+    adapter.validate_python(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def fast_response(content, status_code: int = 200, headers: dict = None, model=None) -> FastJSONResponse:
+    """
+    Send pre-shaped content as is; FastAPI neither re-encodes nor validates a
+    returned Response, so pass the route's response model to have it checked
+    in debug (FAST_JSON_VALIDATE=1).
+    """
+    validate(model, content)
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
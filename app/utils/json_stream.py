@@ -0,0 +1,85 @@
+# backend/app/utils/json_stream.py
+import json
+
+_WHITESPACE = " \t\n\r"
+# Characters that can still extend a number the decoder has already accepted
+# ("12." or "1e" at the end of a chunk)
+_NUMBER_TAIL = ".eE+-"
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a top-level JSON array.
+
+    Feed it text chunks as they arrive and it returns the array elements that
+    are complete so far; only the unfinished tail is kept in memory.
+
+        parser = JSONArrayStream()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()   # raises ValueError if the array never closed
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._started = False
+        self.done = False
+        self.count = 0
+
+    def feed(self, text: str) -> list:
+        if self.done:
+            return []
+        self._buf += text
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        items = self._drain(final=True)
+        if not self.done:
+            raise ValueError("JSON array truncated")
+        return items
+
+    def _drain(self, final: bool) -> list:
+        buf = self._buf
+        pos = 0
+        n = len(buf)
+        items = []
+
+        while True:
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= n:
+                break
+
+            if not self._started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos]!r}")
+                self._started = True
+                pos += 1
+                continue
+
+            ch = buf[pos]
+            if ch == ",":
+                pos += 1
+                continue
+            if ch == "]":
+                self.done = True
+                pos = n
+                break
+
+            try:
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # element not complete yet
+            if not final and (end == n or buf[end] in _NUMBER_TAIL):
+                # A scalar like 12 might continue in the next chunk
+                break
+            items.append(value)
+            pos = end
+
+        self._buf = buf[pos:]
+        self.count += len(items)
+        return items
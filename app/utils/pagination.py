@@ -0,0 +1,91 @@
+# backend/app/utils/pagination.py
+"""
+Keyset (cursor) pagination for the catalog list endpoints.
+
+A page is sorted on (sort field, _id) and the cursor carries the last
+row's pair, so the next page is an index seek past it rather than a
+skip over everything before it: page 500 costs the same as page 1.
+Each sort needs an index on (…, sort field, _id) (see the models'
+Settings.indexes).
+"""
+import base64
+import binascii
+
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = 40
+MAX_PAGE_SIZE = 100
+
+# Per content type: public sort name -> (field, direction); _id breaks ties
+# in the same direction. "added" is newest first, "rating" best first.
+SORTS = {
+    "movie": {"name": ("name", 1), "added": ("added", -1), "rating": ("rating", -1)},
+    # Series carry no "added"; last_modified moves when episodes are added
+    "series": {"name": ("name", 1), "added": ("last_modified", -1), "rating": ("rating", -1)},
+    "live": {"name": ("name", 1), "added": ("added", -1)},
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_spec(field: str, direction: int) -> list:
+    return [(field, direction), ("_id", direction)]
+
+
+def encode_cursor(doc: dict, field: str) -> str:
+    payload = json_util.dumps([doc.get(field), doc["_id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """→ (sort value, _id) of the last row of the previous page."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, last_id = json_util.loads(base64.urlsafe_b64decode(padded).decode())
+        return value, last_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def after_cursor(field: str, direction: int, cursor: str) -> dict:
+    """
+    Filter for the rows strictly after the cursor in (field, _id) order.
+    Mongo sorts missing/null values before everything else, i.e. first
+    ascending and last descending, so they get their own branch.
+    """
+    value, last_id = decode_cursor(cursor)
+    op = "$gt" if direction == 1 else "$lt"
+    if value is None:
+        same = {field: None, "_id": {op: last_id}}
+        return {"$or": [same, {field: {"$ne": None}}]} if direction == 1 else same
+
+    after = [{field: {op: value}}, {field: value, "_id": {op: last_id}}]
+    if direction == -1:
+        after.append({field: None})
+    return {"$or": after}
+
+
+async def paginate(collection, filter_query: dict, projection: dict, field: str, direction: int, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    One page of `collection` → (documents, next cursor or None).
+    Reads limit + 1 rows so the last page does not hand out a cursor.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = dict(filter_query)
+    if cursor:
+        query = {"$and": [query, after_cursor(field, direction, cursor)]}
+
+    # The sort value is needed for the cursor, not necessarily in the response
+    hidden = field not in projection
+    projection = {**projection, field: 1}
+    rows = collection.find(query, projection).sort(sort_spec(field, direction)).limit(limit + 1)
+    docs = await rows.to_list(length=limit + 1)
+
+    next_cursor = encode_cursor(docs[limit - 1], field) if len(docs) > limit else None
+    docs = docs[:limit]
+    if hidden:
+        for doc in docs:
+            doc.pop(field, None)
+    return docs, next_cursor
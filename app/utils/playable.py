@@ -0,0 +1,72 @@
+# backend/app/utils/playable.py
+"""
+Whether a catalog item can be listed (`playable`) and the image to show
+for it (`image`), computed once at ingest instead of being re-checked by
+every query. Catalog queries then filter on {"playable": True}, which the
+models' partial indexes answer directly.
+
+The same rules exist as aggregation expressions for backfilling stored
+documents (app/utils/backfill_playable.py); keep the two in step.
+"""
+
+# Field holding each content type's artwork
+IMAGE_FIELDS = {
+    "movie": "stream_icon",
+    "series": "cover",
+    "live": "stream_icon",
+}
+
+
+def _present(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def normalise_image(url):
+    return url.strip() if _present(url) else None
+
+
+def is_playable(content_type: str, doc) -> bool:
+    if doc.deleted_at is not None:
+        return False
+    if content_type == "movie":
+        return _present(doc.stream_icon) and _present(doc.stream_url) and doc.container_extension == "mkv"
+    if content_type == "series":
+        return _present(doc.name) and _present(doc.cover) and bool(doc.seasons)
+    return _present(doc.name) and _present(doc.stream_icon) and _present(doc.stream_url)
+
+
+def with_listing(content_type: str, doc):
+    """Set `playable` and `image` on a freshly built Movie/Series/LiveChannel and return it."""
+    doc.image = normalise_image(getattr(doc, IMAGE_FIELDS[content_type]))
+    doc.playable = is_playable(content_type, doc)
+    return doc
+
+
+# ---- aggregation expressions (backfill) ----
+def _present_expr(field: str) -> dict:
+    return {
+        "$cond": [
+            {"$eq": [{"$type": f"${field}"}, "string"]},
+            {"$ne": [{"$trim": {"input": f"${field}"}}, ""]},
+            False,
+        ]
+    }
+
+
+def image_expr(content_type: str) -> dict:
+    field = IMAGE_FIELDS[content_type]
+    return {"$cond": [_present_expr(field), {"$trim": {"input": f"${field}"}}, None]}
+
+
+def playable_expr(content_type: str) -> dict:
+    if content_type == "movie":
+        rules = [_present_expr("stream_icon"), _present_expr("stream_url"), {"$eq": ["$container_extension", "mkv"]}]
+    elif content_type == "series":
+        rules = [
+            _present_expr("name"),
+            _present_expr("cover"),
+            {"$gt": [{"$size": {"$ifNull": ["$seasons", []]}}, 0]},
+        ]
+    else:
+        rules = [_present_expr("name"), _present_expr("stream_icon"), _present_expr("stream_url")]
+    return {"$and": [{"$eq": [{"$ifNull": ["$deleted_at", None]}, None]}, *rules]}
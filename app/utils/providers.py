@@ -0,0 +1,79 @@
+# backend/app/utils/providers.py
+"""
+Xtream accounts a sync covers.
+
+Settings (environment):
+    XC_URL, XC_USERNAME, XC_PASSWORD   the env account (provider_id None).
+                                       There are no in-source defaults: with
+                                       XC_LEGACY_PROVIDER=1 and any of them
+                                       unset, load_accounts() raises and every
+                                       scheduled sync job fails until they are
+                                       set.
+    XC_LEGACY_PROVIDER                 1 (default) syncs the env account next
+                                       to the providers collection; 0 syncs
+                                       only the providers collection.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from app.models.provider import Provider
+
+# Legacy single account, configured from the environment only (provider_id None)
+XC_URL = os.getenv("XC_URL", "").rstrip("/")
+USERNAME = os.getenv("XC_USERNAME", "")
+PASSWORD = os.getenv("XC_PASSWORD", "")
+# Set to 0 once every account lives in the providers collection
+XC_LEGACY_PROVIDER = os.getenv("XC_LEGACY_PROVIDER", "1") == "1"
+
+
+@dataclass(frozen=True)
+class XtreamAccount:
+    """
+    Connection details of one Xtream account. `id` is the Provider document
+    id stamped on every synced item as provider_id; None for the env account.
+    Plain and picklable so it can be shipped to build worker processes.
+    """
+    url: str
+    username: str
+    password: str
+    id: Optional[str] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url and self.username and self.password)
+
+    @property
+    def label(self) -> str:
+        return self.id or "default"
+
+    @property
+    def base_api(self) -> str:
+        return f"{self.url}/player_api.php?username={self.username}&password={self.password}"
+
+    @property
+    def stream_base(self) -> str:
+        return f"{self.url}/{self.username}/{self.password}"
+
+    def stream_url(self, kind: str, stream_id, extension: str) -> str:
+        return f"{self.url}/{kind}/{self.username}/{self.password}/{stream_id}.{extension}"
+
+
+DEFAULT_ACCOUNT = XtreamAccount(XC_URL, USERNAME, PASSWORD)
+
+
+def account_for(provider: Provider) -> XtreamAccount:
+    return XtreamAccount(provider.url.rstrip("/"), provider.username, provider.password, str(provider.id))
+
+
+async def load_accounts() -> list:
+    """Every account a sync run should cover: the env account plus enabled providers."""
+    if XC_LEGACY_PROVIDER and not DEFAULT_ACCOUNT.configured:
+        raise RuntimeError(
+            "XC_URL, XC_USERNAME and XC_PASSWORD must be set for the env account "
+            "(or set XC_LEGACY_PROVIDER=0 to sync only the providers collection)"
+        )
+    accounts = [DEFAULT_ACCOUNT] if XC_LEGACY_PROVIDER else []
+    providers = await Provider.find(Provider.enabled == True).to_list()  # noqa: E712
+    accounts.extend(account_for(p) for p in providers)
+    return accounts
@@ -0,0 +1,218 @@
+# backend/app/utils/response_cache.py
+"""
+In-process cache of rendered catalog responses.
+
+Entries are the JSON body (plus headers such as X-Next-Cursor) keyed on
+route and parameters, bounded by count and total bytes (LRU) and by a
+TTL, and only valid for the catalog generation they were rendered in
+(app/utils/catalog_state.py): a new generation empties the cache. A hit
+skips both the Mongo query and serialisation.
+
+Cached endpoints are also conditional: the response carries a strong
+ETag (generation + route + parameters) and Last-Modified (when the
+generation was published), and a request whose If-None-Match or
+If-Modified-Since still matches gets a 304 before anything else runs.
+
+    @router.get("/fetch")
+    @cached("movies:fetch")
+    async def get_movies(...):
+"""
+import functools
+import hashlib
+import inspect
+import os
+import time
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.utils.catalog_state import catalog_generation
+from app.utils.fast_json import dumps, validate
+
+# Tunables (env overridable)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))
+
+# Per-response headers worth replaying on a hit
+_KEPT_HEADERS = {"x-next-cursor"}
+
+
+class ResponseCache:
+    """TTL + LRU map of key -> (expires_at, body, headers), bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = int(RESPONSE_CACHE_MAX_MB * 1024 * 1024)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.generation = None
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0, "too_large": 0}
+
+    def _sync_generation(self, generation):
+        if generation != self.generation:
+            if self._entries:
+                self.counters["invalidations"] += 1
+            self.clear()
+            self.generation = generation
+
+    def _remove(self, key):
+        _, body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def get(self, key, generation):
+        self._sync_generation(generation)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return entry[1], entry[2]
+
+    def put(self, key, generation, body: bytes, headers: dict, ttl: float = RESPONSE_CACHE_TTL):
+        if generation != self.generation:
+            # Rendered from a generation that has been replaced meanwhile
+            return
+        if len(body) > self.max_bytes // 4:
+            # One response must not flush most of the cache
+            self.counters["too_large"] += 1
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, body, headers)
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.counters["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "generation": self.generation,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def render_json(content) -> bytes:
+    """Same bytes FastAPI's default JSONResponse would send (orjson with FAST_JSON=1)."""
+    return dumps(content)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _etag(key, generation) -> str:
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return f'"{generation}-{digest}"'
+
+
+def _validators(key, generation) -> dict:
+    """ETag/Last-Modified for a response rendered in `generation` (none before the first publish)."""
+    if not generation:
+        return {}
+    headers = {"ETag": _etag(key, generation), "Cache-Control": "no-cache"}
+    if catalog_generation.updated_at is not None:
+        updated_at = catalog_generation.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(updated_at.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, validators: dict) -> bool:
+    if not validators:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since; weak comparison as RFC 9110 asks
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validators["ETag"] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in validators:
+        try:
+            return parsedate_to_datetime(validators["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cached(namespace: str, ttl: float = RESPONSE_CACHE_TTL, conditional: bool = True, model=None, bypass=None):
+    """
+    Cache a catalog endpoint's JSON response; keyed on `namespace` and the
+    endpoint's parameters. conditional=False drops ETag/304 handling, for
+    endpoints whose body varies within a generation (random samples).
+    bypass(kwargs) -> True runs the endpoint uncached and without
+    validators, for parameters that make the body vary (with_epg=true).
+    `model` is the route's response_model: the wrapper returns a Response,
+    so FastAPI never applies it; it is checked here with FAST_JSON_VALIDATE=1.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop("_conditional_request")
+            if (not RESPONSE_CACHE_ENABLED and not conditional) or (bypass is not None and bypass(kwargs)):
+                return await endpoint(*args, **kwargs)
+
+            generation = await catalog_generation.current()
+            key = (namespace, tuple(sorted(
+                (name, _freeze(value))
+                for name, value in kwargs.items()
+                if not isinstance(value, (Request, Response))
+            )))
+            validators = _validators(key, generation) if conditional else {}
+            if _not_modified(request, validators):
+                return Response(status_code=304, headers=validators)
+
+            hit = response_cache.get(key, generation) if RESPONSE_CACHE_ENABLED else None
+            if hit is not None:
+                body, headers = hit
+                return Response(content=body, media_type="application/json", headers={**headers, **validators})
+
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            validate(model, result)
+
+            # Headers the endpoint set on its injected Response (e.g. X-Next-Cursor)
+            headers = {}
+            for value in kwargs.values():
+                if isinstance(value, Response):
+                    headers.update({k: v for k, v in value.headers.items() if k.lower() in _KEPT_HEADERS})
+            body = render_json(result)
+            if RESPONSE_CACHE_ENABLED:
+                response_cache.put(key, generation, body, headers, ttl)
+            return Response(content=body, media_type="application/json", headers={**headers, **validators})
+
+        # FastAPI reads the endpoint's signature: add the Request the wrapper needs
+        signature = inspect.signature(endpoint)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("_conditional_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrapper
+    return decorator
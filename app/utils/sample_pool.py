@@ -0,0 +1,142 @@
+# backend/app/utils/sample_pool.py
+"""
+In-memory pools of listable catalog items (id, name, image) per content
+type, so random rails and banners are drawn in O(k) without touching
+Mongo. A pool is rebuilt when the catalog generation changes
+(app/utils/catalog_state.py) or every SAMPLE_POOL_REFRESH_SECONDS; a
+stale pool keeps serving while its replacement loads.
+
+Draws can skip what a user was shown recently (last SAMPLE_RECENT_WINDOW
+ids per user, for the most recent SAMPLE_RECENT_USERS users).
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict, deque
+
+from app.utils.catalog import COLLECTIONS, LISTABLE
+from app.utils.catalog_state import catalog_generation
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+SAMPLE_POOL_REFRESH_SECONDS = float(os.getenv("SAMPLE_POOL_REFRESH_SECONDS", "600"))
+# Larger catalogs are represented by a random subset of this size
+SAMPLE_POOL_MAX_ITEMS = int(os.getenv("SAMPLE_POOL_MAX_ITEMS", "50000"))
+SAMPLE_RECENT_WINDOW = int(os.getenv("SAMPLE_RECENT_WINDOW", "50"))
+SAMPLE_RECENT_USERS = int(os.getenv("SAMPLE_RECENT_USERS", "10000"))
+
+POOL_PROJECTION = {"_id": 1, "name": 1, "image": 1}
+
+# Random rail per content type (total ~20): /recommendations/random and /home
+RANDOM_MIX = {"movie": 7, "series": 7, "live": 6}
+
+
+class SamplePool:
+    def __init__(self):
+        self._items = {}  # content_type -> [{"_id", "name", "image"}]
+        self._recent = OrderedDict()  # user_id -> deque of recently shown ids
+        self._lock = asyncio.Lock()
+        self._refresh = None
+        self.generation = None
+        self.built_at = None
+
+    async def _load(self, content_type: str) -> list:
+        collection = COLLECTIONS[content_type]
+        if await collection.count_documents(LISTABLE) > SAMPLE_POOL_MAX_ITEMS:
+            cursor = collection.aggregate([
+                {"$match": LISTABLE},
+                {"$sample": {"size": SAMPLE_POOL_MAX_ITEMS}},
+                {"$project": POOL_PROJECTION},
+            ])
+        else:
+            cursor = collection.find(LISTABLE, POOL_PROJECTION)
+        return [
+            {"_id": str(doc["_id"]), "name": doc.get("name"), "image": doc.get("image")}
+            async for doc in cursor
+        ]
+
+    async def rebuild(self):
+        generation = await catalog_generation.current()
+        started = time.monotonic()
+        items = {content_type: await self._load(content_type) for content_type in COLLECTIONS}
+        self._items, self.generation, self.built_at = items, generation, time.monotonic()
+        logger.info(
+            f"Sample pool rebuilt in {time.monotonic() - started:.1f}s: "
+            + ", ".join(f"{ct}={len(pool)}" for ct, pool in items.items())
+        )
+
+    async def _rebuild_quietly(self):
+        try:
+            async with self._lock:
+                await self.rebuild()
+        except Exception as e:
+            logger.error(f"Sample pool refresh failed: {e}")
+
+    async def ensure_fresh(self):
+        """Load the pools on first use; afterwards refresh them in the background when stale."""
+        if self.built_at is None:
+            async with self._lock:
+                if self.built_at is None:
+                    await self.rebuild()
+            return
+        stale = (
+            time.monotonic() - self.built_at >= SAMPLE_POOL_REFRESH_SECONDS
+            or await catalog_generation.current() != self.generation
+        )
+        if stale and (self._refresh is None or self._refresh.done()):
+            self._refresh = asyncio.create_task(self._rebuild_quietly())
+
+    def _recent_for(self, user_id) -> deque:
+        recent = self._recent.get(user_id)
+        if recent is None:
+            recent = self._recent[user_id] = deque(maxlen=SAMPLE_RECENT_WINDOW)
+            while len(self._recent) > SAMPLE_RECENT_USERS:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(user_id)
+        return recent
+
+    def draw(self, content_type: str, k: int, user_id: str = None) -> list:
+        """
+        Up to k distinct random items (copies). With a user_id, items shown to
+        that user recently are avoided unless the pool has nothing else.
+        """
+        pool = self._items.get(content_type) or []
+        k = min(k, len(pool))
+        if not k:
+            return []
+        if user_id is None:
+            return [dict(item) for item in random.sample(pool, k)]
+
+        recent = self._recent_for(user_id)
+        seen = set(recent)
+        candidates = random.sample(pool, min(len(pool), k + len(seen)))
+        picked = [item for item in candidates if item["_id"] not in seen][:k]
+        if len(picked) < k:
+            picked += [item for item in candidates if item["_id"] in seen][:k - len(picked)]
+        recent.extend(item["_id"] for item in picked)
+        return [dict(item) for item in picked]
+
+    def draw_mix(self, mix: dict, user_id: str = None) -> list:
+        """draw() for each {content_type: k} in `mix`, tagged with its type and shuffled together."""
+        items = [
+            {**item, "type": content_type}
+            for content_type, k in mix.items()
+            for item in self.draw(content_type, k, user_id)
+        ]
+        random.shuffle(items)
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "items": {content_type: len(pool) for content_type, pool in self._items.items()},
+            "generation": self.generation,
+            "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at else None,
+            "tracked_users": len(self._recent),
+        }
+
+
+sample_pool = SamplePool()
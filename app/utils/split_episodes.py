@@ -0,0 +1,72 @@
+# backend/app/utils/split_episodes.py
+"""
+One-off migration: move episodes embedded in `series.seasons[].episodes`
+into the `episodes` collection and leave season summaries behind.
+
+    python -m app.utils.split_episodes
+
+Safe to re-run: episodes are upserted on stream_id before their series is
+rewritten, so an interrupted run just picks up the series it hadn't reached.
+"""
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.db import init_db, series_collection, episodes_collection
+
+BATCH_SIZE = 200  # series per bulk write
+
+
+async def _flush(episode_ops: list, series_ops: list):
+    if episode_ops:
+        await episodes_collection.bulk_write(episode_ops, ordered=False)
+    if series_ops:
+        await series_collection.bulk_write(series_ops, ordered=False)
+
+
+async def migrate():
+    await init_db()  # creates the episodes indexes
+
+    episode_ops, series_ops = [], []
+    migrated = episodes = 0
+    cursor = series_collection.find(
+        {"seasons.episodes": {"$exists": True}},
+        {"series_id": 1, "provider_id": 1, "seasons": 1},
+    )
+    async for doc in cursor:
+        summaries = []
+        for season in doc.get("seasons") or []:
+            eps = season.get("episodes") or []
+            for e in eps:
+                episode_ops.append(
+                    UpdateOne(
+                        {"provider_id": doc.get("provider_id"), "stream_id": e["stream_id"]},
+                        {"$set": {
+                            "provider_id": doc.get("provider_id"),
+                            "series_id": doc["series_id"],
+                            "season_number": season["season_number"],
+                            "episode_num": e.get("episode_num", 0),
+                            "title": e.get("title"),
+                            "stream_id": e["stream_id"],
+                            "stream_url": e.get("stream_url"),
+                            "added": e.get("added"),
+                        }},
+                        upsert=True,
+                    )
+                )
+            summaries.append({"season_number": season["season_number"], "episode_count": len(eps)})
+            episodes += len(eps)
+
+        series_ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"seasons": summaries}}))
+        migrated += 1
+        if len(series_ops) >= BATCH_SIZE:
+            await _flush(episode_ops, series_ops)
+            episode_ops, series_ops = [], []
+            print(f"➡️ {migrated} series migrated ({episodes} episodes)")
+
+    await _flush(episode_ops, series_ops)
+    print(f"✅ Split {episodes} episodes out of {migrated} series")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
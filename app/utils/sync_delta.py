@@ -0,0 +1,102 @@
+# backend/app/utils/sync_delta.py
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+# Max ids per $in lookup when loading stored markers
+LOOKUP_CHUNK = 5000
+
+
+def to_epoch(value) -> Optional[int]:
+    """Normalise an Xtream timestamp (epoch str/int) or a stored datetime to epoch seconds."""
+    if value in (None, "", 0, "0"):
+        return None
+    if isinstance(value, datetime):
+        # Motor returns naive datetimes that are UTC
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def load_markers(collection, key: str, field: str, ids, provider_id=None) -> dict:
+    """Return {id: (content_hash, epoch marker, category_id, soft-deleted)} for one provider's stored documents with the given ids."""
+    markers = {}
+    ids = list(ids)
+    for i in range(0, len(ids), LOOKUP_CHUNK):
+        chunk = ids[i:i + LOOKUP_CHUNK]
+        cursor = collection.find(
+            {"provider_id": provider_id, key: {"$in": chunk}},
+            {key: 1, field: 1, "category_id": 1, "content_hash": 1, "deleted_at": 1, "_id": 0},
+        )
+        async for doc in cursor:
+            markers[doc[key]] = (
+                doc.get("content_hash"),
+                to_epoch(doc.get(field)),
+                doc.get("category_id"),
+                doc.get("deleted_at") is not None,
+            )
+    return markers
+
+
+async def split_changed(
+    items: list,
+    collection,
+    key: str,
+    field: str,
+    digest: Callable[[dict], str],
+    incremental: bool = False,
+    provider_id=None,
+    touched: set = None,
+):
+    """
+    Split upstream list items into ([(item, content_hash)], [unchanged ids]).
+
+    An item is unchanged when a stored document with the same id has the same
+    content hash. With incremental=True a matching `field` timestamp and
+    category also counts as unchanged, which skips get_series_info for series
+    stored before hashes existed. Items without an id, and soft-deleted
+    items that are back upstream, are always treated as changed, so nothing
+    is silently dropped.
+
+    `touched`, if given, collects the category ids whose item set changed:
+    the new and the stored category of every changed item.
+    """
+    by_id = {}
+    changed = []
+    for item in items:
+        try:
+            by_id.setdefault(int(item.get(key)), []).append(item)
+        except (TypeError, ValueError):
+            changed.append((item, digest(item)))
+            if touched is not None:
+                touched.add(str(item.get("category_id")))
+
+    stored = await load_markers(collection, key, field, by_id.keys(), provider_id)
+
+    unchanged = []
+    for item_id, group in by_id.items():
+        previous = stored.get(item_id)
+        live = previous is not None and not previous[3]
+        for item in group:
+            item_hash = digest(item)
+            if live and previous[0] == item_hash:
+                unchanged.append(item_id)
+                continue
+            marker = to_epoch(item.get(field))
+            if (
+                incremental
+                and marker is not None
+                and live
+                and previous[1:3] == (marker, str(item.get("category_id")))
+            ):
+                unchanged.append(item_id)
+                continue
+            changed.append((item, item_hash))
+            if touched is not None:
+                touched.add(str(item.get("category_id")))
+                if previous is not None and previous[2] is not None:
+                    touched.add(previous[2])
+    return changed, unchanged
@@ -0,0 +1,426 @@
+# backend/app/utils/sync_engine.py
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import urlsplit
+
+from app.models.category import Category
+from app.utils.bulk_writer import BULK_BATCH_SIZE, PreparedUpsert
+from app.utils.providers import DEFAULT_ACCOUNT, load_accounts
+from app.utils.sync_metrics import metrics
+from app.utils.sync_workers import get_build_pool
+from app.utils.xtream_service import (
+    LIST_ACTIONS,
+    ITEM_SYNCERS,
+    fetch_with_retry,
+    make_writer,
+    get_category_names,
+    partition_by_category,
+    stream_list,
+    fetch_and_sync_movies,
+    fetch_and_sync_series,
+    fetch_and_sync_live_channels,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "16"))
+SYNC_CATEGORY_CONCURRENCY = int(os.getenv("SYNC_CATEGORY_CONCURRENCY", "4"))
+SYNC_RATE_PER_HOST = float(os.getenv("SYNC_RATE_PER_HOST", "20"))
+SYNC_WRITE_QUEUE_SIZE = int(os.getenv("SYNC_WRITE_QUEUE_SIZE", "1000"))
+SYNC_WRITERS = int(os.getenv("SYNC_WRITERS", "4"))
+# "full": one unfiltered list call per type, partitioned locally (falls back
+# to "per_category" if the full list fails); "stream": like "full" but the
+# list is parsed incrementally and synced chunk by chunk (flat memory);
+# "per_category": one list call per category. With SYNC_PROCESSES > 0,
+# "full" also decodes the list body in a build worker; "stream" parses in
+# the coordinator (the incremental parser's state cannot span pool tasks)
+SYNC_STRATEGY = os.getenv("SYNC_STRATEGY", "stream")
+SYNC_FULL_LIST_TIMEOUT = float(os.getenv("SYNC_FULL_LIST_TIMEOUT", "120"))
+SYNC_STREAM_CHUNK = int(os.getenv("SYNC_STREAM_CHUNK", "500"))
+# Chunks being synced while the next one is read off the wire
+SYNC_STREAM_INFLIGHT = int(os.getenv("SYNC_STREAM_INFLIGHT", "2"))
+
+SYNC_FUNCTIONS = {
+    "movie": fetch_and_sync_movies,
+    "series": fetch_and_sync_series,
+    "live": fetch_and_sync_live_channels,
+}
+
+
+# --------------------
+# Per-host rate limiter (token bucket)
+# --------------------
+class HostRateLimiter:
+    """Caps requests/second per upstream host. rate <= 0 disables the cap."""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets = {}  # host -> (tokens, last_refill)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str):
+        if self.rate <= 0:
+            return
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+# --------------------
+# Sync engine
+# --------------------
+class SyncEngine:
+    """
+    Runs the fetch_and_sync_* functions with bounded upstream concurrency.
+
+    - fetch(): every upstream call goes through a global semaphore and the
+      per-host rate limiter.
+    - save(): documents (or PreparedUpserts from a BuildPool) are queued and
+      drained by background writer tasks into one BulkUpsertWriter per
+      model, so batched DB writes overlap with the next network round trips.
+    - One engine syncs one Xtream account; run an engine per account, all
+      sharing one BuildPool, to sync several accounts at once
+      (see sync_accounts()).
+
+    Use as an async context manager so the writer queue is drained on exit:
+
+        async with SyncEngine() as engine:
+            await engine.sync("series")
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SYNC_CONCURRENCY,
+        category_concurrency: int = SYNC_CATEGORY_CONCURRENCY,
+        rate_per_host: float = SYNC_RATE_PER_HOST,
+        write_queue_size: int = SYNC_WRITE_QUEUE_SIZE,
+        writers: int = SYNC_WRITERS,
+        batch_size: int = BULK_BATCH_SIZE,
+        generation=None,
+        account=DEFAULT_ACCOUNT,
+        pool=None,
+    ):
+        self._fetch_slots = asyncio.Semaphore(concurrency)
+        self._category_slots = asyncio.Semaphore(category_concurrency)
+        self._limiter = HostRateLimiter(rate_per_host)
+        self._queue = asyncio.Queue(maxsize=write_queue_size)
+        self._writer_count = writers
+        self._writers = []
+        self._batch_size = batch_size
+        self._open = asyncio.Event()  # cleared while a checkpoint drains writes
+        self._open.set()
+        self.bulk_writers = {}  # model -> BulkUpsertWriter
+        self.completed = {}  # content_type -> {category_id, ...} fully handed to the writers
+        self.category_totals = {}  # content_type -> number of categories in this run
+        # Sync generation stamped on every item seen upstream (see app/utils/sync_sweep.py)
+        self.generation = generation
+        # The Xtream account this engine syncs (app/utils/providers.py)
+        self.account = account
+        # Optional BuildPool (app/utils/sync_workers.py) for building documents in worker processes
+        self.pool = pool
+        # content_type -> categories whose list could not be fetched or synced;
+        # their items were not seen, so the sweep must not run for that type
+        self.category_failures = {}
+        # collection name -> category ids whose item set changed this run
+        # (refreshes their category summaries, app/utils/category_summary.py)
+        self.touched_categories = {}
+
+    async def __aenter__(self):
+        self._writers = [asyncio.create_task(self._writer()) for _ in range(self._writer_count)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._queue.join()
+        for w in self._writers:
+            w.cancel()
+        await asyncio.gather(*self._writers, return_exceptions=True)
+        self._writers = []
+        for writer in self.bulk_writers.values():
+            await writer.flush()
+
+    # ---- upstream ----
+    async def fetch(self, url: str, **kwargs):
+        async with self._fetch_slots:
+            await self._limiter.acquire(urlsplit(url).netloc)
+            return await fetch_with_retry(url, **kwargs)
+
+    # ---- writes ----
+    async def save(self, doc):
+        # Blocks only when the writers fall behind (back-pressure) or while
+        # a checkpoint is draining the queue.
+        await self._open.wait()
+        await self._queue.put(doc)
+
+    async def checkpoint(self) -> dict:
+        """
+        Make everything handed to save() so far durable and return the
+        categories that were complete at that point ({content_type: [ids]}).
+        Producers are paused only while the queue is drained and flushed.
+        """
+        self._open.clear()
+        try:
+            snapshot = {ct: sorted(ids) for ct, ids in self.completed.items()}
+            await self._queue.join()
+            for writer in list(self.bulk_writers.values()):
+                await writer.flush()
+            return snapshot
+        finally:
+            self._open.set()
+
+    def writer_for(self, model):
+        if model not in self.bulk_writers:
+            self.bulk_writers[model] = make_writer(model, self._batch_size, self.generation)
+        return self.bulk_writers[model]
+
+    def record_failure(self, model, count: int = 1):
+        self.writer_for(model).record_failure(count)
+
+    def record_category_failure(self, content_type: str):
+        self.category_failures[content_type] = self.category_failures.get(content_type, 0) + 1
+
+    def totals(self):
+        """Running BatchResult per collection name."""
+        return {w.label: w.totals for w in self.bulk_writers.values()}
+
+    async def _writer(self):
+        while True:
+            doc = await self._queue.get()
+            try:
+                if isinstance(doc, PreparedUpsert):
+                    await self.writer_for(doc.model).add_prepared(doc)
+                else:
+                    await self.writer_for(type(doc)).add(doc)
+            except Exception as e:
+                logger.error(f"Writer failed on {type(doc).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    # ---- orchestration ----
+    def _mark_done(self, content_type: str, category_id: str):
+        self.completed.setdefault(content_type, set()).add(category_id)
+
+    async def sync_category(self, content_type: str, category_id: str, incremental: bool = False):
+        async with self._category_slots:
+            try:
+                count = await SYNC_FUNCTIONS[content_type](category_id, engine=self, incremental=incremental)
+            except Exception as e:
+                logger.error(f"Sync failed for {content_type} category {category_id}: {e}")
+                self.record_category_failure(content_type)
+                return 0
+            self._mark_done(content_type, category_id)
+            return count
+
+    async def sync(self, content_type: str, category_ids=None, incremental: bool = False, skip=()):
+        """
+        Sync every category (or the given ids) of one content type concurrently.
+        Items whose content hash matches the stored copy are never rewritten;
+        incremental=True also skips items whose upstream added/last_modified
+        is unchanged (see app/utils/sync_delta.py). Categories in `skip` (e.g.
+        finished before a crash) are left alone.
+        """
+        if content_type not in SYNC_FUNCTIONS:
+            raise ValueError("Invalid content_type. Must be movie, series, or live")
+
+        if category_ids is None:
+            categories = await Category.find(Category.provider_id == self.account.id).to_list()
+            category_ids = [cat.category_id for cat in categories]
+        self.category_totals[content_type] = len(category_ids)
+        category_ids = [cid for cid in category_ids if cid not in skip]
+
+        started = time.monotonic()
+        counts = await asyncio.gather(
+            *(self.sync_category(content_type, cid, incremental) for cid in category_ids)
+        )
+        total = sum(counts)
+        logger.info(
+            f"Synced {total} {content_type} items from {len(category_ids)} categories "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        return total
+
+    async def sync_partition(self, content_type: str, category_id: str, items: list, category_name, incremental: bool = False):
+        """Sync one category's items → (count, ok); a failure is logged and recorded, not raised."""
+        async with self._category_slots:
+            try:
+                return await ITEM_SYNCERS[content_type](items, category_id, category_name, self, incremental), True
+            except Exception as e:
+                logger.error(f"Sync failed for {content_type} category {category_id}: {e}")
+                self.record_category_failure(content_type)
+                return 0, False
+
+    async def _sync_whole_partition(self, content_type: str, category_id: str, items: list, category_name, incremental: bool):
+        count, ok = await self.sync_partition(content_type, category_id, items, category_name, incremental)
+        # A failed category must be retried on resume, not skipped
+        if ok:
+            self._mark_done(content_type, category_id)
+        return count
+
+    async def _fetch_partitions(self, url: str):
+        """Unfiltered list → {category_id: [items]}, or None when unavailable. Decoded in a worker if there is a pool."""
+        if self.pool is None:
+            items = await self.fetch(url, timeout=SYNC_FULL_LIST_TIMEOUT)
+            return partition_by_category(items) if isinstance(items, list) else None
+
+        raw = await self.fetch(url, timeout=SYNC_FULL_LIST_TIMEOUT, raw=True)
+        if raw is None:
+            return None
+        try:
+            with metrics.timer("decode", items=1):
+                return await self.pool.decode_list(raw)
+        except ValueError as e:
+            logger.warning(f"Full list from {urlsplit(url).netloc} is not valid JSON: {e}")
+            return None
+
+    async def sync_full(self, content_type: str, incremental: bool = False, skip=()):
+        """
+        Fetch the whole list for a content type in one call and partition it
+        by category_id locally. Falls back to per-category calls when the
+        provider errors or times out on the unfiltered list.
+        """
+        if content_type not in LIST_ACTIONS:
+            raise ValueError("Invalid content_type. Must be movie, series, or live")
+
+        started = time.monotonic()
+        url = f"{self.account.base_api}&action={LIST_ACTIONS[content_type]}"
+        partitions = await self._fetch_partitions(url)
+        if partitions is None:
+            logger.warning(f"Full {content_type} list unavailable, falling back to per-category sync")
+            return await self.sync(content_type, incremental=incremental, skip=skip)
+
+        names = await get_category_names(self.account.id)
+        self.category_totals[content_type] = len(partitions)
+        logger.info(
+            f"Fetched {sum(len(g) for g in partitions.values())} {content_type} items in one call "
+            f"→ {len(partitions)} categories"
+        )
+
+        counts = await asyncio.gather(
+            *(
+                self._sync_whole_partition(content_type, cid, group, names.get(cid), incremental)
+                for cid, group in partitions.items()
+                if cid not in skip
+            )
+        )
+        total = sum(counts)
+        logger.info(f"Synced {total} {content_type} items in {time.monotonic() - started:.1f}s")
+        return total
+
+    async def _sync_chunk(self, content_type: str, chunk: list, names: dict, incremental: bool, seen: set, failed: set):
+        partitions = partition_by_category(chunk)
+        results = await asyncio.gather(
+            *(
+                self.sync_partition(content_type, cid, group, names.get(cid), incremental)
+                for cid, group in partitions.items()
+            )
+        )
+        seen.update(partitions)
+        failed.update(cid for cid, (_, ok) in zip(partitions, results) if not ok)
+        return sum(count for count, _ in results)
+
+    async def sync_stream(self, content_type: str, incremental: bool = False, skip=()):
+        """
+        Streaming variant of sync_full(): the unfiltered list is parsed
+        incrementally and each chunk is partitioned and synced while the next
+        chunk is still downloading. At most SYNC_STREAM_INFLIGHT chunks are
+        held in memory, whatever the catalog size. Any failure of the list
+        stream falls back to per-category sync (upserts are idempotent).
+        A category's items can arrive in any chunk, so categories are only
+        marked done once the whole stream is synced: a job interrupted
+        mid-stream has no finished categories, and run() resumes it with
+        sync_full() instead. `skip` is only honoured by the fallback.
+        """
+        if content_type not in LIST_ACTIONS:
+            raise ValueError("Invalid content_type. Must be movie, series, or live")
+
+        started = time.monotonic()
+        url = f"{self.account.base_api}&action={LIST_ACTIONS[content_type]}"
+        names = await get_category_names(self.account.id)
+        pending = set()
+        total = 0
+        seen, failed = set(), set()
+
+        try:
+            # Rate-limited but not holding a fetch slot: the chunk tasks need
+            # those slots for get_series_info while the stream stays open.
+            await self._limiter.acquire(urlsplit(url).netloc)
+            async for chunk in stream_list(url, SYNC_STREAM_CHUNK, SYNC_FULL_LIST_TIMEOUT):
+                pending.add(asyncio.create_task(self._sync_chunk(content_type, chunk, names, incremental, seen, failed)))
+                if len(pending) >= SYNC_STREAM_INFLIGHT:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    total += sum(t.result() for t in done)
+        except Exception as e:
+            logger.warning(f"Streaming {content_type} list failed ({e}), falling back to per-category sync")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            return await self.sync(content_type, incremental=incremental, skip=skip)
+
+        if pending:
+            total += sum(await asyncio.gather(*pending))
+
+        # Every chunk is synced: a category seen in the stream is complete unless part of it failed
+        self.category_totals[content_type] = len(seen)
+        for cid in seen - failed:
+            self._mark_done(content_type, cid)
+        logger.info(f"Streamed and synced {total} {content_type} items in {time.monotonic() - started:.1f}s")
+        return total
+
+    async def run(self, content_type: str, incremental: bool = False, strategy: str = SYNC_STRATEGY, skip=(), resume: bool = False):
+        """
+        Sync one content type with the given strategy (stream | full | per_category).
+        A resumed job never streams: sync_full() checkpoints per category, so
+        a second interruption does not start over again.
+        """
+        if strategy == "stream" and not skip and not resume:
+            return await self.sync_stream(content_type, incremental)
+        if strategy in ("stream", "full"):
+            return await self.sync_full(content_type, incremental, skip)
+        return await self.sync(content_type, incremental=incremental, skip=skip)
+
+
+async def sync_content(
+    content_type: str,
+    category_ids=None,
+    incremental: bool = False,
+    strategy: str = SYNC_STRATEGY,
+    **engine_options,
+):
+    """Convenience wrapper: one engine, one content type."""
+    async with SyncEngine(**engine_options) as engine:
+        if category_ids is None:
+            return await engine.run(content_type, incremental, strategy)
+        return await engine.sync(content_type, category_ids, incremental)
+
+
+async def sync_accounts(
+    content_type: str,
+    incremental: bool = False,
+    strategy: str = SYNC_STRATEGY,
+    accounts=None,
+    **engine_options,
+):
+    """
+    Sync one content type for every account (default: load_accounts())
+    concurrently, one engine each, sharing the process-wide build pool.
+    Returns {account label: items}.
+    """
+    accounts = accounts if accounts is not None else await load_accounts()
+    pool = get_build_pool()
+
+    async def run(account):
+        async with SyncEngine(account=account, pool=pool, **engine_options) as engine:
+            return await engine.run(content_type, incremental, strategy)
+
+    counts = await asyncio.gather(*(run(account) for account in accounts))
+    return {account.label: count for account, count in zip(accounts, counts)}
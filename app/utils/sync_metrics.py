@@ -0,0 +1,137 @@
+# backend/app/utils/sync_metrics.py
+import logging
+import os
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger("sync")
+
+# Per-item sync logging ("Saving movie ...") is off unless SYNC_VERBOSE=1
+SYNC_VERBOSE = os.getenv("SYNC_VERBOSE", "0") == "1"
+
+STAGES = ("fetch", "decode", "build", "write")
+
+# Upper bounds (seconds) of the upstream latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+
+def log_item(message: str):
+    if SYNC_VERBOSE:
+        logger.debug(message)
+
+
+def action_of(url: str) -> str:
+    """The Xtream `action` of a player_api.php URL (e.g. get_series_info)."""
+    return parse_qs(urlsplit(url).query).get("action", ["unknown"])[0]
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return self.max if bound == float("inf") else bound
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 4),
+            "buckets": {
+                ("+Inf" if b == float("inf") else str(b)): n
+                for b, n in zip(self.buckets, self.counts)
+            },
+        }
+
+
+class SyncMetrics:
+    """
+    Process-wide sync telemetry for the current run.
+
+    Stage seconds are summed over concurrent tasks ("busy time"), so with an
+    engine running 16 fetches at once fetch seconds can exceed wall time;
+    items/sec per stage is items over that busy time, the overall gauge is
+    items written over wall time.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_items = {stage: 0 for stage in STAGES}
+        self.upstream = {}  # action -> Histogram
+        self.changes = {}   # collection -> {"changed": n, "unchanged": n} (content-hash check)
+
+    @contextmanager
+    def timer(self, stage: str, items: int = 0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - start
+            self.stage_items[stage] += items
+
+    def add_items(self, stage: str, items: int):
+        self.stage_items[stage] += items
+
+    def count_changes(self, collection: str, changed: int, unchanged: int):
+        counts = self.changes.setdefault(collection, {"changed": 0, "unchanged": 0})
+        counts["changed"] += changed
+        counts["unchanged"] += unchanged
+
+    def observe_upstream(self, url: str, seconds: float):
+        action = action_of(url)
+        if action not in self.upstream:
+            self.upstream[action] = Histogram()
+        self.upstream[action].observe(seconds)
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        written = self.stage_items["write"]
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_sec": round(written / elapsed, 1) if elapsed else 0.0,
+            "stages": {
+                stage: {
+                    "seconds": round(self.stage_seconds[stage], 3),
+                    "items": self.stage_items[stage],
+                    "items_per_sec": round(self.stage_items[stage] / self.stage_seconds[stage], 1)
+                    if self.stage_seconds[stage]
+                    else 0.0,
+                }
+                for stage in STAGES
+            },
+            "changes": {collection: dict(counts) for collection, counts in self.changes.items()},
+            "upstream_latency": {action: h.snapshot() for action, h in self.upstream.items()},
+        }
+
+
+metrics = SyncMetrics()
@@ -0,0 +1,416 @@
+# backend/app/utils/sync_scheduler.py
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.db import sync_jobs_collection
+from app.models.sync_job import SyncJob
+from app.utils.sync_engine import SyncEngine, SYNC_STRATEGY
+from app.utils.xtream_service import fetch_and_sync_categories, COLLECTIONS, CONTENT_MODELS
+from app.utils.sync_sweep import sweep, SweepAborted
+from app.utils.category_summary import refresh_summaries
+from app.utils.catalog_state import catalog_generation
+from app.utils.sync_workers import get_build_pool
+from app.utils.epg_service import sync_epg, epg_index, EPG_SYNC
+from app.utils.providers import load_accounts
+from app.utils.sync_metrics import metrics
+from app.utils.upstream_client import get_upstream_client
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+SYNC_INTERVAL_MINUTES = float(os.getenv("SYNC_INTERVAL_MINUTES", "0"))  # 0 = no schedule
+SYNC_SCHEDULE_INCREMENTAL = os.getenv("SYNC_SCHEDULE_INCREMENTAL", "1") == "1"
+SYNC_CHECKPOINT_SECONDS = float(os.getenv("SYNC_CHECKPOINT_SECONDS", "30"))
+# The running job's lease is renewed this often, whatever stage it is in
+SYNC_HEARTBEAT_SECONDS = float(os.getenv("SYNC_HEARTBEAT_SECONDS", "30"))
+# A running job whose heartbeat is older than this belongs to a dead process
+SYNC_STALE_SECONDS = float(os.getenv("SYNC_STALE_SECONDS", "300"))
+
+CONTENT_TYPES = ["movie", "series", "live"]
+
+# Lease owner id of this process (every uvicorn worker runs its own scheduler)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+ACTIVE_LOCK = "sync"
+
+
+class SyncAlreadyRunning(Exception):
+    pass
+
+
+class SyncCancelled(Exception):
+    pass
+
+
+class LeaseLost(Exception):
+    """Another process claimed the job (this one was presumed dead): stop without saving."""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def progress_key(content_type: str, account) -> str:
+    """Checkpoint key of one account's share of a stage, e.g. "movie:default"."""
+    return f"{content_type}:{account.label}"
+
+
+async def _save(job: SyncJob):
+    """Persist the job, but only while this process still owns it."""
+    # cancel_requested is owned by the cancel endpoint; never overwrite it here
+    res = await sync_jobs_collection.update_one(
+        {"_id": job.id, "owner": job.owner},
+        {"$set": job.model_dump(exclude={"id", "revision_id", "cancel_requested"})},
+    )
+    if not res.matched_count:
+        raise LeaseLost(f"Sync job {job.id} was claimed by another process")
+
+
+async def active_job():
+    """The running/pending job with a fresh heartbeat, if any (any process)."""
+    fresh = _now() - timedelta(seconds=SYNC_STALE_SECONDS)
+    return await SyncJob.find_one(
+        {"status": {"$in": ["pending", "running"]}, "heartbeat_at": {"$gte": fresh}}
+    )
+
+
+class SyncScheduler:
+    """
+    Runs catalog syncs as background jobs outside the request path.
+
+    Each job is persisted in `sync_jobs` with its stage, per-category
+    checkpoint, counts and durations. Every SYNC_CHECKPOINT_SECONDS the
+    engine's queued writes are flushed and the finished categories are
+    recorded, so a job whose process died is resumed from its last
+    checkpoint on the next startup instead of starting over.
+
+    Every item seen upstream is stamped with the job's generation; once a
+    content type has synced without category failures, items not stamped
+    are swept (app/utils/sync_sweep.py). The category summaries of the
+    categories that changed or were swept are then refreshed
+    (app/utils/category_summary.py).
+
+    Each stage runs every account (app/utils/providers.py) concurrently with
+    its own engine; checkpoints, sweeps and stage completion are tracked per
+    account under progress_key(), so a resume skips the accounts that
+    already finished.
+
+    Every uvicorn worker runs a scheduler, so jobs are leased: a job
+    belongs to the process in its `owner`, which renews heartbeat_at every
+    SYNC_HEARTBEAT_SECONDS from a timer (not only at checkpoints, so one
+    long stage never looks dead). A stale job is claimed with one
+    find_one_and_update; a new job is inserted holding the unique `lock`,
+    so only one can be active. A process that loses its lease stops.
+
+    When live channels are synced, an "epg" stage then ingests each
+    account's guide and rebuilds the in-memory now/next index.
+    """
+
+    def __init__(self):
+        self._loop_task = None
+        self._job_task = None
+        self._job_id = None
+        self._stopping = False
+        self._lease_lost = False
+
+    # ---- lifecycle ----
+    async def start(self):
+        await self.resume_stale()
+        if SYNC_INTERVAL_MINUTES > 0 and self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._schedule_loop())
+            logger.info(f"Sync scheduler started (every {SYNC_INTERVAL_MINUTES:g} min)")
+
+    async def stop(self):
+        # A job interrupted by shutdown stays "running" so the next start resumes it
+        self._stopping = True
+        for task in (self._loop_task, self._job_task):
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._loop_task = None
+
+    async def _schedule_loop(self):
+        while True:
+            await asyncio.sleep(SYNC_INTERVAL_MINUTES * 60)
+            try:
+                if not await self.resume_stale():
+                    await self.trigger(trigger="schedule", incremental=SYNC_SCHEDULE_INCREMENTAL)
+            except SyncAlreadyRunning:
+                logger.info("Scheduled sync skipped: a sync is already running")
+            except Exception as e:
+                logger.error(f"Scheduled sync failed to start: {e}")
+
+    # ---- control ----
+    def _busy(self) -> bool:
+        return self._job_task is not None and not self._job_task.done()
+
+    async def trigger(self, content_types=None, incremental: bool = False, strategy: str = SYNC_STRATEGY, trigger: str = "manual"):
+        if self._busy():
+            raise SyncAlreadyRunning("A sync job is already running")
+
+        job = SyncJob(
+            trigger=trigger,
+            content_types=[ct for ct in (content_types or CONTENT_TYPES) if ct in CONTENT_TYPES],
+            incremental=incremental,
+            strategy=strategy,
+            generation=time.time_ns() // 1_000_000,
+            heartbeat_at=_now(),
+            owner=WORKER_ID,
+            lock=ACTIVE_LOCK,
+        )
+        try:
+            # Atomic with the check: the unique lock admits one active job across processes
+            await job.insert()
+        except DuplicateKeyError:
+            if await self.resume_stale():
+                raise SyncAlreadyRunning("An interrupted sync job was resumed instead")
+            raise SyncAlreadyRunning("A sync job is already running")
+        self._start(job)
+        return job
+
+    async def resume_stale(self):
+        """Claim and resume the newest active job whose owner stopped heartbeating. Returns it, or None."""
+        if self._busy():
+            return None
+        stale = _now() - timedelta(seconds=SYNC_STALE_SECONDS)
+        doc = await sync_jobs_collection.find_one_and_update(
+            {
+                "status": {"$in": ["pending", "running"]},
+                "$or": [{"heartbeat_at": {"$lt": stale}}, {"heartbeat_at": None}],
+            },
+            {"$set": {"owner": WORKER_ID, "heartbeat_at": _now()}, "$inc": {"resumes": 1}},
+            sort=[("created_at", -1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return None
+        job = SyncJob.model_validate(doc)
+        logger.info(f"Resuming sync job {job.id} at stage {job.stage} (resume #{job.resumes})")
+        self._start(job)
+        return job
+
+    async def cancel(self, job_id=None):
+        job = await SyncJob.get(job_id) if job_id else await active_job()
+        if not job or job.status not in ("pending", "running"):
+            return None
+        await job.set({"cancel_requested": True})
+        # Running here: stop now. Running elsewhere: that process notices at its next heartbeat.
+        if self._job_id == job.id and self._job_task and not self._job_task.done():
+            self._job_task.cancel()
+        return job
+
+    def _start(self, job: SyncJob):
+        self._job_id = job.id
+        self._lease_lost = False
+        self._job_task = asyncio.create_task(self._execute(job))
+
+    # ---- execution ----
+    async def _heartbeat(self, job: SyncJob, task: asyncio.Task):
+        """Renew the lease on a timer; stop the job if it was claimed elsewhere or cancelled."""
+        while True:
+            await asyncio.sleep(SYNC_HEARTBEAT_SECONDS)
+            try:
+                doc = await sync_jobs_collection.find_one_and_update(
+                    {"_id": job.id, "owner": job.owner},
+                    {"$set": {"heartbeat_at": _now()}},
+                    projection={"cancel_requested": 1},
+                )
+            except Exception as e:
+                logger.warning(f"Heartbeat for sync job {job.id} failed: {e}")
+                continue
+            if doc is None:
+                logger.warning(f"Sync job {job.id} was claimed by another process; stopping here")
+                self._lease_lost = True
+            elif not doc.get("cancel_requested"):
+                continue
+            if job.finished_at is None:
+                task.cancel()
+            return
+
+    async def _execute(self, job: SyncJob):
+        heartbeat = asyncio.create_task(self._heartbeat(job, asyncio.current_task()))
+        try:
+            await self._run(job)
+        except LeaseLost as e:
+            logger.warning(str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _run(self, job: SyncJob):
+        metrics.reset()
+        job.status = "running"
+        job.started_at = job.started_at or _now()
+        job.heartbeat_at = _now()
+        await _save(job)
+
+        try:
+            accounts = await load_accounts()
+            if "categories" not in job.completed_stages:
+                job.stage = "categories"
+                await _save(job)
+                started = time.monotonic()
+                for account in accounts:
+                    for ct in job.content_types:
+                        await fetch_and_sync_categories(ct, account)
+                job.durations["categories"] = time.monotonic() - started
+                job.completed_stages.append("categories")
+                await _save(job)
+
+            for ct in job.content_types:
+                if ct not in job.completed_stages:
+                    await self._run_stage(job, ct, accounts)
+
+            if EPG_SYNC and "live" in job.content_types and "epg" not in job.completed_stages:
+                await self._run_epg(job, accounts)
+
+            job.status = "completed"
+            job.stage = None
+        except LeaseLost:
+            raise
+        except (asyncio.CancelledError, SyncCancelled):
+            if self._lease_lost:
+                logger.info(f"Sync job {job.id} stopped: lease lost at stage {job.stage}")
+                return
+            if self._stopping:
+                job.heartbeat_at = None  # resumable immediately on next startup
+                await _save(job)
+                logger.info(f"Sync job {job.id} interrupted by shutdown at stage {job.stage}")
+                return
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Sync job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+
+        job.finished_at = _now()
+        job.heartbeat_at = _now()
+        job.lock = None  # lets the next job in
+        job.summary = {**metrics.snapshot(), "upstream_client": get_upstream_client().stats()}
+        await _save(job)
+        logger.info(
+            f"Sync job {job.id} {job.status}: {job.counts} in {job.summary['elapsed_seconds']}s "
+            f"({job.summary['items_per_sec']} items/s)"
+        )
+
+    async def _run_stage(self, job: SyncJob, content_type: str, accounts: list):
+        job.stage = content_type
+        await _save(job)
+        started = time.monotonic()
+        pool = get_build_pool()
+
+        tasks = [asyncio.create_task(self._run_account(job, content_type, account, pool)) for account in accounts]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        job.durations[content_type] = job.durations.get(content_type, 0) + time.monotonic() - started
+        job.completed_stages.append(content_type)
+        job.heartbeat_at = _now()
+        await _save(job)
+        # The stage's writes are complete: invalidate every API process's catalog caches
+        await catalog_generation.publish()
+
+    async def _run_account(self, job: SyncJob, content_type: str, account, pool):
+        key = progress_key(content_type, account)
+        if key in job.completed_stages:
+            return
+        skip = set(job.completed_categories.get(key, []))
+
+        async with SyncEngine(generation=job.generation, account=account, pool=pool) as engine:
+            run = asyncio.create_task(engine.run(content_type, job.incremental, job.strategy, skip, resume=bool(job.resumes)))
+            try:
+                while True:
+                    done, _ = await asyncio.wait({run}, timeout=SYNC_CHECKPOINT_SECONDS)
+                    if done:
+                        break
+                    await self._checkpoint(job, engine, content_type, key, skip)
+                count = run.result()
+            finally:
+                if not run.done():
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+
+        # Leaving the engine context flushed every pending write
+        job.completed_categories[key] = sorted(skip | engine.completed.get(content_type, set()))
+        job.categories_total[key] = engine.category_totals.get(content_type, 0)
+        job.counts[content_type] = job.counts.get(content_type, 0) + count
+        swept = await self._sweep(job, engine, content_type, key)
+        await self._refresh_summaries(job, engine, content_type, swept)
+        job.completed_stages.append(key)
+        job.heartbeat_at = _now()
+        await _save(job)
+
+    async def _run_epg(self, job: SyncJob, accounts: list):
+        job.stage = "epg"
+        await _save(job)
+        started = time.monotonic()
+        for account in accounts:
+            key = progress_key("epg", account)
+            if key in job.completed_stages:
+                continue
+            try:
+                job.counts["epg"] = job.counts.get("epg", 0) + await sync_epg(account)
+            except Exception as e:
+                # The guide is optional: a failed download must not fail the catalog sync
+                logger.error(f"EPG ingest for {account.label} failed: {e}")
+            job.completed_stages.append(key)
+            job.heartbeat_at = _now()
+            await _save(job)
+
+        await epg_index.rebuild()
+        job.durations["epg"] = job.durations.get("epg", 0) + time.monotonic() - started
+        job.completed_stages.append("epg")
+        await _save(job)
+
+    async def _sweep(self, job: SyncJob, engine: SyncEngine, content_type: str, key: str) -> list:
+        """Sweep one account's share of a stage. Returns the categories items were removed from."""
+        if job.generation is None:
+            return []
+        failures = engine.category_failures.get(content_type, 0)
+        if failures:
+            logger.warning(f"Sweep of {key} skipped: {failures} categories failed to sync")
+            job.sweeps[key] = {"skipped": f"{failures} categories failed to sync"}
+            return []
+        try:
+            result = await sweep(COLLECTIONS[CONTENT_MODELS[content_type]], job.generation, engine.account.id)
+        except SweepAborted as e:
+            logger.warning(f"Sweep of {key} aborted: {e}")
+            job.sweeps[key] = {"aborted": str(e)}
+            return []
+        swept = result.pop("categories", [])
+        job.sweeps[key] = result
+        return swept
+
+    async def _refresh_summaries(self, job: SyncJob, engine: SyncEngine, content_type: str, swept: list):
+        # A resumed job does not know what changed before the restart: recompute everything
+        providers = [engine.account.id]
+        if job.resumes:
+            await refresh_summaries(content_type, provider_ids=providers)
+            return
+        collection = COLLECTIONS[CONTENT_MODELS[content_type]].name
+        await refresh_summaries(content_type, engine.touched_categories.get(collection, set()) | set(swept), providers)
+
+    async def _checkpoint(self, job: SyncJob, engine: SyncEngine, content_type: str, key: str, skip: set):
+        snapshot = await engine.checkpoint()
+        job.completed_categories[key] = sorted(skip | set(snapshot.get(content_type, [])))
+        job.categories_total[key] = engine.category_totals.get(content_type, 0)
+        job.heartbeat_at = _now()
+        await _save(job)
+
+        fresh = await SyncJob.get(job.id)
+        if fresh and fresh.cancel_requested:
+            raise SyncCancelled()
+
+
+scheduler = SyncScheduler()
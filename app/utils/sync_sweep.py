@@ -0,0 +1,79 @@
+# backend/app/utils/sync_sweep.py
+import logging
+import os
+from datetime import datetime, timezone
+
+from app.utils.sync_delta import LOOKUP_CHUNK
+
+logger = logging.getLogger(__name__)
+
+# soft: set deleted_at (revived if the item comes back) | hard: delete | off
+SYNC_SWEEP_MODE = os.getenv("SYNC_SWEEP_MODE", "soft")
+# Abort the sweep when it would remove more than this fraction of a collection
+SYNC_SWEEP_MAX_FRACTION = float(os.getenv("SYNC_SWEEP_MAX_FRACTION", "0.2"))
+
+
+class SweepAborted(Exception):
+    pass
+
+
+def generation_stamp(generation) -> dict:
+    """Fields written on every item a sync run touches (mark phase)."""
+    return {"sync_generation": generation, "deleted_at": None}
+
+
+async def mark_seen(collection, key: str, ids, generation, provider_id=None):
+    """Stamp one provider's items that were seen upstream but skipped as unchanged."""
+    ids = list(ids)
+    for i in range(0, len(ids), LOOKUP_CHUNK):
+        await collection.update_many(
+            {"provider_id": provider_id, key: {"$in": ids[i:i + LOOKUP_CHUNK]}},
+            {"$set": generation_stamp(generation)},
+        )
+
+
+async def sweep(
+    collection,
+    generation,
+    provider_id=None,
+    mode: str = SYNC_SWEEP_MODE,
+    max_fraction: float = SYNC_SWEEP_MAX_FRACTION,
+) -> dict:
+    """
+    Remove every live document of one provider not stamped with
+    `generation`, i.e. not seen upstream in that sync run. Raises
+    SweepAborted instead of removing more than `max_fraction` of the live
+    catalog (a partial upstream failure looks exactly like a mass deletion).
+    """
+    live = {"provider_id": provider_id, "deleted_at": None}
+    stale = {**live, "sync_generation": {"$ne": generation}}
+
+    total = await collection.count_documents(live)
+    unseen = await collection.count_documents(stale)
+    result = {
+        "collection": collection.name,
+        "provider_id": provider_id,
+        "mode": mode,
+        "live": total,
+        "unseen": unseen,
+        "removed": 0,
+    }
+    if mode == "off" or not unseen:
+        return result
+    if unseen > total * max_fraction:
+        raise SweepAborted(
+            f"{collection.name} (provider {provider_id or 'default'}): {unseen}/{total} items unseen this run "
+            f"(limit {max_fraction:.0%}), not sweeping"
+        )
+
+    # Their category summaries change (app/utils/category_summary.py)
+    result["categories"] = [c for c in await collection.distinct("category_id", stale) if c is not None]
+    if mode == "hard":
+        res = await collection.delete_many(stale)
+        result["removed"] = res.deleted_count
+    else:
+        # Unlisted too: listing queries and their partial indexes only look at playable
+        res = await collection.update_many(stale, {"$set": {"deleted_at": datetime.now(timezone.utc), "playable": False}})
+        result["removed"] = res.modified_count
+    logger.info(f"Swept {result['removed']} {collection.name} not seen in generation {generation} ({mode})")
+    return result
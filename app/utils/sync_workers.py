@@ -0,0 +1,138 @@
+# backend/app/utils/sync_workers.py
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from app.utils.bulk_writer import PreparedUpsert, upsert_spec
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for the CPU side of a sync (decode/build); 0 = build in the event loop
+SYNC_PROCESSES = int(os.getenv("SYNC_PROCESSES", "0"))
+# List items per task handed to a worker
+SYNC_BUILD_CHUNK = int(os.getenv("SYNC_BUILD_CHUNK", "250"))
+
+
+# --------------------
+# Worker side (runs in the child processes)
+# --------------------
+def _init_worker():
+    # Beanie documents can only be constructed once their models are initialised
+    from app.db import init_db
+    asyncio.run(init_db(indexes=False))
+
+
+def _build_items(content_type: str, items: list, category_name, account):
+    """[(list item, content_hash)] → ([(filter, update)], failures)."""
+    from app.utils.xtream_service import ITEM_BUILDERS, UPSERT_KEYS
+
+    build = ITEM_BUILDERS[content_type]
+    specs, failures = [], 0
+    for item, digest in items:
+        try:
+            doc = build(item, category_name, digest, account)
+        except Exception:
+            failures += 1
+            continue
+        if doc is not None:
+            specs.append(upsert_spec(doc, UPSERT_KEYS[type(doc)]))
+    return specs, failures
+
+
+def _decode_list(raw: bytes):
+    """Decode an unfiltered list body and partition it → {category_id: [items]}, or None if not a list."""
+    from app.utils.xtream_service import partition_by_category
+
+    items = json.loads(raw)
+    return partition_by_category(items) if isinstance(items, list) else None
+
+
+def _build_series(item: dict, raw_info: bytes, category_name, digest, account):
+    """Decode one get_series_info body and build the series and its episodes as (filter, update) specs."""
+    from app.utils.xtream_service import build_series, UPSERT_KEYS
+    from app.models.series import Series, Episode
+
+    series, episodes = build_series(item, json.loads(raw_info), category_name, digest, account)
+    return (
+        upsert_spec(series, UPSERT_KEYS[Series]),
+        [upsert_spec(e, UPSERT_KEYS[Episode]) for e in episodes],
+    )
+
+
+# --------------------
+# Coordinator side
+# --------------------
+class BuildPool:
+    """
+    Process pool for building catalog documents off the event loop. The
+    coordinator (SyncEngine) keeps fetching and writing; workers return
+    plain upsert specs that the engine's bulk writers apply as they are.
+    One pool is shared by every provider's engine.
+    """
+
+    def __init__(self, processes: int = SYNC_PROCESSES, chunk_size: int = SYNC_BUILD_CHUNK):
+        self.processes = processes
+        self.chunk_size = max(1, chunk_size)
+        # spawn: children must not inherit the parent's Mongo client
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def decode_list(self, raw: bytes):
+        """Full list body → {category_id: [items]} or None; json.loads runs in a worker, not the event loop."""
+        return await self._run(_decode_list, raw)
+
+    async def build_items(self, content_type: str, items: list, category_name, account):
+        """Build [(list item, content_hash)] in parallel chunks → ([PreparedUpsert], failures)."""
+        from app.utils.xtream_service import CONTENT_MODELS
+
+        model = CONTENT_MODELS[content_type]
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        results = await asyncio.gather(
+            *(self._run(_build_items, content_type, chunk, category_name, account) for chunk in chunks)
+        )
+        prepared, failures = [], 0
+        for specs, failed in results:
+            prepared.extend(PreparedUpsert(model, match, update) for match, update in specs)
+            failures += failed
+        return prepared, failures
+
+    async def build_series(self, item: dict, raw_info: bytes, category_name, digest, account):
+        """→ (PreparedUpsert for the series, [PreparedUpsert per episode])."""
+        from app.models.series import Series, Episode
+
+        series, episodes = await self._run(_build_series, item, raw_info, category_name, digest, account)
+        return (
+            PreparedUpsert(Series, *series),
+            [PreparedUpsert(Episode, match, update) for match, update in episodes],
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_build_pool():
+    """Process-wide build pool, or None when SYNC_PROCESSES is 0."""
+    global _pool
+    if _pool is None and SYNC_PROCESSES > 0:
+        _pool = BuildPool()
+        logger.info(f"Sync build pool started with {SYNC_PROCESSES} processes")
+    return _pool
+
+
+def close_build_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
@@ -3,10 +3,6 @@
 # from app.models.content import Content, Season, Episode
 # from datetime import datetime, timezone
 
-# XC_URL = "http://slytv.uk:80"
-# USERNAME = "yWYKAuE7"
-# PASSWORD = "g1hGECF"
-
 # BASE_API = f"{XC_URL}/player_api.php?username={USERNAME}&password={PASSWORD}"
 
 
@@ -177,10 +173,7 @@ import httpx
 from app.models.content import Content, Season, Episode
 from app.models.category import Category # Assuming you have this now
 from datetime import datetime, timezone
-
-XC_URL = "http://slytv.uk:80"
-USERNAME = "yWYKAuE7"
-PASSWORD = "g1hGECF"
+from app.utils.providers import XC_URL, USERNAME, PASSWORD
 
 BASE_API = f"{XC_URL}/player_api.php?username={USERNAME}&password={PASSWORD}"
 
@@ -0,0 +1,282 @@
+# backend/app/utils/upstream_client.py
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.utils.sync_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Tunables (env overridable)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "50"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "10"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "30"))
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "3"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "30"))
+UPSTREAM_CB_THRESHOLD = int(os.getenv("UPSTREAM_CB_THRESHOLD", "5"))
+UPSTREAM_CB_RESET = float(os.getenv("UPSTREAM_CB_RESET", "30"))
+
+# Worth retrying: throttling and server-side failures. Other 4xx are final.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class UpstreamStatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+# --------------------
+# Circuit breaker (per host)
+# --------------------
+class CircuitBreaker:
+    """
+    closed → open after `threshold` consecutive failures; open → half-open
+    after `reset_timeout` seconds, when a single probe request is let through.
+    The probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int = UPSTREAM_CB_THRESHOLD, reset_timeout: float = UPSTREAM_CB_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Returns True when this failure (re)opened the circuit."""
+        self.failures += 1
+        was_probe = self._probing
+        self._probing = False
+        if was_probe or (self.opened_at is None and self.failures >= self.threshold):
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+
+# --------------------
+# Pooled client
+# --------------------
+class UpstreamClient:
+    """
+    One keep-alive connection pool shared by every Xtream call in the process,
+    with exponential backoff (full jitter) and a per-host circuit breaker.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive: int = UPSTREAM_MAX_KEEPALIVE,
+        keepalive_expiry: float = UPSTREAM_KEEPALIVE_EXPIRY,
+        timeout: float = UPSTREAM_TIMEOUT,
+        pool_timeout: float = UPSTREAM_POOL_TIMEOUT,
+        retries: int = UPSTREAM_RETRIES,
+        backoff_base: float = UPSTREAM_BACKOFF_BASE,
+        backoff_max: float = UPSTREAM_BACKOFF_MAX,
+    ):
+        self.max_connections = max_connections
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client = None
+        self._breakers = {}
+        self.in_flight = 0
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "circuit_opened": 0,
+            "circuit_rejected": 0,
+            "pool_saturated": 0,
+            "pool_timeouts": 0,
+            "max_in_flight": 0,
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self._timeout(self.timeout))
+        return self._client
+
+    def _timeout(self, timeout: float) -> httpx.Timeout:
+        return httpx.Timeout(timeout, pool=self.pool_timeout)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker()
+        return self._breakers[host]
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    # ---- bookkeeping ----
+    def _enter(self, url: str) -> CircuitBreaker:
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self.counters["circuit_rejected"] += 1
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+        self.counters["requests"] += 1
+        if self.in_flight >= self.max_connections:
+            self.counters["pool_saturated"] += 1
+        self.in_flight += 1
+        self.counters["max_in_flight"] = max(self.counters["max_in_flight"], self.in_flight)
+        return breaker
+
+    def _exit(self, breaker: CircuitBreaker, ok: bool, url: str):
+        self.in_flight -= 1
+        if ok:
+            breaker.record_success()
+            return
+        self.counters["failures"] += 1
+        if breaker.record_failure():
+            self.counters["circuit_opened"] += 1
+            logger.warning(f"Circuit opened for {urlsplit(url).netloc} after {breaker.failures} failures")
+
+    # ---- requests ----
+    async def get_json(self, url: str, retries: int = None, timeout: float = None, raw: bool = False):
+        """
+        GET and decode JSON. Retries transport errors, timeouts, 429 and 5xx
+        with jittered exponential backoff; returns None when retries are
+        exhausted, on a final 4xx, or when the host's circuit is open.
+        raw=True skips decoding and returns the body bytes.
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries):
+            try:
+                breaker = self._enter(url)
+            except CircuitOpenError as e:
+                logger.debug(str(e))
+                return None
+
+            ok = False
+            try:
+                started = time.perf_counter()
+                with metrics.timer("fetch", items=1):
+                    res = await self.client.get(url, timeout=self._timeout(timeout or self.timeout))
+                metrics.observe_upstream(url, time.perf_counter() - started)
+                if res.status_code == 200 and raw:
+                    ok = True
+                    return res.content
+                if res.status_code == 200:
+                    with metrics.timer("decode", items=1):
+                        data = res.json()
+                    ok = True
+                    return data
+                if res.status_code not in RETRYABLE_STATUS:
+                    # The host answered; this URL is just bad.
+                    ok = True
+                    logger.warning(f"Status {res.status_code} for {url}, not retrying")
+                    return None
+                logger.warning(f"Status {res.status_code} for {url} (attempt {attempt + 1}/{retries})")
+            except httpx.PoolTimeout:
+                self.counters["pool_timeouts"] += 1
+                logger.warning(f"Connection pool exhausted for {url} (attempt {attempt + 1}/{retries})")
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1}/{retries} failed for {url}: {e}")
+            finally:
+                self._exit(breaker, ok, url)
+
+            if attempt + 1 < retries:
+                self.counters["retries"] += 1
+                await asyncio.sleep(self.backoff(attempt))
+
+        logger.error(f"All {retries} attempts failed for {url}")
+        return None
+
+    @asynccontextmanager
+    async def stream(self, url: str, timeout: float = None):
+        """Streamed GET through the shared pool (no retries: callers fall back instead)."""
+        breaker = self._enter(url)
+        ok = False
+        started = time.perf_counter()
+        try:
+            async with self.client.stream("GET", url, timeout=self._timeout(timeout or self.timeout)) as res:
+                # Time to response headers; the body is timed by the consumer
+                metrics.observe_upstream(url, time.perf_counter() - started)
+                metrics.add_items("fetch", 1)
+                if res.status_code != 200:
+                    # As in get_json: a final 4xx means the host answered
+                    ok = res.status_code not in RETRYABLE_STATUS
+                    raise UpstreamStatusError(res.status_code)
+                yield res
+                ok = True
+        except httpx.PoolTimeout:
+            self.counters["pool_timeouts"] += 1
+            raise
+        finally:
+            self._exit(breaker, ok, url)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "max_connections": self.max_connections,
+            "circuits": {
+                host: {"state": b.state, "failures": b.failures}
+                for host, b in self._breakers.items()
+            },
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_upstream = None
+
+
+def get_upstream_client() -> UpstreamClient:
+    """Process-wide client (created on first use)."""
+    global _upstream
+    if _upstream is None:
+        _upstream = UpstreamClient()
+    return _upstream
+
+
+async def close_upstream_client():
+    if _upstream is not None:
+        await _upstream.aclose()
@@ -1,22 +1,28 @@
 # backend/app/utils/xtream_service.py
-import httpx
 from datetime import datetime, timezone
 from app.models.movies import Movie
 from app.models.series import Series, Season, Episode
 from app.models.live_channels import LiveChannel
 from app.models.category import Category
+from app.db import movies_collection, series_collection, channels_collection, episodes_collection
+from app.utils.bulk_writer import BulkUpsertWriter
+from app.utils.providers import DEFAULT_ACCOUNT
+from app.utils.sync_delta import split_changed
+from app.utils.content_hash import content_hash
+from app.utils.playable import with_listing
+from app.utils.sync_sweep import mark_seen, generation_stamp
+from app.utils.json_stream import JSONArrayStream
+from app.utils.upstream_client import get_upstream_client
+from app.utils.sync_metrics import metrics, log_item
 import asyncio
 
-XC_URL = "http://slytv.uk:80"
-USERNAME = "yWYKAuE7"
-PASSWORD = "g1hGECF"
-
-BASE_API = f"{XC_URL}/player_api.php?username={USERNAME}&password={PASSWORD}"
+# Env-configured account (see app/utils/providers.py for Provider documents)
+BASE_API = DEFAULT_ACCOUNT.base_api
 
 # --------------------
 # Categories (unchanged)
 # --------------------
-async def fetch_and_sync_categories(content_type: str):
+async def fetch_and_sync_categories(content_type: str, account=DEFAULT_ACCOUNT):
     """
     Fetch and store categories for movies, series, or live.
     content_type: "movie", "series", "live"
@@ -30,231 +36,527 @@ async def fetch_and_sync_categories(content_type: str):
     if content_type not in endpoint_map:
         raise ValueError("Invalid content_type. Must be movie, series, or live")
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(f"{BASE_API}&action={endpoint_map[content_type]}")
-        categories = res.json() if res.status_code == 200 else []
+    categories = await fetch_with_retry(f"{account.base_api}&action={endpoint_map[content_type]}") or []
 
-        print(f"📡 Fetching {content_type} categories → {len(categories)} items")
+    print(f"📡 Fetching {content_type} categories ({account.label}) → {len(categories)} items")
 
-        for cat in categories:
-            try:
-                doc = Category(
-                    category_id=str(cat.get("category_id")),
-                    category_name=cat.get("category_name"),
-                    parent_id=cat.get("parent_id", 0),
-                )
-                print(f"➡️ Saving category: {doc.category_name} (ID={doc.category_id})")
+    for cat in categories:
+        try:
+            doc = Category(
+                provider_id=account.id,
+                category_id=str(cat.get("category_id")),
+                category_name=cat.get("category_name"),
+                parent_id=cat.get("parent_id", 0),
+            )
+            log_item(f"➡️ Saving category: {doc.category_name} (ID={doc.category_id})")
 
-                await Category.find_one(Category.category_id == doc.category_id).upsert(
-                    {"$set": doc.model_dump(exclude_unset=True)},
-                    on_insert=doc,
-                )
-            except Exception as e:
-                print(f"❌ Error saving category {cat.get('category_name')}: {e}")
+            await Category.find_one(
+                Category.provider_id == doc.provider_id,
+                Category.category_id == doc.category_id,
+            ).upsert(
+                {"$set": doc.model_dump(exclude_unset=True)},
+                on_insert=doc,
+            )
+        except Exception as e:
+            print(f"❌ Error saving category {cat.get('category_name')}: {e}")
 
-        print(f"✅ Synced {len(categories)} {content_type} categories")
-        return len(categories)
+    print(f"✅ Synced {len(categories)} {content_type} categories")
+    return len(categories)
 
 
 # --------------------
 # Helper function with retry
 # --------------------
-async def fetch_with_retry(url, retries=3, timeout=10):
-    for attempt in range(1, retries + 1):
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                res = await client.get(url)
-                if res.status_code == 200:
-                    return res.json()
-                else:
-                    print(f"⚠️ Warning: Status {res.status_code} for {url}")
-        except Exception as e:
-            print(f"⚠️ Attempt {attempt} failed for {url}: {e}")
-        await asyncio.sleep(2)
-    print(f"❌ All {retries} retries failed for {url}")
-    return None
+async def fetch_with_retry(url, retries=None, timeout=None, raw=False):
+    """
+    GET a player_api.php URL through the shared pooled client
+    (app/utils/upstream_client.py): keep-alive, jittered exponential
+    backoff and a per-host circuit breaker. Returns None on failure.
+    raw=True returns the undecoded body (decoded later in a build worker).
+    """
+    return await get_upstream_client().get_json(url, retries=retries, timeout=timeout, raw=raw)
+
+
+async def stream_list(url, chunk_size=500, timeout=120):
+    """
+    Stream a JSON array response and yield its items in lists of chunk_size,
+    parsing incrementally instead of buffering the whole body with res.json().
+    Raises on HTTP errors, timeouts or a malformed/non-array body.
+    """
+    parser = JSONArrayStream()
+    chunk = []
+    async with get_upstream_client().stream(url, timeout=timeout) as res:
+        async for text in res.aiter_text():
+            with metrics.timer("decode"):
+                items = parser.feed(text)
+            metrics.add_items("decode", len(items))
+            chunk.extend(items)
+            while len(chunk) >= chunk_size:
+                yield chunk[:chunk_size]
+                chunk = chunk[chunk_size:]
+    chunk.extend(parser.close())
+    while chunk:
+        yield chunk[:chunk_size]
+        chunk = chunk[chunk_size:]
 
 
 # --------------------
-# Movies
+# Upsert helpers
 # --------------------
-async def fetch_and_sync_movies(category_id: str):
-    url = f"{BASE_API}&action=get_vod_streams&category_id={category_id}"
-    movies = await fetch_with_retry(url) or []
+UPSERT_KEYS = {
+    Movie: "stream_id",
+    Series: "series_id",
+    LiveChannel: "stream_id",
+    Episode: "stream_id",
+}
 
-    category = await Category.find_one(Category.category_id == category_id)
-    category_name = category.category_name if category else None
+COLLECTIONS = {
+    Movie: movies_collection,
+    Series: series_collection,
+    LiveChannel: channels_collection,
+    Episode: episodes_collection,
+}
 
-    print(f"📡 Fetching movies for category_id={category_id} ({category_name}) → {len(movies)} items")
 
-    for m in movies:
+# Upstream timestamp compared against the stored copy in incremental mode
+DELTA_FIELDS = {
+    Movie: "added",
+    Series: "last_modified",
+    LiveChannel: "added",
+}
+
+
+def item_hash(item: dict, category_name=None, account=DEFAULT_ACCOUNT) -> str:
+    """Content hash of a list item plus what the build adds (category name, stream URL base)."""
+    return content_hash(item, category_name=category_name, stream_base=account.stream_base)
+
+
+def _account(engine):
+    return engine.account if engine else DEFAULT_ACCOUNT
+
+
+async def filter_changed(items: list, model, label: str, category_name=None, incremental: bool = False, engine=None):
+    """
+    Drop list items whose content hash matches the stored document (and, in
+    incremental mode, those whose timestamp/category match). Returns
+    [(item, content_hash)] for the items that need writing. Skipped items
+    are still stamped with the engine's sync generation, so the sweep knows
+    they exist upstream.
+    """
+    account = _account(engine)
+    changed, unchanged = await split_changed(
+        items,
+        COLLECTIONS[model],
+        UPSERT_KEYS[model],
+        DELTA_FIELDS[model],
+        lambda item: item_hash(item, category_name, account),
+        incremental,
+        account.id,
+        engine.touched_categories.setdefault(COLLECTIONS[model].name, set()) if engine else None,
+    )
+    if engine and engine.generation is not None:
+        await mark_seen(COLLECTIONS[model], UPSERT_KEYS[model], unchanged, engine.generation, account.id)
+    metrics.count_changes(COLLECTIONS[model].name, len(changed), len(unchanged))
+    print(f"🔎 {label}: {len(changed)} new/changed, {len(unchanged)} unchanged")
+    return changed
+
+
+def make_writer(model, batch_size=None, generation=None):
+    """
+    Unordered bulk upserts keyed on the model's Xtream id (see UPSERT_KEYS).
+    With a sync generation every written item is stamped with it (episodes
+    follow their series and are not swept on their own).
+    """
+    options = {"batch_size": batch_size} if batch_size else {}
+    if generation is not None and model is not Episode:
+        options["stamp"] = generation_stamp(generation)
+    return BulkUpsertWriter(COLLECTIONS[model], UPSERT_KEYS[model], **options)
+
+
+async def get_category_name(category_id: str, provider_id=None):
+    category = await Category.find_one(Category.provider_id == provider_id, Category.category_id == category_id)
+    return category.category_name if category else None
+
+
+async def get_category_names(provider_id=None) -> dict:
+    """{category_id: category_name} for every stored category of a provider, in one query."""
+    categories = await Category.find(Category.provider_id == provider_id).to_list()
+    return {cat.category_id: cat.category_name for cat in categories}
+
+
+def partition_by_category(items: list) -> dict:
+    """Group an unfiltered Xtream list by its category_id (as stored: str)."""
+    partitions = {}
+    for item in items:
+        partitions.setdefault(str(item.get("category_id")), []).append(item)
+    return partitions
+
+
+def _record_build_failure(engine, writer, model, count=1):
+    if engine:
+        engine.record_failure(model, count)
+    else:
+        writer.record_failure(count)
+
+
+async def _build_and_save(content_type: str, items: list, category_name, engine, writer, save):
+    """
+    Build the documents for [(list item, content_hash)] and hand them to
+    `save`. With an engine that has a build pool (app/utils/sync_workers.py)
+    the CPU work runs in worker processes and comes back as prepared upserts.
+    """
+    model = CONTENT_MODELS[content_type]
+    account = _account(engine)
+    pool = engine.pool if engine else None
+    if pool:
+        with metrics.timer("build", items=len(items)):
+            prepared, failures = await pool.build_items(content_type, items, category_name, account)
+        if failures:
+            _record_build_failure(engine, writer, model, failures)
+        for upsert in prepared:
+            await save(upsert)
+        return
+
+    build = ITEM_BUILDERS[content_type]
+    for item, digest in items:
         try:
-            stream_id = m.get("stream_id")
-            if not stream_id:
-                print(f"⚠️ Skipping movie without stream_id: {m}")
+            with metrics.timer("build", items=1):
+                doc = build(item, category_name, digest, account)
+            if doc is None:
                 continue
+        except Exception:
+            _record_build_failure(engine, writer, model)
+            continue
+        log_item(f"➡️ Saving {content_type}: {doc.name} | ID={doc.stream_id} | URL={doc.stream_url}")
+        await save(doc)
 
-            extension = m.get("container_extension", "mp4")
-            stream_url = f"{XC_URL}/movie/{USERNAME}/{PASSWORD}/{stream_id}.{extension}"
-
-            doc = Movie(
-                tmdb_id=str(m.get("tmdb")) if m.get("tmdb") is not None else None,
-                name=m.get("name"),
-                stream_id=int(stream_id),
-                stream_type="movie",
-                stream_icon=m.get("stream_icon"),
-                stream_url=stream_url,
-                rating=float(m.get("rating", 0)) if m.get("rating") else None,
-                trailer=m.get("trailer"),
-                category_id=str(m.get("category_id")),
-                category_name=m.get("category_name") or category_name,
-                container_extension=extension,
-                is_adult=bool(m.get("is_adult", 0)),
-                added=datetime.fromtimestamp(int(m.get("added", 0)), tz=timezone.utc)
-                if m.get("added")
-                else None,
-            )
 
-            print(f"➡️ Saving movie: {doc.name} | ID={doc.stream_id} | URL={doc.stream_url}")
+def _print_totals(writer):
+    t = writer.totals
+    print(
+        f"📦 {writer.label}: {writer.batches} batches, inserted={t.inserted} "
+        f"modified={t.modified} failed={t.failed}"
+    )
+
+
+# --------------------
+# Movies
+# --------------------
+def build_movie(m: dict, category_name=None, content_hash=None, account=DEFAULT_ACCOUNT):
+    stream_id = m.get("stream_id")
+    if not stream_id:
+        log_item(f"⚠️ Skipping movie without stream_id: {m}")
+        return None
+
+    extension = m.get("container_extension", "mp4")
+    stream_url = account.stream_url("movie", stream_id, extension)
+
+    return with_listing("movie", Movie(
+        provider_id=account.id,
+        tmdb_id=str(m.get("tmdb")) if m.get("tmdb") is not None else None,
+        name=m.get("name"),
+        stream_id=int(stream_id),
+        stream_type="movie",
+        stream_icon=m.get("stream_icon"),
+        stream_url=stream_url,
+        rating=float(m.get("rating", 0)) if m.get("rating") else None,
+        trailer=m.get("trailer"),
+        category_id=str(m.get("category_id")),
+        category_name=m.get("category_name") or category_name,
+        container_extension=extension,
+        is_adult=bool(m.get("is_adult", 0)),
+        added=datetime.fromtimestamp(int(m.get("added", 0)), tz=timezone.utc)
+        if m.get("added")
+        else None,
+        content_hash=content_hash,
+        last_updated=datetime.now(timezone.utc),
+    ))
+
+
+async def fetch_and_sync_movies(category_id: str, engine=None, incremental: bool = False):
+    """
+    Sync one movie category. Pass a SyncEngine (app/utils/sync_engine.py) to
+    route upstream calls through its concurrency/rate limits and hand writes
+    to its writer queue; without one the category gets its own bulk writer.
+    Movies whose content hash matches the stored copy are skipped; with
+    incremental=True so are those whose `added` is unchanged.
+    """
+    fetch = engine.fetch if engine else fetch_with_retry
+    account = _account(engine)
+    url = f"{account.base_api}&action=get_vod_streams&category_id={category_id}"
+    movies = await fetch(url)
+    if movies is None:
+        if engine:
+            engine.record_category_failure("movie")
+        movies = []
+    category_name = await get_category_name(category_id, account.id)
+
+    print(f"📡 Fetching movies for category_id={category_id} ({category_name}) → {len(movies)} items")
+    return await sync_movies(movies, category_id, category_name, engine, incremental)
 
-            await Movie.find_one(Movie.stream_id == doc.stream_id).upsert(
-                {"$set": doc.model_dump(exclude_unset=True)},
-                on_insert=doc,
-            )
-        except Exception as e:
-            print(f"❌ Error saving movie {m.get('name')} (ID={m.get('stream_id')}): {e}")
 
-    print(f"✅ Synced {len(movies)} movies from category {category_id}")
-    return len(movies)
+async def sync_movies(movies: list, category_id: str, category_name=None, engine=None, incremental: bool = False):
+    """Write one category's worth of get_vod_streams items (already fetched)."""
+    writer = None if engine else make_writer(Movie)
+    save = engine.save if engine else writer.add
+
+    total = len(movies)
+    movies = await filter_changed(movies, Movie, f"movies {category_id}", category_name, incremental, engine)
+    await _build_and_save("movie", movies, category_name, engine, writer, save)
+
+    if writer:
+        await writer.flush()
+        _print_totals(writer)
+    print(f"✅ Synced {len(movies)} changed movies from category {category_id}")
+    return total
 
 
 # --------------------
 # Series
 # --------------------
-async def fetch_and_sync_series(category_id: str):
-    url = f"{BASE_API}&action=get_series&category_id={category_id}"
-    series_list = await fetch_with_retry(url) or []
-
-    category = await Category.find_one(Category.category_id == category_id)
-    category_name = category.category_name if category else None
+def build_seasons(series_id, series_info: dict, account=DEFAULT_ACCOUNT):
+    """Season summaries for the series document, plus the Episode documents."""
+    episodes_data = series_info.get("episodes", {})
+    seasons = []
+    episodes = []
+
+    if isinstance(episodes_data, dict):
+        for season_num, eps in episodes_data.items():
+            eps_list = []
+            for e in eps:
+                ep_id = e.get("id")
+                if not ep_id:
+                    log_item(f"⚠️ Skipping episode without id in series {series_id}")
+                    continue
+                extension = e.get("container_extension", "mp4")
+                eps_list.append(
+                    Episode(
+                        provider_id=account.id,
+                        series_id=int(series_id),
+                        season_number=int(season_num),
+                        episode_num=int(e.get("episode_num", 0)),
+                        title=e.get("title"),
+                        stream_id=int(ep_id),
+                        stream_url=account.stream_url("series", ep_id, extension),
+                        added=datetime.fromtimestamp(int(e.get("added", 0)), tz=timezone.utc)
+                        if e.get("added")
+                        else None,
+                    )
+                )
+            log_item(f"   ➡️ Season {season_num}: {len(eps_list)} episodes")
+            seasons.append(Season(season_number=int(season_num), episode_count=len(eps_list)))
+            episodes.extend(eps_list)
+
+    return seasons, episodes
+
+
+def build_series(s: dict, series_info: dict, category_name=None, content_hash=None, account=DEFAULT_ACCOUNT):
+    """Returns (Series, [Episode])."""
+    series_id = s.get("series_id")
+    seasons, episodes = build_seasons(series_id, series_info, account)
+
+    series = Series(
+        provider_id=account.id,
+        series_id=int(series_id),
+        tmdb_id=str(s.get("tmdb")) if s.get("tmdb") is not None else None, 
+        name=s.get("name"),
+        cover=s.get("cover"),
+        plot=s.get("plot"),
+        cast=[c.strip() for c in s.get("cast", "").split(",")] if s.get("cast") else [], 
+        director=s.get("director"),
+        genre=[g.strip() for g in s.get("genre", "").split(",")] if s.get("genre") else [], 
+        release_date=datetime.strptime(s.get("release_date"), "%Y-%m-%d").date() if s.get("release_date") else None, 
+        last_modified=datetime.fromtimestamp(int(s.get("last_modified")), tz=timezone.utc) if s.get("last_modified") else None, 
+        rating=float(s.get("rating", 0)) if s.get("rating") else None,
+        trailer=s.get("youtube_trailer"), 
+        episode_run_time=int(s.get("episode_run_time")) if s.get("episode_run_time") else None, 
+        category_id=str(s.get("category_id")),
+        category_name=s.get("category_name") or category_name,
+        stream_url=None,
+        seasons=seasons,
+        content_hash=content_hash,
+        last_updated=datetime.now(timezone.utc),
+    )
+    return with_listing("series", series), episodes
+
+
+async def _sync_one_series(s: dict, digest, category_name, engine, fetch, save, on_failure):
+    series_id = s.get("series_id")
+    if not series_id:
+        log_item(f"⚠️ Skipping series without series_id: {s}")
+        return
+
+    account = _account(engine)
+    pool = engine.pool if engine else None
+    info_url = f"{account.base_api}&action=get_series_info&series_id={series_id}"
+    # With a build pool the body is decoded in the worker along with the build
+    series_info = await fetch(info_url, raw=True) if pool else await fetch(info_url)
+    if series_info is None:
+        # Keep the stored seasons/episodes rather than blanking them; the
+        # series is still listed upstream, so it must survive the sweep.
+        on_failure()
+        if engine and engine.generation is not None:
+            await mark_seen(series_collection, "series_id", [int(series_id)], engine.generation, account.id)
+        return
+    try:
+        with metrics.timer("build", items=1):
+            if pool:
+                doc, episodes = await pool.build_series(s, series_info, category_name, digest, account)
+                episode_ids = [e.filter["stream_id"] for e in episodes]
+            else:
+                doc, episodes = build_series(s, series_info, category_name, digest, account)
+                episode_ids = [e.stream_id for e in episodes]
+    except Exception:
+        on_failure()
+        return
+
+    log_item(f"➡️ Saving series: {s.get('name')} | ID={series_id} | Episodes={len(episodes)}")
+    for episode in episodes:
+        await save(episode)
+    await save(doc)
+    # Episodes the provider dropped from this series
+    await episodes_collection.delete_many(
+        {"provider_id": account.id, "series_id": int(series_id), "stream_id": {"$nin": episode_ids}}
+    )
+
+
+async def fetch_and_sync_series(category_id: str, engine=None, incremental: bool = False):
+    """
+    Sync one series category. With a SyncEngine every get_series_info call in
+    the category is issued concurrently (bounded by the engine); without one
+    they run one after another as before. get_series_info is only called for
+    series whose content hash (or, with incremental=True, `last_modified`)
+    changed.
+    """
+    fetch = engine.fetch if engine else fetch_with_retry
+    account = _account(engine)
+    url = f"{account.base_api}&action=get_series&category_id={category_id}"
+    series_list = await fetch(url)
+    if series_list is None:
+        if engine:
+            engine.record_category_failure("series")
+        series_list = []
+    category_name = await get_category_name(category_id, account.id)
 
     print(f"📡 Fetching series for category_id={category_id} ({category_name}) → {len(series_list)} items")
+    return await sync_series(series_list, category_id, category_name, engine, incremental)
 
-    for s in series_list:
-        try:
-            series_id = s.get("series_id")
-            if not series_id:
-                print(f"⚠️ Skipping series without series_id: {s}")
-                continue
 
-            info_url = f"{BASE_API}&action=get_series_info&series_id={series_id}"
-            series_info = await fetch_with_retry(info_url) or {}
-            episodes_data = series_info.get("episodes", {})
-            seasons = []
-
-            if isinstance(episodes_data, dict):
-                for season_num, eps in episodes_data.items():
-                    eps_list = []
-                    for e in eps:
-                        ep_id = e.get("id")
-                        if not ep_id:
-                            print(f"⚠️ Skipping episode without id in series {series_id}")
-                            continue
-                        extension = e.get("container_extension", "mp4")
-                        eps_list.append(
-                            Episode(
-                                episode_num=int(e.get("episode_num", 0)),
-                                title=e.get("title"),
-                                stream_id=int(ep_id),
-                                stream_url=f"{XC_URL}/series/{USERNAME}/{PASSWORD}/{ep_id}.{extension}",
-                                added=datetime.fromtimestamp(int(e.get("added", 0)), tz=timezone.utc)
-                                if e.get("added")
-                                else None,
-                            )
-                        )
-                    print(f"   ➡️ Season {season_num}: {len(eps_list)} episodes")
-                    seasons.append(Season(season_number=int(season_num), episodes=eps_list))
-
-            doc = Series(
-                series_id=int(series_id),
-                tmdb_id=str(s.get("tmdb")) if s.get("tmdb") is not None else None, 
-                name=s.get("name"),
-                cover=s.get("cover"),
-                plot=s.get("plot"),
-                cast=[c.strip() for c in s.get("cast", "").split(",")] if s.get("cast") else [], 
-                director=s.get("director"),
-                genre=[g.strip() for g in s.get("genre", "").split(",")] if s.get("genre") else [], 
-                release_date=datetime.strptime(s.get("release_date"), "%Y-%m-%d").date() if s.get("release_date") else None, 
-                last_modified=datetime.fromtimestamp(int(s.get("last_modified")), tz=timezone.utc) if s.get("last_modified") else None, 
-                rating=float(s.get("rating", 0)) if s.get("rating") else None,
-                trailer=s.get("youtube_trailer"), 
-                episode_run_time=int(s.get("episode_run_time")) if s.get("episode_run_time") else None, 
-                category_id=str(s.get("category_id")),
-                category_name=s.get("category_name") or category_name,
-                stream_url=None,
-                seasons=seasons,
-            )
+async def sync_series(series_list: list, category_id: str, category_name=None, engine=None, incremental: bool = False):
+    """Fetch get_series_info for, and write, one category's worth of get_series items."""
+    fetch = engine.fetch if engine else fetch_with_retry
+    writers = None if engine else {Series: make_writer(Series), Episode: make_writer(Episode)}
+    save = engine.save if engine else lambda doc: writers[type(doc)].add(doc)
+    on_failure = lambda: _record_build_failure(engine, writers and writers[Series], Series)
 
-            print(f"➡️ Saving series: {doc.name} | ID={doc.series_id} | Seasons={len(seasons)}")
+    total = len(series_list)
+    # Unchanged series never reach get_series_info
+    series_list = await filter_changed(series_list, Series, f"series {category_id}", category_name, incremental, engine)
 
-            await Series.find_one(Series.series_id == doc.series_id).upsert(
-                {"$set": doc.model_dump(exclude_unset=True)},
-                on_insert=doc,
-            )
-        except Exception as e:
-            print(f"❌ Error saving series {s.get('name')} (ID={s.get('series_id')}): {e}")
+    if engine:
+        await asyncio.gather(
+            *(_sync_one_series(s, digest, category_name, engine, fetch, save, on_failure) for s, digest in series_list)
+        )
+    else:
+        for s, digest in series_list:
+            await _sync_one_series(s, digest, category_name, engine, fetch, save, on_failure)
 
-    print(f"✅ Synced {len(series_list)} series from category {category_id}")
-    return len(series_list)
+    if writers:
+        for writer in writers.values():
+            await writer.flush()
+            _print_totals(writer)
+    print(f"✅ Synced {len(series_list)} changed series from category {category_id}")
+    return total
 
 
 # --------------------
 # Live Channels
 # --------------------
-async def fetch_and_sync_live_channels(category_id: str):
-    url = f"{BASE_API}&action=get_live_streams&category_id={category_id}"
-    channels = await fetch_with_retry(url) or []
-
-    category = await Category.find_one(Category.category_id == category_id)
-    category_name = category.category_name if category else None
+def build_live_channel(c: dict, category_name=None, content_hash=None, account=DEFAULT_ACCOUNT):
+    stream_id = c.get("stream_id")
+    if not stream_id:
+        log_item(f"⚠️ Skipping channel without stream_id: {c}")
+        return None
+
+    stream_url = account.stream_url("live", stream_id, "ts")
+
+    return with_listing("live", LiveChannel(
+        provider_id=account.id,
+        stream_id=int(stream_id),
+        name=c.get("name"),
+        stream_type="live",
+        stream_icon=c.get("stream_icon"),
+        stream_url=stream_url,
+        epg_channel_id=c.get("epg_channel_id"),
+        category_id=str(c.get("category_id")),
+        category_name=c.get("category_name") or category_name,
+        is_adult=bool(c.get("is_adult", 0)),
+        tv_archive=c.get("tv_archive"),
+        tv_archive_duration=c.get("tv_archive_duration"),
+        direct_source=c.get("direct_source"),
+        added=datetime.fromtimestamp(int(c.get("added", 0)), tz=timezone.utc)
+        if c.get("added")
+        else None,
+        content_hash=content_hash,
+        last_updated=datetime.now(timezone.utc),
+    ))
+
+
+async def fetch_and_sync_live_channels(category_id: str, engine=None, incremental: bool = False):
+    fetch = engine.fetch if engine else fetch_with_retry
+    account = _account(engine)
+    url = f"{account.base_api}&action=get_live_streams&category_id={category_id}"
+    channels = await fetch(url)
+    if channels is None:
+        if engine:
+            engine.record_category_failure("live")
+        channels = []
+    category_name = await get_category_name(category_id, account.id)
 
     print(f"📡 Fetching live channels for category_id={category_id} ({category_name}) → {len(channels)} items")
+    return await sync_live_channels(channels, category_id, category_name, engine, incremental)
 
-    for c in channels:
-        try:
-            stream_id = c.get("stream_id")
-            if not stream_id:
-                print(f"⚠️ Skipping channel without stream_id: {c}")
-                continue
 
-            stream_url = f"{XC_URL}/live/{USERNAME}/{PASSWORD}/{stream_id}.ts"
-
-            doc = LiveChannel(
-                stream_id=int(stream_id),
-                name=c.get("name"),
-                stream_type="live",
-                stream_icon=c.get("stream_icon"),
-                stream_url=stream_url,
-                epg_channel_id=c.get("epg_channel_id"),
-                category_id=str(c.get("category_id")),
-                category_name=c.get("category_name") or category_name,
-                is_adult=bool(c.get("is_adult", 0)),
-                tv_archive=c.get("tv_archive"),
-                tv_archive_duration=c.get("tv_archive_duration"),
-                direct_source=c.get("direct_source"),
-                added=datetime.fromtimestamp(int(c.get("added", 0)), tz=timezone.utc)
-                if c.get("added")
-                else None,
-            )
+async def sync_live_channels(channels: list, category_id: str, category_name=None, engine=None, incremental: bool = False):
+    """Write one category's worth of get_live_streams items (already fetched)."""
+    writer = None if engine else make_writer(LiveChannel)
+    save = engine.save if engine else writer.add
 
-            print(f"➡️ Saving channel: {doc.name} | ID={doc.stream_id} | URL={doc.stream_url}")
+    total = len(channels)
+    channels = await filter_changed(channels, LiveChannel, f"channels {category_id}", category_name, incremental, engine)
+    await _build_and_save("live", channels, category_name, engine, writer, save)
+
+    if writer:
+        await writer.flush()
+        _print_totals(writer)
+    print(f"✅ Synced {len(channels)} changed live channels from category {category_id}")
+    return total
 
-            await LiveChannel.find_one(LiveChannel.stream_id == doc.stream_id).upsert(
-                {"$set": doc.model_dump(exclude_unset=True)},
-                on_insert=doc,
-            )
-        except Exception as e:
-            print(f"❌ Error saving channel {c.get('name')} (ID={c.get('stream_id')}): {e}")
 
-    print(f"✅ Synced {len(channels)} live channels from category {category_id}")
-    return len(channels)
+# --------------------
+# Full-catalog lists
+# --------------------
+# Unfiltered list action per content type (one call returns every category)
+LIST_ACTIONS = {
+    "movie": "get_vod_streams",
+    "series": "get_series",
+    "live": "get_live_streams",
+}
+
+CONTENT_MODELS = {
+    "movie": Movie,
+    "series": Series,
+    "live": LiveChannel,
+}
+
+# List item → document builders (also run inside build worker processes)
+ITEM_BUILDERS = {
+    "movie": build_movie,
+    "live": build_live_channel,
+}
+
+ITEM_SYNCERS = {
+    "movie": sync_movies,
+    "series": sync_series,
+    "live": sync_live_channels,
+}
@@ -6,6 +6,8 @@ import asyncio
 import logging
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from app.utils.providers import XC_URL, USERNAME, PASSWORD
+
 logger = logging.getLogger(__name__)
 
 # MongoDB connection
@@ -13,10 +15,6 @@ client = AsyncIOMotorClient("mongodb://localhost:27017")
 db = client["upcomes_tv"]
 content_collection = db["content"]
 
-XC_URL = "http://slytv.uk:80"
-USERNAME = "yWYKAuE7"
-PASSWORD = "g1hGECF"
-
 BASE_API = f"{XC_URL}/player_api.php?username={USERNAME}&password={PASSWORD}"
 
 
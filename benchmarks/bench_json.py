@@ -0,0 +1,262 @@
+# backend/benchmarks/bench_json.py
+"""
+Benchmark response serialisation: FastAPI's default path (jsonable_encoder
++ json.dumps) against the pre-shaped orjson path (app/utils/fast_json.py).
+
+Payloads are synthetic but shaped like the real routes: a catalog page,
+search results, watch history, favourites and continue watching. For
+continue watching the default path encodes whole Series models, as the
+route did before. Reports p50/p99 latency, response bytes and MB/sec per
+payload and path:
+
+    python -m benchmarks.bench_json --iterations 5000
+    python -m benchmarks.bench_json --http          # through FastAPI over ASGI
+    python -m benchmarks.bench_json --search-items 200 --continue-items 50
+
+No Mongo needed. --http also needs httpx.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.series import Series, Season
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse, fast_response
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+# ---- synthetic payloads ----
+def _catalog(n: int) -> list:
+    return [
+        {"_id": str(ObjectId()), "name": f"Movie {i}", "stream_icon": f"https://img.example/m/{i}.jpg", "type": "movie"}
+        for i in range(n)
+    ]
+
+
+def _search(n: int) -> dict:
+    labels = ["movie", "series", "live_channel"]
+    items = [
+        {
+            "_id": str(ObjectId()),
+            "name": f"Result {i}",
+            "stream_icon": f"https://img.example/s/{i}.jpg",
+            "type": labels[i % 3],
+            "is_favourite": False,
+        }
+        for i in range(n)
+    ]
+    return {"total": n, "limit": n, "items": items, "partial": []}
+
+
+def _history(n: int) -> dict:
+    return {"history": [
+        {
+            "history_id": str(ObjectId()),
+            "watched_at": NOW - timedelta(hours=i),
+            "progress": 1200.5 + i,
+            "content_type": "movie",
+            "content": {"_id": str(ObjectId()), "name": f"Movie {i}", "stream_icon": f"https://img.example/m/{i}.jpg"},
+        }
+        for i in range(n)
+    ]}
+
+
+def _favourites(n: int) -> dict:
+    content = [
+        {
+            "name": f"Series {i}",
+            "cover": f"https://img.example/c/{i}.jpg",
+            "stream_type": "series",
+            "favorite_id": str(ObjectId()),
+            "content_id": str(ObjectId()),
+            "added_at": (NOW - timedelta(days=i)).isoformat(),
+            "is_favorite": True,
+        }
+        for i in range(n)
+    ]
+    return {"user_id": "bench", "content_type": "all", "count": n, "content": content, "partial": []}
+
+
+def _series_doc(i: int, seasons: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "series_id": 100000 + i,
+        "tmdb_id": str(5000 + i),
+        "name": f"Series {i}",
+        "cover": f"https://img.example/c/{i}.jpg",
+        "plot": "A long synopsis of the show. " * 12,
+        "cast": [f"Actor {a}" for a in range(12)],
+        "director": "Someone",
+        "genre": ["Drama", "Thriller"],
+        "release_date": NOW - timedelta(days=1000 + i),
+        "last_modified": NOW - timedelta(days=i),
+        "rating": 7.5,
+        "trailer": "abcdefghijk",
+        "episode_run_time": 45,
+        "category_id": str(i % 50),
+        "category_name": f"Category {i % 50}",
+        "stream_url": None,
+        "seasons": [{"season_number": s + 1, "episode_count": 10} for s in range(seasons)],
+        "playable": True,
+        "image": f"https://img.example/c/{i}.jpg",
+        "last_updated": NOW,
+    }
+
+
+def _continue(n: int, seasons: int):
+    """(default-path payload with Series models, fast-path payload with raw documents)."""
+    docs = [_series_doc(i, seasons) for i in range(n)]
+
+    def entry(content):
+        return {
+            "content_id": str(ObjectId()),
+            "content_type": "series",
+            "content": content,
+            "progress": 1500.0,
+            "duration": 2700.0,
+            "last_watched": NOW,
+        }
+
+    models = []
+    for doc in docs:
+        fields = {k: v for k, v in doc.items() if k != "_id"}
+        fields["seasons"] = [Season(**s) for s in doc["seasons"]]
+        models.append(Series.model_construct(id=doc["_id"], **fields))
+    raw = [{**doc, "_id": str(doc["_id"])} for doc in docs]
+    return {"continue_watching": [entry(m) for m in models]}, {"continue_watching": [entry(r) for r in raw]}
+
+
+def build_payloads(args) -> dict:
+    """name -> (default-path content, fast-path content)"""
+    catalog = _catalog(args.page_items)
+    search = _search(args.search_items)
+    history = _history(args.history_items)
+    favourites = _favourites(args.favourite_items)
+    return {
+        "catalog": (catalog, catalog),
+        "search": (search, search),
+        "history": (history, history),
+        "favourites": (favourites, favourites),
+        "continue": _continue(args.continue_items, args.seasons),
+    }
+
+
+# ---- measurement ----
+def _summary(name: str, path: str, timings: list, size: int) -> dict:
+    timings.sort()
+    total = sum(timings)
+    return {
+        "payload": name,
+        "path": path,
+        "bytes": size,
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, 3),
+        "mb_per_sec": round(size * len(timings) / total / 1e6, 1) if total else None,
+    }
+
+
+def _encode_default(content) -> bytes:
+    # What FastAPI does with a returned dict: jsonable_encoder, then JSONResponse.render
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _encode_fast(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def bench_encode(payloads: dict, iterations: int, warmup: int) -> list:
+    results = []
+    for name, (default_content, fast_content) in payloads.items():
+        for path, encode, content in (("default", _encode_default, default_content), ("fast", _encode_fast, fast_content)):
+            for _ in range(warmup):
+                encode(content)
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                body = encode(content)
+                timings.append(time.perf_counter() - started)
+            results.append(_summary(name, path, timings, len(body)))
+    return results
+
+
+def _endpoint(content, fast: bool):
+    async def endpoint():
+        return fast_response(content) if fast else content
+    return endpoint
+
+
+def _bench_app(payloads: dict) -> FastAPI:
+    app = FastAPI()
+    for name, (default_content, fast_content) in payloads.items():
+        app.add_api_route(f"/default/{name}", _endpoint(default_content, False), methods=["GET"])
+        app.add_api_route(f"/fast/{name}", _endpoint(fast_content, True), methods=["GET"])
+    return app
+
+
+async def bench_http(payloads: dict, iterations: int, warmup: int) -> list:
+    import httpx
+
+    transport = httpx.ASGITransport(app=_bench_app(payloads))
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in payloads:
+            for path in ("default", "fast"):
+                url = f"/{path}/{name}"
+                for _ in range(warmup):
+                    await client.get(url)
+                timings = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    res = await client.get(url)
+                    timings.append(time.perf_counter() - started)
+                res.raise_for_status()
+                results.append(_summary(name, path, timings, len(res.content)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--http", action="store_true", help="measure full requests through FastAPI over ASGI")
+    parser.add_argument("--page-items", type=int, default=40)
+    parser.add_argument("--search-items", type=int, default=100)
+    parser.add_argument("--history-items", type=int, default=20)
+    parser.add_argument("--favourite-items", type=int, default=100)
+    parser.add_argument("--continue-items", type=int, default=20)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    if fast_json.orjson is None:
+        raise SystemExit("orjson is not installed: pip install orjson")
+    fast_json.FAST_JSON = True
+
+    payloads = build_payloads(args)
+    if args.http:
+        results = asyncio.run(bench_http(payloads, args.iterations, args.warmup))
+    else:
+        results = bench_encode(payloads, args.iterations, args.warmup)
+
+    print(f"\n{'payload':<12}{'path':<9}{'bytes':>10}{'p50 ms':>10}{'p99 ms':>10}{'MB/s':>10}")
+    for r in results:
+        print(
+            f"{r['payload']:<12}{r['path']:<9}{r['bytes']:>10}{r['p50_ms']:>10}"
+            f"{r['p99_ms']:>10}{r['mb_per_sec']:>10}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# backend/benchmarks/bench_sync.py
+"""
+Benchmark the fetch_and_sync_* paths against the local fake Xtream server.
+
+Starts benchmarks/fake_xtream.py in a subprocess (so its memory is not
+counted), points the sync code at it, writes into a scratch Mongo database
+and reports wall time, items/sec and peak memory per content type:
+
+    python -m benchmarks.bench_sync --movies 100000 --series 20000 --seasons 10
+    python -m benchmarks.bench_sync --strategy per_category --latency-ms 50
+    python -m benchmarks.bench_sync --incremental --mutate 0.01   # steady-state run
+
+Needs a reachable Mongo (MONGO_URL); the scratch DB (MONGO_DB, default
+upcomes_tv_bench) is dropped first unless --keep is given.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_server(args, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "FAKE_CATEGORIES": str(args.categories),
+        "FAKE_MOVIES": str(args.movies),
+        "FAKE_SERIES": str(args.series),
+        "FAKE_SEASONS": str(args.seasons),
+        "FAKE_EPISODES": str(args.episodes),
+        "FAKE_CHANNELS": str(args.channels),
+        "FAKE_LATENCY_MS": str(args.latency_ms),
+        "FAKE_JITTER_MS": str(args.jitter_ms),
+        "FAKE_ERROR_RATE": str(args.error_rate),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.fake_xtream:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Fake Xtream server did not start")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+async def run(args, base_url: str) -> list:
+    # Configure the app before importing it: XC_URL/MONGO_DB are read at import
+    os.environ["XC_URL"] = base_url
+    # The fake server accepts any account; the app insists on one being set
+    os.environ.setdefault("XC_USERNAME", "bench")
+    os.environ.setdefault("XC_PASSWORD", "bench")
+    os.environ.setdefault("MONGO_DB", "upcomes_tv_bench")
+
+    import httpx
+    from app.db import init_db, client, MONGO_DB
+    from app.utils.sync_engine import SyncEngine
+    from app.utils.sync_workers import BuildPool
+    from app.utils.sync_metrics import metrics
+    from app.utils.upstream_client import close_upstream_client
+    from app.utils.xtream_service import fetch_and_sync_categories
+
+    if not args.keep:
+        await client.drop_database(MONGO_DB)
+    await init_db()
+    for ct in args.types:
+        await fetch_and_sync_categories(ct)
+
+    if args.incremental:
+        # Populate once, then change a fraction upstream; the timed run is the delta
+        async with SyncEngine() as engine:
+            for ct in args.types:
+                await engine.run(ct, strategy=args.strategy)
+        async with httpx.AsyncClient() as http:
+            await http.post(f"{base_url}/_mutate", params={"fraction": args.mutate})
+
+    pool = BuildPool(args.processes) if args.processes else None
+    results = []
+    for ct in args.types:
+        metrics.reset()
+        tracemalloc.start()
+        started = time.perf_counter()
+        async with SyncEngine(concurrency=args.concurrency, rate_per_host=args.rate, pool=pool) as engine:
+            items = await engine.run(ct, incremental=args.incremental, strategy=args.strategy)
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot = metrics.snapshot()
+        changes = {"changed": 0, "unchanged": 0}
+        for counts in snapshot["changes"].values():
+            changes["changed"] += counts["changed"]
+            changes["unchanged"] += counts["unchanged"]
+        results.append({
+            "content_type": ct,
+            "strategy": args.strategy,
+            "processes": args.processes,
+            "incremental": args.incremental,
+            "items": items,
+            "written": snapshot["stages"]["write"]["items"],
+            **changes,
+            "wall_seconds": round(wall, 2),
+            "items_per_sec": round(items / wall, 1) if wall else 0.0,
+            "peak_traced_mb": round(peak / (1024 * 1024), 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "stages": snapshot["stages"],
+        })
+
+    if pool:
+        pool.close()
+    await close_upstream_client()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--types", default="movie,series,live", type=lambda v: v.split(","))
+    parser.add_argument("--strategy", default="stream", choices=["stream", "full", "per_category"])
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--mutate", type=float, default=0.01, help="fraction changed upstream for --incremental")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=0, help="build worker processes, 0 = in-process")
+    parser.add_argument("--rate", type=float, default=0, help="requests/sec per host, 0 = unlimited")
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--movies", type=int, default=100000)
+    parser.add_argument("--series", type=int, default=20000)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--keep", action="store_true", help="don't drop the bench DB first")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = start_fake_server(args, port)
+    try:
+        results = asyncio.run(run(args, f"http://127.0.0.1:{port}"))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"\n{'type':<8}{'items':>10}{'wall s':>10}{'items/s':>12}{'peak MB':>10}{'rss MB':>10}")
+    for r in results:
+        print(
+            f"{r['content_type']:<8}{r['items']:>10}{r['wall_seconds']:>10}"
+            f"{r['items_per_sec']:>12}{r['peak_traced_mb']:>10}{r['peak_rss_mb']:>10}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
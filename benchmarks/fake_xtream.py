@@ -0,0 +1,231 @@
+# backend/benchmarks/fake_xtream.py
+"""
+Local stand-in for an Xtream Codes `player_api.php`, for benchmarking and
+regression-testing ingestion without touching the real provider.
+
+Serves a deterministic synthetic catalog of configurable size with
+injectable latency and error rates:
+
+    FAKE_MOVIES=100000 FAKE_SERIES=20000 FAKE_SEASONS=10 FAKE_LATENCY_MS=50 \\
+        uvicorn benchmarks.fake_xtream:app --port 8800
+
+then point the app at it with XC_URL=http://127.0.0.1:8800 (any
+XC_USERNAME/XC_PASSWORD is accepted, but both must be set).
+
+Env knobs:
+    FAKE_CATEGORIES      categories per content type (default 200)
+    FAKE_MOVIES          movies (100000)
+    FAKE_SERIES          series (20000)
+    FAKE_SEASONS         seasons per series (10)
+    FAKE_EPISODES        episodes per season (10)
+    FAKE_CHANNELS        live channels (5000)
+    FAKE_LATENCY_MS      added latency per request (0)
+    FAKE_JITTER_MS       uniform +/- jitter on top of the latency (0)
+    FAKE_ERROR_RATE      fraction of requests answered with a 5xx/429 (0.0)
+    FAKE_FIXTURES        directory of recorded payloads (benchmarks/fixtures);
+                         their first item per action is used as the shape
+                         template, so synthetic items carry the same fields
+
+POST /_mutate?fraction=0.01 bumps added/last_modified on that fraction of
+items, for measuring incremental syncs.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Query, Response
+
+CATEGORIES = int(os.getenv("FAKE_CATEGORIES", "200"))
+MOVIES = int(os.getenv("FAKE_MOVIES", "100000"))
+SERIES = int(os.getenv("FAKE_SERIES", "20000"))
+SEASONS = int(os.getenv("FAKE_SEASONS", "10"))
+EPISODES = int(os.getenv("FAKE_EPISODES", "10"))
+CHANNELS = int(os.getenv("FAKE_CHANNELS", "5000"))
+LATENCY_MS = float(os.getenv("FAKE_LATENCY_MS", "0"))
+JITTER_MS = float(os.getenv("FAKE_JITTER_MS", "0"))
+ERROR_RATE = float(os.getenv("FAKE_ERROR_RATE", "0"))
+FIXTURES = Path(os.getenv("FAKE_FIXTURES", Path(__file__).parent / "fixtures"))
+
+BASE_TS = 1700000000
+HOST = "http://fake-xtream.local"
+
+app = FastAPI(title="Fake Xtream")
+
+# Catalog generation and the generation each mutated id was last bumped in
+state = {"generation": 0, "bumps": {}}
+_cache = {}  # (action, category_id, generation) -> bytes
+
+
+def _template(action: str) -> dict:
+    path = FIXTURES / f"{action}.json"
+    if path.exists():
+        data = json.loads(path.read_text())
+        if isinstance(data, list) and data:
+            return dict(data[0])
+    return {}
+
+
+TEMPLATES = {
+    action: _template(action)
+    for action in ("get_vod_streams", "get_series", "get_live_streams")
+}
+
+
+def _stamp(item_id: int) -> int:
+    return BASE_TS + item_id + 86400 * state["bumps"].get(item_id, 0)
+
+
+def _category(i: int, offset: int) -> str:
+    return str(offset + i % CATEGORIES)
+
+
+def categories(offset: int, label: str) -> list:
+    return [
+        {"category_id": str(offset + i), "category_name": f"{label} {i}", "parent_id": 0}
+        for i in range(CATEGORIES)
+    ]
+
+
+def movie(i: int) -> dict:
+    stream_id = 100000 + i
+    return {
+        **TEMPLATES["get_vod_streams"],
+        "num": i + 1,
+        "name": f"Movie {i}",
+        "stream_type": "movie",
+        "stream_id": stream_id,
+        "stream_icon": f"{HOST}/img/m{stream_id}.jpg" if i % 10 else "",
+        "rating": str(round((i % 100) / 10, 1)),
+        "added": str(_stamp(stream_id)),
+        "is_adult": 0,
+        "category_id": _category(i, 1000),
+        "container_extension": "mkv" if i % 3 else "mp4",
+        "tmdb": str(500000 + i),
+        "trailer": "",
+    }
+
+
+def series(i: int) -> dict:
+    series_id = 200000 + i
+    return {
+        **TEMPLATES["get_series"],
+        "num": i + 1,
+        "name": f"Series {i}",
+        "series_id": series_id,
+        "cover": f"{HOST}/img/s{series_id}.jpg" if i % 10 else "",
+        "plot": f"Plot of series {i}",
+        "cast": "Actor A, Actor B",
+        "director": "Director X",
+        "genre": "Drama, Mystery",
+        "release_date": "2020-01-01",
+        "last_modified": str(_stamp(series_id)),
+        "rating": str(round((i % 100) / 10, 1)),
+        "youtube_trailer": "",
+        "episode_run_time": "45",
+        "category_id": _category(i, 2000),
+        "tmdb": str(700000 + i),
+    }
+
+
+def series_info(series_id: int) -> dict:
+    episodes = {}
+    for season in range(1, SEASONS + 1):
+        episodes[str(season)] = [
+            {
+                "id": str(series_id * 1000 + season * 100 + ep),
+                "episode_num": ep,
+                "title": f"S{season:02d}E{ep:02d}",
+                "container_extension": "mkv",
+                "added": str(_stamp(series_id)),
+                "season": season,
+            }
+            for ep in range(1, EPISODES + 1)
+        ]
+    return {"seasons": [], "info": {"name": f"Series {series_id - 200000}"}, "episodes": episodes}
+
+
+def channel(i: int) -> dict:
+    stream_id = 300000 + i
+    return {
+        **TEMPLATES["get_live_streams"],
+        "num": i + 1,
+        "name": f"Channel {i}",
+        "stream_type": "live",
+        "stream_id": stream_id,
+        "stream_icon": f"{HOST}/img/c{stream_id}.png" if i % 10 else "",
+        "epg_channel_id": f"ch{i}.fake",
+        "added": str(_stamp(stream_id)),
+        "is_adult": "0",
+        "category_id": _category(i, 3000),
+        "tv_archive": 0,
+        "tv_archive_duration": 0,
+        "direct_source": "",
+    }
+
+
+LISTS = {
+    "get_vod_streams": (MOVIES, movie),
+    "get_series": (SERIES, series),
+    "get_live_streams": (CHANNELS, channel),
+}
+
+
+def _list_payload(action: str, category_id) -> bytes:
+    key = (action, category_id, state["generation"])
+    if key not in _cache:
+        count, build = LISTS[action]
+        if category_id is None:
+            items = [build(i) for i in range(count)]
+        else:
+            # Items are assigned round-robin, so a category is an arithmetic slice
+            offset = {"get_vod_streams": 1000, "get_series": 2000, "get_live_streams": 3000}[action]
+            first = int(category_id) - offset
+            items = [build(i) for i in range(first, count, CATEGORIES)] if 0 <= first < CATEGORIES else []
+        _cache[key] = json.dumps(items).encode()
+    return _cache[key]
+
+
+@app.get("/player_api.php")
+async def player_api(
+    action: str = Query(None),
+    category_id: str = Query(None),
+    series_id: int = Query(None),
+    username: str = Query(None),
+    password: str = Query(None),
+):
+    if LATENCY_MS or JITTER_MS:
+        delay = LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        return Response(status_code=random.choice([500, 502, 503, 429]))
+
+    if action == "get_vod_categories":
+        body = json.dumps(categories(1000, "Movies")).encode()
+    elif action == "get_series_categories":
+        body = json.dumps(categories(2000, "Series")).encode()
+    elif action == "get_live_categories":
+        body = json.dumps(categories(3000, "Live")).encode()
+    elif action in LISTS:
+        body = _list_payload(action, category_id)
+    elif action == "get_series_info" and series_id is not None:
+        body = json.dumps(series_info(series_id)).encode()
+    else:
+        body = json.dumps({"user_info": {"auth": 1, "username": username}, "server_info": {}}).encode()
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/_mutate")
+async def mutate(fraction: float = Query(0.01, ge=0, le=1)):
+    """Bump timestamps on a random fraction of every list (new catalog generation)."""
+    rng = random.Random(time.time())
+    state["generation"] += 1
+    mutated = 0
+    for start, count in ((100000, MOVIES), (200000, SERIES), (300000, CHANNELS)):
+        for i in rng.sample(range(count), int(count * fraction)):
+            state["bumps"][start + i] = state["generation"]
+            mutated += 1
+    _cache.clear()
+    return {"generation": state["generation"], "mutated": mutated}
@@ -0,0 +1,55 @@
+# backend/benchmarks/record_fixtures.py
+"""
+Record a small sample of real provider responses into benchmarks/fixtures/
+so the fake server's synthetic items carry the provider's exact field set.
+
+    XC_URL=... XC_USERNAME=... XC_PASSWORD=... python -m benchmarks.record_fixtures --items 5
+
+Only the first --items entries of each list are kept; credentials never
+appear in the payloads, but review the files before committing them.
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+
+from app.utils.xtream_service import BASE_API
+
+ACTIONS = [
+    "get_vod_categories",
+    "get_series_categories",
+    "get_live_categories",
+    "get_vod_streams",
+    "get_series",
+    "get_live_streams",
+]
+
+
+async def record(out: Path, items: int):
+    out.mkdir(parents=True, exist_ok=True)
+    async with httpx.AsyncClient(timeout=120) as client:
+        series_id = None
+        for action in ACTIONS:
+            res = await client.get(f"{BASE_API}&action={action}")
+            res.raise_for_status()
+            data = res.json()[:items]
+            (out / f"{action}.json").write_text(json.dumps(data, indent=2))
+            print(f"📼 {action}: {len(data)} items")
+            if action == "get_series" and data:
+                series_id = data[0].get("series_id")
+
+        if series_id:
+            res = await client.get(f"{BASE_API}&action=get_series_info&series_id={series_id}")
+            res.raise_for_status()
+            (out / "get_series_info.json").write_text(json.dumps(res.json(), indent=2))
+            print(f"📼 get_series_info: series {series_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent / "fixtures")
+    parser.add_argument("--items", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(record(args.out, args.items))
@@ -2,17 +2,15 @@
 import logging
 from fastapi import FastAPI
 from app.db import init_db
-from app.utils.xtream_service import (
-    fetch_and_sync_categories,
-    fetch_and_sync_movies,
-    fetch_and_sync_series,
-    fetch_and_sync_live_channels,
-)
+from app.utils.upstream_client import close_upstream_client
+from app.utils.sync_workers import close_build_pool
+from app.utils.sync_scheduler import scheduler, SyncAlreadyRunning
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.models.category import Category
 import aiohttp
 from fastapi import Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse
 import httpx
 import logging
 import os
@@ -38,15 +36,21 @@ logger = logging.getLogger("main")
 
 # Import routers
 from app.routes import auth, favourite, forgot_password, live_channels, movie, profile, payment, recommendation, series, categories
-from app.routes import watch_history, continue_watching, search
+from app.routes import watch_history, continue_watching, search, sync, metrics, home
 
-app = FastAPI(title="Upcomes TV Backend")
+# FAST_JSON=1: orjson for every JSON response (app/utils/fast_json.py)
+app = FastAPI(
+    title="Upcomes TV Backend",
+    default_response_class=FastJSONResponse if fast_json.enabled() else JSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # for testing; restrict later
     allow_credentials=True,
     allow_methods=["*"],  # <– THIS handles OPTIONS requests!
     allow_headers=["*"],
+    # Keyset pagination cursor and conditional request validators (app/utils/response_cache.py)
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -59,36 +63,15 @@ async def on_startup():
     await init_db()
     logger.info("DB initialized.")
 
-    try:
-        # 1) Fetch all categories from Xtream
-        #await fetch_and_sync_categories("movie")
-        #await fetch_and_sync_categories("series")
-        #await fetch_and_sync_categories("live")
-
-        # 2) Get all categories from DB and sync their content
-
-        # # Movies
-        # movie_cats = await Category.find().to_list()
-        # for cat in movie_cats:
-        #     logger.info(f"🎬 Syncing movies for category: {cat.category_name} ({cat.category_id})")
-        #     await fetch_and_sync_movies(cat.category_id)
-
-        # # Series
-        # series_cats = await Category.find().to_list()
-        # for cat in series_cats:
-        #     logger.info(f"📺 Syncing series for category: {cat.category_name} ({cat.category_id})")
-        #     await fetch_and_sync_series(cat.category_id)
+    # Background sync jobs: resumes an interrupted job and runs the schedule
+    # (SYNC_INTERVAL_MINUTES); see /sync/trigger, /sync/status, /sync/cancel
+    await scheduler.start()
 
-        # # Live Channels
-        # live_cats = await Category.find().to_list()
-        # for cat in live_cats:
-        #     logger.info(f"📡 Syncing live channels for category: {cat.category_name} ({cat.category_id})")
-        #     await fetch_and_sync_live_channels(cat.category_id)
-
-        logger.info("✅ All content synced successfully.")
-
-    except Exception as e:
-        logger.error(f"Content sync failed: {e}")
+@app.on_event("shutdown")
+async def on_shutdown():
+    await scheduler.stop()
+    close_build_pool()
+    await close_upstream_client()
 
 # ---------- Routers ----------
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
@@ -104,23 +87,19 @@ app.include_router(movie.router, prefix="/movies", tags=["Movies"])
 app.include_router(series.router, prefix="/series", tags=["Series"])
 app.include_router(live_channels.router, prefix="/channels", tags=["Channels"])
 app.include_router(categories.router, prefix="/categories", tags=["Categories"])
+app.include_router(sync.router, prefix="/sync", tags=["Sync"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+app.include_router(home.router, prefix="/home", tags=["Home"])
 
 @app.get("/fetch-series")
-async def save_series_again():
+async def save_series_again(incremental: bool = False):
+    """Kick off a background series sync; poll /sync/status for progress."""
     try:
-        await fetch_and_sync_categories("series")
-        # Series
-        series_cats = await Category.find().to_list()
-        for cat in series_cats:
-            logger.info(f"📺 Syncing series for category: {cat.category_name} ({cat.category_id})")
-            await fetch_and_sync_series(cat.category_id)
-
-
-
-        logger.info("✅ All content synced successfully.")
-
-    except Exception as e:
-        logger.error(f"Content sync failed: {e}")
+        job = await scheduler.trigger(["series"], incremental=incremental)
+        logger.info(f"📺 Series sync job {job.id} started")
+        return {"status": "started", "job_id": str(job.id)}
+    except SyncAlreadyRunning as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 # ---------- Root ----------
 @app.get("/")
@@ -0,0 +1,112 @@
+# backend/tests/test_bulk_writer.py
+import asyncio
+from typing import Optional
+
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+
+from app.utils.bulk_writer import BulkUpsertWriter, PreparedUpsert, upsert_operation, upsert_spec
+
+
+class Movie(BaseModel):
+    stream_id: int
+    name: Optional[str] = None
+    rating: float = 0.0
+
+
+class ProviderMovie(Movie):
+    provider_id: Optional[str] = None
+
+
+class FakeCollection:
+    name = "movies"
+
+    def __init__(self, fail_with=None):
+        self.batches = []
+        self.fail_with = fail_with
+
+    async def bulk_write(self, ops, ordered=True):
+        assert ordered is False
+        self.batches.append(ops)
+        if self.fail_with:
+            raise self.fail_with
+
+        class Result:
+            upserted_count, modified_count, matched_count = len(ops), 0, 0
+        return Result()
+
+
+def test_upsert_spec_sets_explicit_fields_and_inserts_defaults():
+    match, update = upsert_spec(Movie(stream_id=7, name="Film"), "stream_id")
+    assert match == {"stream_id": 7}
+    assert update == {"$set": {"stream_id": 7, "name": "Film"}, "$setOnInsert": {"rating": 0.0}}
+
+
+def test_upsert_spec_matches_within_the_provider():
+    match, update = upsert_spec(ProviderMovie(stream_id=7, provider_id="p1", rating=5), "stream_id")
+    assert match == {"stream_id": 7, "provider_id": "p1"}
+    assert "$setOnInsert" in update and update["$setOnInsert"] == {"name": None}
+
+    match, _ = upsert_spec(ProviderMovie(stream_id=7), "stream_id")
+    assert match == {"stream_id": 7, "provider_id": None}
+
+
+def test_upsert_operation_stamp_wins_over_insert_defaults():
+    match, update = {"stream_id": 7}, {"$set": {"name": "Film"}, "$setOnInsert": {"sync_generation": None, "rating": 0}}
+    op = upsert_operation(match, update, {"sync_generation": 5})
+    assert op._filter == match
+    assert op._doc == {"$set": {"name": "Film", "sync_generation": 5}, "$setOnInsert": {"rating": 0}}
+    assert op._upsert is True
+    # The caller's spec is not mutated
+    assert update["$set"] == {"name": "Film"}
+
+
+def test_writer_flushes_every_batch_size():
+    collection = FakeCollection()
+
+    async def run():
+        writer = BulkUpsertWriter(collection, "stream_id", batch_size=3)
+        for i in range(7):
+            await writer.add(Movie(stream_id=i))
+        await writer.add_prepared(PreparedUpsert(Movie, {"stream_id": 99}, {"$set": {"name": "x"}}))
+        assert [len(ops) for ops in collection.batches] == [3, 3]
+        await writer.flush()
+        return writer
+
+    writer = asyncio.run(run())
+    assert [len(ops) for ops in collection.batches] == [3, 3, 2]
+    assert writer.totals.size == 8 and writer.totals.inserted == 8 and writer.batches == 3
+
+
+def test_writer_counts_partial_bulk_failures():
+    error = BulkWriteError({
+        "nUpserted": 2, "nModified": 1, "nMatched": 1,
+        "writeErrors": [{"index": 3, "errmsg": "E11000 duplicate key"}],
+    })
+    collection = FakeCollection(fail_with=error)
+
+    async def run():
+        writer = BulkUpsertWriter(collection, "stream_id")
+        for i in range(4):
+            await writer.add(Movie(stream_id=i))
+        return await writer.flush(), writer
+
+    result, writer = asyncio.run(run())
+    assert (result.size, result.inserted, result.modified, result.failed) == (4, 2, 1, 1)
+    assert writer.totals.failed == 1
+
+
+def test_writer_counts_a_failed_batch_and_keeps_going():
+    collection = FakeCollection(fail_with=RuntimeError("connection reset"))
+
+    async def run():
+        writer = BulkUpsertWriter(collection, "stream_id")
+        await writer.add(Movie(stream_id=1))
+        await writer.add(Movie(stream_id=2))
+        writer.record_failure(3)
+        await writer.flush()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writer.totals.failed == 5
+    assert asyncio.run(BulkUpsertWriter(collection, "stream_id").flush()).size == 0  # nothing pending
@@ -0,0 +1,117 @@
+# backend/tests/test_catalog_query.py
+import asyncio
+import time
+
+from bson import ObjectId
+
+from app.utils import catalog_query
+from app.utils.catalog_query import content_key, gather_by_type, hydrate_summaries, ref_key, search_summaries
+
+
+async def _after(seconds, value):
+    await asyncio.sleep(seconds)
+    return value
+
+
+async def _fail():
+    raise RuntimeError("connection reset")
+
+
+def test_gather_by_type_runs_concurrently():
+    started = time.monotonic()
+    results, missing = asyncio.run(gather_by_type({
+        "movie": _after(0.05, ["m"]),
+        "series": _after(0.05, ["s"]),
+        "live": _after(0.05, []),
+    }, timeout=1))
+    assert time.monotonic() - started < 0.12
+    # An empty result is an answer, not a missing type
+    assert results == {"movie": ["m"], "series": ["s"], "live": []}
+    assert missing == []
+
+
+def test_gather_by_type_leaves_out_slow_and_failed_types():
+    started = time.monotonic()
+    results, missing = asyncio.run(gather_by_type({
+        "movie": _after(0.01, ["m"]),
+        "series": _after(5, ["s"]),
+        "live": _fail(),
+    }, timeout=0.05))
+    assert time.monotonic() - started < 1
+    assert results == {"movie": ["m"]}
+    assert missing == ["series", "live"]
+
+
+def test_content_and_ref_keys():
+    oid = ObjectId()
+    assert content_key("live_channel") == "live" and content_key("movie") == "movie"
+    assert content_key("podcast") is None
+    assert ref_key("live_channel", str(oid).upper()) == ("live", str(oid))
+    assert ref_key("movie", "legacy-id") == ("movie", "legacy-id")
+
+
+class FakeCursor:
+    def __init__(self, docs, delay=0):
+        self.docs = docs
+        self.delay = delay
+        self.max_time = self.limited = None
+
+    def max_time_ms(self, ms):
+        self.max_time = ms
+        return self
+
+    def limit(self, n):
+        self.limited = n
+        return self
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self.delay)
+        return self.docs[:self.limited] if self.limited else self.docs
+
+
+class FakeCollection:
+    def __init__(self, docs, delay=0):
+        self.docs = docs
+        self.delay = delay
+        self.queries = []
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        ids = query.get("_id", {}).get("$in")
+        docs = [doc for doc in self.docs if ids is None or doc["_id"] in ids]
+        return FakeCursor(docs, self.delay)
+
+
+def test_hydrate_summaries_groups_refs_and_reports_missing(monkeypatch):
+    movie, series, live = ObjectId(), ObjectId(), ObjectId()
+    collections = {
+        "movie": FakeCollection([{"_id": movie, "name": "Film", "stream_icon": " http://img/m.png "}]),
+        "series": FakeCollection([{"_id": series, "name": "Show", "image": "http://img/s.png"}]),
+        "live": FakeCollection([{"_id": live, "name": "News"}], delay=5),
+    }
+    monkeypatch.setattr(catalog_query, "COLLECTIONS", collections)
+
+    refs = [("movie", str(movie)), ("movie", str(movie)), ("series", str(series)),
+            ("live_channel", str(live)), ("movie", "not-an-id"), ("podcast", str(movie))]
+    found, missing = asyncio.run(hydrate_summaries(refs, timeout=0.05))
+
+    assert collections["movie"].queries == [{"_id": {"$in": [movie]}}]
+    assert found == {
+        ("movie", str(movie)): {"_id": str(movie), "name": "Film", "image": "http://img/m.png", "type": "movie"},
+        ("series", str(series)): {"_id": str(series), "name": "Show", "image": "http://img/s.png", "type": "series"},
+    }
+    assert missing == ["live"]
+
+
+def test_search_summaries_merges_types_by_name(monkeypatch):
+    collections = {
+        "movie": FakeCollection([{"_id": ObjectId(), "name": "beta"}, {"_id": ObjectId(), "name": "Delta"}]),
+        "series": FakeCollection([{"_id": ObjectId(), "name": "Alpha"}]),
+        "live": FakeCollection([{"_id": ObjectId(), "name": None}]),
+    }
+    monkeypatch.setattr(catalog_query, "COLLECTIONS", collections)
+
+    items, missing = asyncio.run(search_summaries("a", limit=1, timeout=1))
+    assert [(item["type"], item["name"]) for item in items] == [("live", None), ("series", "Alpha"), ("movie", "beta")]
+    assert missing == []
+    assert collections["movie"].queries[0] == {"name": {"$regex": "a", "$options": "i"}, "deleted_at": None}
@@ -0,0 +1,42 @@
+# backend/tests/test_content_hash.py
+from app.utils import content_hash as hashing
+from app.utils.content_hash import content_hash, normalise
+
+
+def test_normalise_scalars_compare_as_strings():
+    assert normalise({"a": 1, "b": 2.5, "c": True}) == normalise({"a": "1", "b": "2.5", "c": "True"})
+    assert normalise([1, "1"]) == ["1", "1"]
+
+
+def test_normalise_drops_empty_values_but_keeps_falsy_ones():
+    assert normalise({"a": None, "b": "", "c": 0, "d": False, "e": []}) == {"c": "0", "d": "False", "e": []}
+
+
+def test_normalise_recurses_and_drops_list_position():
+    item = {"num": 4, "info": {"num": 9, "rating": 7, "genre": None}, "episodes": [{"id": 1, "num": 2}]}
+    assert normalise(item) == {"info": {"rating": "7"}, "episodes": [{"id": "1"}]}
+
+
+def test_hash_stable_across_upstream_type_flips():
+    first = {"stream_id": 101, "name": "Film", "rating": 7, "added": "1700000000", "tmdb": None, "num": 1}
+    again = {"num": 57, "tmdb": "", "added": 1700000000, "rating": "7", "name": "Film", "stream_id": "101"}
+    assert content_hash(first) == content_hash(again)
+    assert content_hash(first) == content_hash({"stream_id": 101, "name": "Film", "rating": 7, "added": 1700000000})
+
+
+def test_hash_changes_with_content_and_context():
+    item = {"stream_id": 101, "name": "Film"}
+    base = content_hash(item, category_name="Drama")
+    assert content_hash({**item, "name": "Film 2"}, category_name="Drama") != base
+    assert content_hash(item, category_name="Comedy") != base
+    assert content_hash(item) != base
+    # Order matters inside lists (seasons, episodes), not between keys
+    assert content_hash({"ids": [1, 2]}) != content_hash({"ids": [2, 1]})
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+
+def test_hash_version_is_part_of_the_hash(monkeypatch):
+    item = {"stream_id": 101}
+    before = content_hash(item)
+    monkeypatch.setattr(hashing, "HASH_VERSION", hashing.HASH_VERSION + 1)
+    assert content_hash(item) != before
@@ -0,0 +1,92 @@
+# backend/tests/test_json_stream.py
+import json
+
+import pytest
+
+from app.utils.json_stream import JSONArrayStream
+
+
+# Strings full of the characters the parser must not treat as structure:
+# commas, brackets, escaped quotes and backslashes, \u escapes
+TRICKY = json.dumps([
+    {"name": 'Say "hi", [then] leave', "path": "C:\\films\\", "num": 1},
+    {"name": "caf\u00e9 \u2014 \U0001f3ac", "plot": "line\nbreak\ttab", "ids": [1, 2, 3]},
+    "a plain ] string",
+    12345,
+    -0.5e3,
+    None,
+    True,
+    {"nested": {"deep": ["\\", "\"", ","]}},
+], ensure_ascii=True)
+
+
+def _parse(chunks) -> list:
+    parser = JSONArrayStream()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    assert parser.count == len(items)
+    return items
+
+
+def test_stream_every_split_point():
+    expected = json.loads(TRICKY)
+    for i in range(len(TRICKY) + 1):
+        assert _parse([TRICKY[:i], TRICKY[i:]]) == expected, f"split at {i}: {TRICKY[i - 5:i + 5]!r}"
+
+
+def test_stream_one_character_at_a_time():
+    assert _parse(TRICKY) == json.loads(TRICKY)
+
+
+def test_stream_unescaped_unicode():
+    text = json.dumps([{"name": "café ☕"}, "ü"], ensure_ascii=False)
+    for i in range(len(text) + 1):
+        assert _parse([text[:i], text[i:]]) == [{"name": "café ☕"}, "ü"]
+
+
+def test_stream_holds_a_trailing_scalar_until_it_is_delimited():
+    parser = JSONArrayStream()
+    assert parser.feed("[12") == []
+    assert parser.feed("3, 4") == [123]
+    assert parser.feed("5]") == [45]
+    assert parser.done
+    assert parser.close() == []
+
+
+def test_stream_holds_a_number_split_inside_its_fraction_or_exponent():
+    for text in ("[-500.25, 1]", "[1e5, 1]", "[1E-5, 1]", "[2.5e+3, 1]"):
+        expected = json.loads(text)
+        for i in range(len(text) + 1):
+            assert _parse([text[:i], text[i:]]) == expected, f"{text} split at {i}"
+
+
+def test_stream_ignores_input_after_the_array():
+    parser = JSONArrayStream()
+    assert parser.feed('[1, "x"] trailing') == [1, "x"]
+    assert parser.feed("[2]") == []
+    assert parser.close() == []
+
+
+def test_stream_empty_array_and_whitespace():
+    assert _parse([" \n[", " ", "]\n"]) == []
+
+
+def test_stream_truncated_array_raises():
+    parser = JSONArrayStream()
+    assert parser.feed('[{"a": 1}, {"b": ') == [{"a": 1}]
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_stream_truncated_string_raises():
+    parser = JSONArrayStream()
+    parser.feed('["unterminated \\"')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_stream_rejects_non_array():
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        JSONArrayStream().feed('{"user_info": {"auth": 0}}')
@@ -0,0 +1,101 @@
+# backend/tests/test_pagination.py
+import pytest
+from bson import ObjectId
+
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor, InvalidCursor
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    """Just enough of Mongo's matching for the filters after_cursor builds."""
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, c) for c in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if not isinstance(cond, dict):
+            if value != cond:
+                return False
+            continue
+        for op, arg in cond.items():
+            if op == "$ne":
+                ok = value != arg
+            elif value is None or arg is None:
+                ok = False  # range operators never cross null
+            elif op == "$gt":
+                ok = value > arg
+            else:
+                ok = value < arg
+            if not ok:
+                return False
+    return True
+
+
+def _mongo_order(docs: list, field: str, direction: int) -> list:
+    # Missing/null sorts before every value; descending is the exact reverse
+    ordered = sorted(docs, key=lambda d: (d.get(field) is not None, d.get(field) or 0, d["_id"]))
+    return ordered if direction == 1 else ordered[::-1]
+
+
+def test_cursor_round_trip():
+    _id = ObjectId()
+    for value in ("Zulu", 7.5, None):
+        cursor = encode_cursor({"_id": _id, "name": value}, "name")
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (value, _id)
+
+
+def test_cursor_for_a_missing_sort_field():
+    _id = ObjectId()
+    assert decode_cursor(encode_cursor({"_id": _id}, "rating")) == (None, _id)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", "WzFd", "WzEsMiwzXQ"])
+def test_invalid_cursor(cursor):
+    # "bm90IGpzb24" is "not json", "WzFd" is [1], "WzEsMiwzXQ" is [1,2,3]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_after_null_cursor_filters():
+    _id = ObjectId()
+    cursor = encode_cursor({"_id": _id, "rating": None}, "rating")
+    assert after_cursor("rating", 1, cursor) == {
+        "$or": [{"rating": None, "_id": {"$gt": _id}}, {"rating": {"$ne": None}}]
+    }
+    assert after_cursor("rating", -1, cursor) == {"rating": None, "_id": {"$lt": _id}}
+
+
+def test_after_value_cursor_filters():
+    _id = ObjectId()
+    cursor = encode_cursor({"_id": _id, "rating": 6.0}, "rating")
+    ascending = after_cursor("rating", 1, cursor)["$or"]
+    descending = after_cursor("rating", -1, cursor)["$or"]
+    assert {"rating": None} not in ascending
+    assert descending[-1] == {"rating": None}
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+@pytest.mark.parametrize("page_size", [1, 2, 3])
+def test_walking_pages_visits_every_row_once(direction, page_size):
+    ratings = [None, 3.0, None, 1.0, 3.0, None, 2.0, 3.0]
+    docs = []
+    for rating in ratings:
+        doc = {"_id": ObjectId()}
+        if rating is not None or len(docs) % 2:
+            doc["rating"] = rating  # some nulls stored, some missing
+        docs.append(doc)
+    expected = _mongo_order(docs, "rating", direction)
+
+    seen, cursor = [], None
+    while True:
+        rows = expected
+        if cursor:
+            rows = [d for d in expected if _matches(d, after_cursor("rating", direction, cursor))]
+        page = rows[:page_size]
+        seen.extend(page)
+        if len(rows) <= page_size:
+            break
+        cursor = encode_cursor(page[-1], "rating")
+
+    assert [d["_id"] for d in seen] == [d["_id"] for d in expected]
@@ -0,0 +1,177 @@
+# backend/tests/test_response_cache.py
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.utils import response_cache as response_cache_module
+from app.utils.catalog_state import catalog_generation
+from app.utils.response_cache import ResponseCache, cached
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_replays_body_and_headers():
+    cache = ResponseCache()
+    assert cache.get("a", 1) is None
+    cache.put("a", 1, b"[1]", {"x-next-cursor": "abc"})
+    assert cache.get("a", 1) == (b"[1]", {"x-next-cursor": "abc"})
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_new_generation_empties_the_cache():
+    cache = ResponseCache()
+    cache.get("a", 1)
+    cache.put("a", 1, b"[1]", {})
+    cache.put("b", 1, b"[2]", {})
+
+    assert cache.get("a", 2) is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+    # A response rendered from the replaced generation is not stored
+    cache.put("a", 1, b"[1]", {})
+    assert cache.get("a", 2) is None
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache_module.time, "monotonic", clock)
+    cache = ResponseCache()
+    cache.get("a", 1)
+    cache.put("a", 1, b"[1]", {}, ttl=10)
+
+    clock.now += 9
+    assert cache.get("a", 1) is not None
+    clock.now += 1
+    assert cache.get("a", 1) is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.get("a", 1)
+    cache.put("a", 1, b"a", {})
+    cache.put("b", 1, b"b", {})
+    cache.get("a", 1)  # b is now the least recently used
+    cache.put("c", 1, b"c", {})
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=40)
+    cache.get("a", 1)
+    for key in "abcd":
+        cache.put(key, 1, b"x" * 10, {})
+    cache.put("e", 1, b"x" * 10, {})
+
+    assert cache.get("a", 1) is None
+    assert cache.stats()["bytes"] == 40 and cache.stats()["entries"] == 4
+
+    # Replacing an entry does not count its old body twice
+    cache.put("e", 1, b"x" * 5, {})
+    assert cache.stats()["bytes"] == 35
+
+
+def test_oversized_responses_are_not_cached():
+    cache = ResponseCache(max_bytes=40)
+    cache.get("a", 1)
+    cache.put("a", 1, b"x" * 11, {})
+    assert cache.get("a", 1) is None and cache.stats()["too_large"] == 1
+
+
+@pytest.fixture
+def client(monkeypatch):
+    state = {"generation": 5, "calls": 0}
+
+    async def current():
+        return state["generation"]
+
+    monkeypatch.setattr(catalog_generation, "current", current)
+    monkeypatch.setattr(catalog_generation, "updated_at", datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    monkeypatch.setattr(response_cache_module, "response_cache", ResponseCache())
+
+    app = FastAPI()
+
+    @app.get("/items")
+    @cached("items", bypass=lambda kwargs: kwargs["fresh"])
+    async def items(response: Response, page: int = 1, fresh: bool = False):
+        state["calls"] += 1
+        response.headers["X-Next-Cursor"] = f"p{page + 1}"
+        return [{"page": page, "call": state["calls"]}]
+
+    @app.get("/random")
+    @cached("random", conditional=False)
+    async def random_items():
+        state["calls"] += 1
+        return [state["calls"]]
+
+    test_client = TestClient(app)
+    test_client.state = state
+    return test_client
+
+
+def test_cached_route_sends_validators_and_replays_headers(client):
+    first = client.get("/items?page=1")
+    assert first.status_code == 200
+    assert first.headers["etag"].startswith('"5-')
+    assert first.headers["last-modified"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert first.headers["x-next-cursor"] == "p2"
+
+    second = client.get("/items?page=1")
+    assert second.json() == first.json() and second.headers["x-next-cursor"] == "p2"
+    assert client.state["calls"] == 1
+
+    # Parameters are part of the key and the ETag
+    other = client.get("/items?page=2")
+    assert other.headers["etag"] != first.headers["etag"] and client.state["calls"] == 2
+
+
+def test_matching_validators_get_a_304(client):
+    etag = client.get("/items").headers["etag"]
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/items", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/items", headers={"If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT"}).status_code == 304
+    assert client.get("/items", headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}).status_code == 200
+    # If-None-Match wins over If-Modified-Since
+    assert client.get("/items", headers={
+        "If-None-Match": '"other"', "If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT",
+    }).status_code == 200
+    assert client.state["calls"] == 1
+
+
+def test_new_generation_changes_the_etag(client):
+    etag = client.get("/items").headers["etag"]
+    client.state["generation"] = 6
+
+    response = client.get("/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"].startswith('"6-')
+    assert response.json() == [{"page": 1, "call": 2}]
+
+
+def test_no_validators_before_the_first_generation(client):
+    client.state["generation"] = 0
+    response = client.get("/items", headers={"If-None-Match": "*"})
+    assert response.status_code == 200 and "etag" not in response.headers
+
+
+def test_bypass_and_unconditional_routes(client):
+    fresh = client.get("/items?fresh=true")
+    assert "etag" not in fresh.headers
+    client.get("/items?fresh=true")
+    assert client.state["calls"] == 2
+
+    response = client.get("/random", headers={"If-None-Match": "*"})
+    assert response.status_code == 200 and "etag" not in response.headers
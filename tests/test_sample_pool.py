@@ -0,0 +1,138 @@
+# backend/tests/test_sample_pool.py
+import asyncio
+
+import pytest
+
+from app.utils import sample_pool as sample_pool_module
+from app.utils.catalog_state import catalog_generation
+from app.utils.sample_pool import SamplePool
+
+
+def _items(prefix, n):
+    return [{"_id": f"{prefix}{i}", "name": f"{prefix} {i}", "image": None} for i in range(n)]
+
+
+def _pool(**pools):
+    pool = SamplePool()
+    pool._items = pools
+    return pool
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    async def count_documents(self, query):
+        return len(self.docs)
+
+    def find(self, query, projection):
+        self.calls.append("find")
+        return FakeCursor(self.docs)
+
+    def aggregate(self, pipeline):
+        self.calls.append("aggregate")
+        return FakeCursor(self.docs[:pipeline[1]["$sample"]["size"]])
+
+
+def test_draw_returns_distinct_copies():
+    pool = _pool(movie=_items("m", 10))
+    drawn = pool.draw("movie", 5)
+    assert len({item["_id"] for item in drawn}) == 5
+    drawn[0]["name"] = "changed"
+    assert all(item["name"] != "changed" for item in pool._items["movie"])
+
+    assert len(pool.draw("movie", 50)) == 10
+    assert pool.draw("series", 5) == [] and pool.draw("movie", 0) == []
+
+
+def test_draw_avoids_recently_shown_items():
+    pool = _pool(movie=_items("m", 10))
+    first = {item["_id"] for item in pool.draw("movie", 5, user_id="u")}
+    second = {item["_id"] for item in pool.draw("movie", 5, user_id="u")}
+    assert first.isdisjoint(second)
+
+    # Nothing unseen left: recently shown items fill the rail rather than an empty one
+    assert len(pool.draw("movie", 5, user_id="u")) == 5
+    # Other users are unaffected
+    assert len(pool.draw("movie", 10, user_id="v")) == 10
+
+
+def test_recent_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(sample_pool_module, "SAMPLE_RECENT_WINDOW", 3)
+    monkeypatch.setattr(sample_pool_module, "SAMPLE_RECENT_USERS", 2)
+    pool = _pool(movie=_items("m", 10))
+    pool.draw("movie", 5, user_id="a")
+    assert len(pool._recent["a"]) == 3
+
+    pool.draw("movie", 1, user_id="b")
+    pool.draw("movie", 1, user_id="a")  # a is now the most recent user
+    pool.draw("movie", 1, user_id="c")
+    assert list(pool._recent) == ["a", "c"]
+
+
+def test_draw_mix_tags_each_type():
+    pool = _pool(movie=_items("m", 10), series=_items("s", 10), live=_items("l", 1))
+    items = pool.draw_mix({"movie": 3, "series": 2, "live": 4})
+    assert sorted(item["type"] for item in items) == ["live", "movie", "movie", "movie", "series", "series"]
+    assert all(item["_id"][0] == item["type"][0] for item in items)
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    generation = {"value": 1}
+
+    async def current():
+        return generation["value"]
+
+    monkeypatch.setattr(catalog_generation, "current", current)
+    collections = {
+        "movie": FakeCollection([{"_id": i, "name": f"m{i}"} for i in range(30)]),
+        "series": FakeCollection([{"_id": i, "name": f"s{i}"} for i in range(3)]),
+    }
+    monkeypatch.setattr(sample_pool_module, "COLLECTIONS", collections)
+    monkeypatch.setattr(sample_pool_module, "SAMPLE_POOL_MAX_ITEMS", 10)
+    return collections, generation
+
+
+def test_first_use_loads_and_large_catalogs_are_sampled(collections):
+    collections, _ = collections
+    pool = SamplePool()
+    asyncio.run(pool.ensure_fresh())
+
+    assert pool.stats()["items"] == {"movie": 10, "series": 3}
+    assert collections["movie"].calls == ["aggregate"] and collections["series"].calls == ["find"]
+    assert pool._items["series"][0] == {"_id": "0", "name": "s0", "image": None}
+    assert pool.generation == 1
+
+
+def test_new_generation_refreshes_in_the_background(collections):
+    collections, generation = collections
+    pool = SamplePool()
+
+    async def run():
+        await pool.ensure_fresh()
+        await pool.ensure_fresh()  # still fresh: no reload
+        assert pool._refresh is None
+
+        generation["value"] = 2
+        collections["series"].docs.append({"_id": 3, "name": "s3"})
+        await pool.ensure_fresh()
+        # The old pool keeps serving until the rebuild lands
+        assert len(pool._items["series"]) == 3
+        await pool._refresh
+
+    asyncio.run(run())
+    assert pool.generation == 2 and len(pool._items["series"]) == 4
@@ -0,0 +1,124 @@
+# backend/tests/test_sync_delta.py
+import asyncio
+from datetime import datetime, timezone
+
+from app.utils.sync_delta import LOOKUP_CHUNK, split_changed, to_epoch
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.lookups = []
+
+    def find(self, query, projection):
+        ids = query["stream_id"]["$in"]
+        self.lookups.append(len(ids))
+        return FakeCursor([
+            doc for doc in self.docs
+            if doc["stream_id"] in ids and doc.get("provider_id") == query["provider_id"]
+        ])
+
+
+def digest(item):
+    return f"{item.get('name')}|{item.get('category_id')}"
+
+
+def split(items, docs, **kwargs):
+    collection = FakeCollection(docs)
+    return asyncio.run(split_changed(items, collection, "stream_id", "added", digest, **kwargs)), collection
+
+
+def test_to_epoch():
+    assert to_epoch(None) is None and to_epoch("") is None and to_epoch("0") is None
+    assert to_epoch("1700000000") == 1700000000
+    assert to_epoch("soon") is None
+    assert to_epoch(datetime(2023, 11, 14, 22, 13, 20)) == 1700000000  # naive means UTC
+    assert to_epoch(datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)) == 1700000000
+
+
+def test_unchanged_hash_is_skipped():
+    items = [
+        {"stream_id": "1", "name": "A", "category_id": "10"},
+        {"stream_id": "2", "name": "B", "category_id": "10"},
+        {"stream_id": "3", "name": "C", "category_id": "10"},
+    ]
+    docs = [
+        {"stream_id": 1, "content_hash": "A|10", "category_id": "10"},
+        {"stream_id": 2, "content_hash": "old", "category_id": "10"},
+    ]
+    (changed, unchanged), _ = split(items, docs)
+    assert unchanged == [1]
+    assert [(item["stream_id"], item_hash) for item, item_hash in changed] == [("2", "B|10"), ("3", "C|10")]
+
+
+def test_lookup_is_scoped_to_the_provider():
+    items = [{"stream_id": "1", "name": "A", "category_id": "10"}]
+    docs = [{"stream_id": 1, "content_hash": "A|10", "provider_id": "other"}]
+    (changed, unchanged), _ = split(items, docs, provider_id="mine")
+    assert unchanged == [] and len(changed) == 1
+
+
+def test_items_without_an_id_are_always_changed():
+    items = [{"stream_id": None, "name": "A"}, {"name": "B"}, {"stream_id": "x", "name": "C"}]
+    (changed, unchanged), _ = split(items, [])
+    assert len(changed) == 3 and unchanged == []
+
+
+def test_soft_deleted_items_come_back():
+    items = [{"stream_id": "1", "name": "A", "category_id": "10"}]
+    docs = [{"stream_id": 1, "content_hash": "A|10", "category_id": "10", "deleted_at": datetime.now(timezone.utc)}]
+    (changed, unchanged), _ = split(items, docs)
+    assert unchanged == [] and len(changed) == 1
+
+
+def test_incremental_trusts_matching_marker_and_category():
+    items = [
+        {"stream_id": "1", "name": "A2", "category_id": "10", "added": "1700000000"},
+        {"stream_id": "2", "name": "B2", "category_id": "11", "added": "1700000000"},
+        {"stream_id": "3", "name": "C2", "category_id": "10"},
+    ]
+    docs = [
+        {"stream_id": 1, "category_id": "10", "added": datetime(2023, 11, 14, 22, 13, 20)},
+        {"stream_id": 2, "category_id": "10", "added": 1700000000},  # moved category
+        {"stream_id": 3, "category_id": "10", "added": 1700000000},  # no upstream marker
+    ]
+    (changed, unchanged), _ = split(items, docs, incremental=True)
+    assert unchanged == [1]
+    assert [item["stream_id"] for item, _ in changed] == ["2", "3"]
+
+    (changed, unchanged), _ = split(items, docs)
+    assert unchanged == [] and len(changed) == 3
+
+
+def test_touched_collects_new_and_stored_categories():
+    items = [
+        {"stream_id": "1", "name": "A", "category_id": "10"},
+        {"stream_id": "2", "name": "B", "category_id": "12"},
+        {"name": "orphan", "category_id": "13"},
+    ]
+    docs = [
+        {"stream_id": 1, "content_hash": "A|10", "category_id": "10"},
+        {"stream_id": 2, "content_hash": "B|11", "category_id": "11"},
+    ]
+    touched = set()
+    split(items, docs, touched=touched)
+    assert touched == {"11", "12", "13"}
+
+
+def test_lookups_are_chunked():
+    items = [{"stream_id": str(i), "name": "x"} for i in range(LOOKUP_CHUNK + 1)]
+    (changed, _), collection = split(items, [])
+    assert collection.lookups == [LOOKUP_CHUNK, 1]
+    assert len(changed) == LOOKUP_CHUNK + 1
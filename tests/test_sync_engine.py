@@ -0,0 +1,135 @@
+# backend/tests/test_sync_engine.py
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from app.utils import sync_engine
+from app.utils.bulk_writer import BulkUpsertWriter, PreparedUpsert
+from app.utils.sync_engine import HostRateLimiter, SyncEngine
+
+
+class Item(BaseModel):
+    stream_id: int
+    name: str = None
+
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+        self.batches = []
+
+    async def bulk_write(self, ops, ordered=True):
+        self.batches.append(ops)
+
+        class Result:
+            upserted_count, modified_count, matched_count = len(ops), 0, 0
+        return Result()
+
+
+def _fake_writers(monkeypatch):
+    collections = {}
+
+    def make_writer(model, batch_size=None, generation=None):
+        collection = collections.setdefault(model.__name__, FakeCollection(model.__name__))
+        return BulkUpsertWriter(collection, "stream_id", batch_size=batch_size or 500)
+
+    monkeypatch.setattr(sync_engine, "make_writer", make_writer)
+    return collections
+
+
+def test_fetch_concurrency_is_bounded(monkeypatch):
+    in_flight = peak = 0
+
+    async def fetch(url, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return url
+
+    monkeypatch.setattr(sync_engine, "fetch_with_retry", fetch)
+
+    async def run():
+        engine = SyncEngine(concurrency=3, rate_per_host=0)
+        return await asyncio.gather(*(engine.fetch(f"http://host/{i}") for i in range(20)))
+
+    assert asyncio.run(run()) == [f"http://host/{i}" for i in range(20)]
+    assert peak == 3
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    async def run():
+        limiter = HostRateLimiter(rate=50, burst=1)
+        started = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire("a")
+        one_host = time.monotonic() - started
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(host) for host in "bcdef"))
+        return one_host, time.monotonic() - started
+
+    one_host, spread = asyncio.run(run())
+    assert one_host >= 4 / 50 * 0.9  # first token is free, then 1/50s each
+    assert spread < 0.02  # separate buckets
+
+
+def test_rate_limiter_disabled():
+    async def run():
+        limiter = HostRateLimiter(rate=0)
+        for _ in range(1000):
+            await limiter.acquire("a")
+
+    asyncio.run(run())
+
+
+def test_writer_queue_drains_into_per_model_writers(monkeypatch):
+    collections = _fake_writers(monkeypatch)
+
+    async def run():
+        async with SyncEngine(writers=3, batch_size=4, write_queue_size=2) as engine:
+            for i in range(10):
+                await engine.save(Item(stream_id=i))
+            for i in range(3):
+                await engine.save(PreparedUpsert(Item, {"stream_id": 100 + i}, {"$set": {"name": "x"}}))
+        return engine
+
+    engine = asyncio.run(run())
+    # Leaving the context drained the queue and flushed the partial batches
+    batches = collections["Item"].batches
+    assert sorted(op._filter["stream_id"] for ops in batches for op in ops) == [*range(10), 100, 101, 102]
+    assert all(len(ops) <= 4 for ops in batches)
+    assert engine.totals()["Item"].size == 13
+
+
+def test_writer_survives_a_bad_document(monkeypatch):
+    collections = _fake_writers(monkeypatch)
+
+    async def run():
+        async with SyncEngine(writers=1) as engine:
+            await engine.save(object())  # no upsert spec: logged, not fatal
+            await engine.save(Item(stream_id=1))
+
+    asyncio.run(run())
+    assert [op._filter for ops in collections["Item"].batches for op in ops] == [{"stream_id": 1}]
+
+
+def test_checkpoint_makes_queued_writes_durable(monkeypatch):
+    collections = _fake_writers(monkeypatch)
+
+    async def run():
+        async with SyncEngine(writers=2, batch_size=100) as engine:
+            for i in range(5):
+                await engine.save(Item(stream_id=i))
+            engine._mark_done("movie", "7")
+            snapshot = await engine.checkpoint()
+            written = sum(len(ops) for ops in collections["Item"].batches)
+            await engine.save(Item(stream_id=5))
+        return snapshot, written
+
+    snapshot, written = asyncio.run(run())
+    assert snapshot == {"movie": ["7"]}
+    assert written == 5
+    assert sum(len(ops) for ops in collections["Item"].batches) == 6
@@ -0,0 +1,169 @@
+# backend/tests/test_sync_scheduler.py
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.models.sync_job import SyncJob
+from app.utils import sync_scheduler
+from app.utils.providers import XtreamAccount
+from app.utils.sync_scheduler import LeaseLost, SyncCancelled, SyncScheduler, WORKER_ID
+
+ACCOUNT = XtreamAccount("http://host", "user", "pass")
+
+
+class FakeEngine:
+    """Syncs categories "1".."4", one every 10ms, recording what it was told to skip."""
+
+    instances = []
+
+    def __init__(self, generation=None, account=None, pool=None):
+        self.account = account
+        self.completed = {}
+        self.category_totals = {"movie": 4}
+        self.category_failures = {}
+        self.touched_categories = {}
+        self.runs = []
+        FakeEngine.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, content_type, incremental=False, strategy=None, skip=(), resume=False):
+        self.runs.append((set(skip), resume))
+        count = 0
+        for category_id in ["1", "2", "3", "4"]:
+            if category_id in skip:
+                continue
+            await asyncio.sleep(0.01)
+            self.completed.setdefault(content_type, set()).add(category_id)
+            count += 1
+        return count
+
+    async def checkpoint(self):
+        return {ct: sorted(ids) for ct, ids in self.completed.items()}
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    FakeEngine.instances.clear()
+    saves = []
+    state = {"cancel_requested": False}
+
+    async def save(job):
+        saves.append((dict(job.completed_categories), list(job.completed_stages)))
+
+    async def get(job_id):
+        return SyncJob.model_construct(id=job_id, cancel_requested=state["cancel_requested"])
+
+    async def no_sweep(*args):
+        return []
+
+    async def no_refresh(*args):
+        return None
+
+    monkeypatch.setattr(sync_scheduler, "SyncEngine", FakeEngine)
+    monkeypatch.setattr(sync_scheduler, "SYNC_CHECKPOINT_SECONDS", 0.015)
+    monkeypatch.setattr(sync_scheduler, "_save", save)
+    monkeypatch.setattr(SyncJob, "get", get)
+    instance = SyncScheduler()
+    monkeypatch.setattr(instance, "_sweep", no_sweep)
+    monkeypatch.setattr(instance, "_refresh_summaries", no_refresh)
+    instance.saves, instance.state = saves, state
+    return instance
+
+
+def _job(**fields):
+    return SyncJob.model_construct(id=ObjectId(), **{
+        "completed_stages": [], "completed_categories": {}, "categories_total": {},
+        "counts": {}, "resumes": 0, "incremental": False, "strategy": "stream", "generation": 1,
+        **fields,
+    })
+
+
+def test_checkpoints_record_finished_categories(scheduler):
+    job = _job()
+    asyncio.run(scheduler._run_account(job, "movie", ACCOUNT, None))
+
+    checkpoints = [categories["movie:default"] for categories, _ in scheduler.saves[:-1]]
+    assert checkpoints, "no checkpoint was taken while the engine ran"
+    # Each checkpoint only grows, and the final save has the whole stage
+    assert all(set(a) <= set(b) for a, b in zip(checkpoints, checkpoints[1:]))
+    assert scheduler.saves[-1] == ({"movie:default": ["1", "2", "3", "4"]}, ["movie:default"])
+    assert job.counts == {"movie": 4} and job.categories_total == {"movie:default": 4}
+
+
+def test_resume_skips_checkpointed_categories(scheduler):
+    job = _job(resumes=1, completed_categories={"movie:default": ["1", "2"]})
+    asyncio.run(scheduler._run_account(job, "movie", ACCOUNT, None))
+
+    assert FakeEngine.instances[0].runs == [({"1", "2"}, True)]
+    assert job.completed_categories["movie:default"] == ["1", "2", "3", "4"]
+    assert job.counts == {"movie": 2}
+
+
+def test_resume_skips_finished_accounts(scheduler):
+    job = _job(resumes=1, completed_stages=["movie:default"])
+    asyncio.run(scheduler._run_account(job, "movie", ACCOUNT, None))
+    assert FakeEngine.instances == [] and scheduler.saves == []
+
+
+def test_cancel_request_is_noticed_at_a_checkpoint(scheduler):
+    scheduler.state["cancel_requested"] = True
+    with pytest.raises(SyncCancelled):
+        asyncio.run(scheduler._run_account(_job(), "movie", ACCOUNT, None))
+    assert "movie:default" not in scheduler.saves[-1][1]
+
+
+class FakeJobs:
+    def __init__(self, doc=None, matched=1):
+        self.doc = doc
+        self.matched = matched
+        self.calls = []
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        self.calls.append((query, update, kwargs))
+        return self.doc
+
+    async def update_one(self, query, update):
+        self.calls.append((query, update, {}))
+
+        class Result:
+            matched_count = self.matched
+        return Result()
+
+
+def test_resume_stale_claims_the_newest_stale_job(monkeypatch):
+    job_id = ObjectId()
+    jobs = FakeJobs({"_id": job_id, "status": "running", "stage": "series", "owner": WORKER_ID, "resumes": 2})
+    monkeypatch.setattr(sync_scheduler, "sync_jobs_collection", jobs)
+    # Validation needs an initialised collection; the fields are all that matter here
+    monkeypatch.setattr(SyncJob, "model_validate", classmethod(lambda cls, doc: cls.model_construct(id=doc.pop("_id"), **doc)))
+    instance = SyncScheduler()
+    started = []
+    monkeypatch.setattr(instance, "_start", started.append)
+
+    job = asyncio.run(instance.resume_stale())
+    query, update, kwargs = jobs.calls[0]
+    assert query["status"] == {"$in": ["pending", "running"]}
+    assert update["$set"]["owner"] == WORKER_ID and update["$inc"] == {"resumes": 1}
+    assert kwargs["sort"] == [("created_at", -1)]
+    assert started == [job] and job.id == job_id and job.stage == "series"
+
+    jobs.doc = None
+    assert asyncio.run(instance.resume_stale()) is None and len(started) == 1
+
+
+def test_save_requires_the_lease(monkeypatch):
+    jobs = FakeJobs(matched=0)
+    monkeypatch.setattr(sync_scheduler, "sync_jobs_collection", jobs)
+    job = _job(owner="other-process", cancel_requested=True)
+
+    with pytest.raises(LeaseLost):
+        asyncio.run(sync_scheduler._save(job))
+    query, update, _ = jobs.calls[0]
+    assert query == {"_id": job.id, "owner": "other-process"}
+    assert "cancel_requested" not in update["$set"]
@@ -0,0 +1,113 @@
+# backend/tests/test_sync_sweep.py
+import asyncio
+
+import pytest
+
+from app.utils.sync_sweep import SweepAborted, generation_stamp, mark_seen, sweep
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict) and "$ne" in condition:
+            if value == condition["$ne"]:
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    name = "movies"
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.updates = 0
+
+    async def count_documents(self, query):
+        return sum(_matches(doc, query) for doc in self.docs)
+
+    async def distinct(self, field, query):
+        return sorted({doc.get(field) for doc in self.docs if _matches(doc, query)}, key=str)
+
+    async def update_many(self, query, update):
+        self.updates += 1
+        hits = [doc for doc in self.docs if _matches(doc, query)]
+        for doc in hits:
+            doc.update(update["$set"])
+
+        class Result:
+            modified_count = len(hits)
+        return Result()
+
+    async def delete_many(self, query):
+        kept = [doc for doc in self.docs if not _matches(doc, query)]
+        removed, self.docs = len(self.docs) - len(kept), kept
+
+        class Result:
+            deleted_count = removed
+        return Result()
+
+
+def _catalog(seen, unseen, provider_id=None):
+    docs = [
+        {"stream_id": i, "provider_id": provider_id, "category_id": "1", **generation_stamp(2)}
+        for i in range(seen)
+    ]
+    docs += [
+        {"stream_id": seen + i, "provider_id": provider_id, "category_id": str(10 + i % 2), **generation_stamp(1)}
+        for i in range(unseen)
+    ]
+    return docs
+
+
+def test_soft_sweep_unlists_unseen_items():
+    collection = FakeCollection(_catalog(seen=9, unseen=2))
+    result = asyncio.run(sweep(collection, 2, max_fraction=0.2))
+
+    assert (result["live"], result["unseen"], result["removed"]) == (11, 2, 2)
+    assert result["categories"] == ["10", "11"]
+    swept = [doc for doc in collection.docs if doc["deleted_at"] is not None]
+    assert [doc["stream_id"] for doc in swept] == [9, 10]
+    assert all(doc["playable"] is False for doc in swept)
+
+
+def test_hard_sweep_deletes_unseen_items():
+    collection = FakeCollection(_catalog(seen=9, unseen=1))
+    result = asyncio.run(sweep(collection, 2, mode="hard"))
+    assert result["removed"] == 1 and len(collection.docs) == 9
+
+
+def test_sweep_aborts_above_the_threshold():
+    collection = FakeCollection(_catalog(seen=7, unseen=3))
+    with pytest.raises(SweepAborted, match="3/10 items unseen"):
+        asyncio.run(sweep(collection, 2, max_fraction=0.2))
+    assert collection.updates == 0
+
+    # Exactly at the limit still sweeps
+    assert asyncio.run(sweep(collection, 2, max_fraction=0.3))["removed"] == 3
+
+
+def test_sweep_off_or_nothing_unseen_changes_nothing():
+    collection = FakeCollection(_catalog(seen=1, unseen=5))
+    assert asyncio.run(sweep(collection, 2, mode="off"))["removed"] == 0
+    assert asyncio.run(sweep(FakeCollection(_catalog(seen=3, unseen=0)), 2))["removed"] == 0
+    assert collection.updates == 0
+
+
+def test_sweep_is_scoped_to_one_provider():
+    # Another provider's stale items neither count toward the threshold nor get swept
+    collection = FakeCollection(_catalog(seen=9, unseen=1, provider_id="a") + _catalog(seen=0, unseen=50, provider_id="b"))
+    result = asyncio.run(sweep(collection, 2, provider_id="a"))
+    assert (result["live"], result["unseen"], result["removed"]) == (10, 1, 1)
+    assert sum(doc["deleted_at"] is None for doc in collection.docs if doc["provider_id"] == "b") == 50
+
+
+def test_mark_seen_stamps_unchanged_items():
+    collection = FakeCollection(_catalog(seen=0, unseen=3))
+    asyncio.run(mark_seen(collection, "stream_id", [0, 2], 2))
+    assert [doc["sync_generation"] for doc in collection.docs] == [2, 1, 2]
+    assert asyncio.run(sweep(collection, 2, max_fraction=1))["removed"] == 1
@@ -0,0 +1,111 @@
+# backend/tests/test_upstream_client.py
+import asyncio
+
+import httpx
+
+from app.utils import upstream_client
+from app.utils.upstream_client import CircuitBreaker, UpstreamClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(handler, **kwargs):
+    client = UpstreamClient(backoff_base=0, **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_breaker_opens_after_threshold_and_probes_once(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(upstream_client.time, "monotonic", clock)
+    breaker = CircuitBreaker(threshold=3, reset_timeout=10)
+
+    assert [breaker.record_failure() for _ in range(3)] == [False, False, True]
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 10
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()  # a single probe
+
+    # A failed probe re-opens straight away
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_backoff_is_capped_full_jitter(monkeypatch):
+    client = UpstreamClient(backoff_base=0.5, backoff_max=4)
+    monkeypatch.setattr(upstream_client.random, "uniform", lambda low, high: (low, high))
+    assert [client.backoff(attempt) for attempt in range(5)] == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 4), (0, 4)]
+
+
+def test_get_json_retries_retryable_statuses():
+    statuses = [503, 429, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, json={"ok": True} if status == 200 else None)
+
+    client = _client(handler, retries=3)
+    assert asyncio.run(client.get_json("http://host/a")) == {"ok": True}
+    assert client.counters["requests"] == 3 and client.counters["retries"] == 2
+    assert client.breaker("http://host/a").state == "closed"
+
+
+def test_get_json_does_not_retry_a_final_4xx():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(404)
+
+    client = _client(handler, retries=3)
+    assert asyncio.run(client.get_json("http://host/missing")) is None
+    assert len(calls) == 1
+    # The host answered, so this is not a breaker failure
+    assert client.breaker("http://host/missing").failures == 0
+
+
+def test_get_json_raw_returns_body_bytes():
+    client = _client(lambda request: httpx.Response(200, content=b"[1, 2]"))
+    assert asyncio.run(client.get_json("http://host/raw", raw=True)) == b"[1, 2]"
+
+
+def test_open_circuit_short_circuits_requests():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        raise httpx.ConnectError("refused")
+
+    client = _client(handler, retries=2)
+    client._breakers["down:80"] = CircuitBreaker(threshold=2)
+
+    async def run():
+        first = await client.get_json("http://down:80/a")
+        second = await client.get_json("http://down:80/b")
+        return first, second
+
+    assert asyncio.run(run()) == (None, None)
+    assert len(calls) == 2
+    assert client.counters["circuit_opened"] == 1
+    assert client.counters["circuit_rejected"] == 1  # gives up without retrying
+    assert client.stats()["circuits"]["down:80"]["state"] == "open"